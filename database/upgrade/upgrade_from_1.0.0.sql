@@ -0,0 +1,794 @@
+-- XBACnet Database Upgrade from 1.0.0
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Upgrades a database created with xbacnet.sql of release 1.0.0 to the current schema: the unique object identifiers,
+-- the packed priority arrays of the output objects, the versions of the rows and tables, the change log of the
+-- refreshing task of xbacnet-server and the deletions of the delta sync of xbacnet-api. Stop xbacnet-server and
+-- xbacnet-api, back up the database and run it once:
+--
+--     mysql -u root -p < xbacnet/database/upgrade/upgrade_from_1.0.0.sql
+--
+-- Adding the unique index of a table fails if several of its objects have the same object identifier, find them with
+--
+--     SELECT object_identifier, COUNT(*) FROM tbl_analog_input_objects GROUP BY object_identifier HAVING COUNT(*) > 1;
+-- ---------------------------------------------------------------------------------------------------------------------
+USE `xbacnet` ;
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_analog_input_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_analog_input_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `cov_increment`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_analog_output_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_analog_output_objects`
+  ADD COLUMN `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.' AFTER `current_command_priority`,
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `cov_increment`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_analog_value_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_analog_value_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `cov_increment`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_binary_input_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_binary_input_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `polarity`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_binary_output_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_binary_output_objects`
+  ADD COLUMN `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.' AFTER `current_command_priority`,
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `priority_array`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_binary_value_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_binary_value_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `out_of_service`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_multi_state_input_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_multi_state_input_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `state_text`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_multi_state_output_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_multi_state_output_objects`
+  ADD COLUMN `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.' AFTER `current_command_priority`,
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `priority_array`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_multi_state_value_objects`
+-- ---------------------------------------------------------------------------------------------------------------------
+ALTER TABLE `xbacnet`.`tbl_multi_state_value_objects`
+  ADD COLUMN `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger' AFTER `state_text`,
+  ADD COLUMN `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger' AFTER `version`,
+  ADD UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  ADD INDEX `idx_version` (`version`);
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_changes`
+-- ---------------------------------------------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_changes` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT 'Sequence number of the change',
+  `table_name` VARCHAR(64) NOT NULL,
+  `object_id` BIGINT NOT NULL,
+  `object_identifier` BIGINT NOT NULL,
+  `operation` VARCHAR(8) NOT NULL COMMENT 'insert, update or delete',
+  `utc_date_time` DATETIME(6) NOT NULL,
+  PRIMARY KEY (`id`));
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_versions`
+-- ---------------------------------------------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_versions` (
+  `table_name` VARCHAR(64) NOT NULL,
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Incremented by every change of the table, including those of xbacnet-server',
+  `pruned_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the last pruned deletion of the table',
+  PRIMARY KEY (`table_name`));
+
+START TRANSACTION;
+USE `xbacnet`;
+INSERT IGNORE INTO `xbacnet`.`tbl_object_versions`(`table_name`, `version`)
+VALUES
+  ('tbl_analog_input_objects', 0),
+  ('tbl_analog_output_objects', 0),
+  ('tbl_analog_value_objects', 0),
+  ('tbl_binary_input_objects', 0),
+  ('tbl_binary_output_objects', 0),
+  ('tbl_binary_value_objects', 0),
+  ('tbl_multi_state_input_objects', 0),
+  ('tbl_multi_state_output_objects', 0),
+  ('tbl_multi_state_value_objects', 0);
+COMMIT;
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_deletions`
+-- ---------------------------------------------------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_deletions` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT,
+  `table_name` VARCHAR(64) NOT NULL,
+  `object_id` BIGINT NOT NULL,
+  `object_identifier` BIGINT NOT NULL,
+  `version` BIGINT NOT NULL COMMENT 'Version of the table at the deletion',
+  `utc_date_time` DATETIME(6) NOT NULL,
+  PRIMARY KEY (`id`),
+  INDEX `idx_table_name_version` (`table_name`, `version`),
+  INDEX `idx_utc_date_time` (`utc_date_time`));
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Triggers of the object tables writing `xbacnet`.`tbl_object_changes`, `xbacnet`.`tbl_object_versions` and
+-- `xbacnet`.`tbl_object_deletions`, and setting the versions of the rows
+-- NOTE: CHANGES SAVED BY XBACNET-SERVER (SESSION VARIABLE @xbacnet_server IS SET) ARE NOT LOGGED IN
+-- `xbacnet`.`tbl_object_changes`, BUT THEY DO INCREMENT THE VERSION OF THE TABLE
+-- NOTE: UPDATES THAT CHANGE NO COLUMN OF A ROW KEEP THE VERSIONS OF THE ROW AND OF THE TABLE
+-- NOTE: A CHANGE LOCKS THE ROW OF ITS TABLE IN `xbacnet`.`tbl_object_versions` UNTIL ITS TRANSACTION ENDS, SO THE
+-- TRANSACTIONS CHANGING THE SAME TABLE ARE SERIALIZED. THIS KEEPS THE VERSIONS IN COMMIT ORDER, WHICH THE DELTA SYNC
+-- OF XBACNET-API RELIES ON NOT TO MISS CHANGES, SO KEEP THE TRANSACTIONS CHANGING OBJECTS SHORT
+-- ---------------------------------------------------------------------------------------------------------------------
+DELIMITER $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`polarity` <=> NEW.`polarity`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`polarity` <=> NEW.`polarity` AND OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text` AND
+      OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+DELIMITER ;
@@ -36,7 +36,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_analog_input_objects` (
   `out_of_service` BOOLEAN NOT NULL,
   `units` VARCHAR(255)  NOT NULL,
   `cov_increment` DECIMAL(18, 3),
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_analog_input_objects`
@@ -73,8 +77,15 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_analog_output_objects` (
   index of the entry in the Priority_Array from which the Present_Value\'s value has been taken.
   If Present_Value has taken on the value of Relinquish_Default, this property shall have the value
   Null.',
+  `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.',
   `cov_increment` DECIMAL(18, 3),
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_analog_output_objects`
@@ -106,7 +117,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_analog_value_objects` (
   `out_of_service` BOOLEAN NOT NULL,
   `units` VARCHAR(255)  NOT NULL,
   `cov_increment` DECIMAL(18, 3),
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_analog_value_objects`
@@ -145,7 +160,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_binary_input_objects` (
   FALSE. If the Polarity property is REVERSE, then the ACTIVE state of the Present_Value
   property is the INACTIVE or OFF state of the physical Input as long as Out_Of_Service is
   FALSE.',
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_binary_input_objects`
@@ -190,7 +209,14 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_binary_output_objects` (
   index of the entry in the Priority_Array from which the Present_Value\'s value has been taken.
   If Present_Value has taken on the value of Relinquish_Default, this property shall have the value
   Null.',
-  PRIMARY KEY (`id`));
+  `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.',
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_binary_output_objects`
@@ -222,7 +248,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_binary_value_objects` (
   `event_state` VARCHAR(32)  NOT NULL,
   `out_of_service` BOOLEAN NOT NULL COMMENT 'This property is an indication whether
   (TRUE) or not (FALSE) the physical input that the object represents is not in service.',
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_binary_value_objects`
@@ -270,7 +300,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_multi_state_input_objects` (
   interpreted as an integer, serves as an index into the array. If the size of this array is changed, the
   Number_Of_States property shall also be changed to the same value.
   NOTE: USE SEMICOLON ; TO SPLIT STRING OR LEFT IT NULL',
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_multi_state_input_objects`
@@ -324,7 +358,14 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_multi_state_output_objects` (
   index of the entry in the Priority_Array from which the Present_Value\'s value has been taken.
   If Present_Value has taken on the value of Relinquish_Default, this property shall have the value
   Null.',
-  PRIMARY KEY (`id`));
+  `priority_array` VARBINARY(130) COMMENT 'Packed Priority_Array: a little-endian 16 bit mask of the
+  commanded priorities followed by the values of the commanded priorities in priority order. NULL
+  when all command priority values are NULL. Saved by xbacnet-server.',
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_multi_state_output_objects`
@@ -375,7 +416,11 @@ CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_multi_state_value_objects` (
   interpreted as an integer, serves as an index into the array. If the size of this array is changed, the
   Number_Of_States property shall also be changed to the same value.
   NOTE: USE SEMICOLON ; TO SPLIT STRING OR LEFT IT NULL ',
-  PRIMARY KEY (`id`));
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the last change, set by trigger',
+  `created_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the table at the insert, set by trigger',
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `uk_object_identifier` (`object_identifier`),
+  INDEX `idx_version` (`version`));
 
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Example Data for table `xbacnet`.`tbl_multi_state_value_objects`
@@ -388,6 +433,701 @@ VALUES
   (1, 90001,'Sample_9_MSV',1, null, '0000',  'normal', false, 3, 'Normal;Warmup;Cooldown');
 COMMIT;
 
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_changes`
+-- ---------------------------------------------------------------------------------------------------------------------
+DROP TABLE IF EXISTS `xbacnet`.`tbl_object_changes` ;
+
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_changes` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT 'Sequence number of the change',
+  `table_name` VARCHAR(64) NOT NULL,
+  `object_id` BIGINT NOT NULL,
+  `object_identifier` BIGINT NOT NULL,
+  `operation` VARCHAR(8) NOT NULL COMMENT 'insert, update or delete',
+  `utc_date_time` DATETIME(6) NOT NULL,
+  PRIMARY KEY (`id`));
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_versions`
+-- ---------------------------------------------------------------------------------------------------------------------
+DROP TABLE IF EXISTS `xbacnet`.`tbl_object_versions` ;
+
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_versions` (
+  `table_name` VARCHAR(64) NOT NULL,
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Incremented by every change of the table, including those of xbacnet-server',
+  `pruned_version` BIGINT NOT NULL DEFAULT 0 COMMENT 'Version of the last pruned deletion of the table',
+  PRIMARY KEY (`table_name`));
+
+START TRANSACTION;
+USE `xbacnet`;
+INSERT INTO `xbacnet`.`tbl_object_versions`(`table_name`, `version`)
+VALUES
+  ('tbl_analog_input_objects', 0),
+  ('tbl_analog_output_objects', 0),
+  ('tbl_analog_value_objects', 0),
+  ('tbl_binary_input_objects', 0),
+  ('tbl_binary_output_objects', 0),
+  ('tbl_binary_value_objects', 0),
+  ('tbl_multi_state_input_objects', 0),
+  ('tbl_multi_state_output_objects', 0),
+  ('tbl_multi_state_value_objects', 0);
+COMMIT;
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Table `xbacnet`.`tbl_object_deletions`
+-- ---------------------------------------------------------------------------------------------------------------------
+DROP TABLE IF EXISTS `xbacnet`.`tbl_object_deletions` ;
+
+CREATE TABLE IF NOT EXISTS `xbacnet`.`tbl_object_deletions` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT,
+  `table_name` VARCHAR(64) NOT NULL,
+  `object_id` BIGINT NOT NULL,
+  `object_identifier` BIGINT NOT NULL,
+  `version` BIGINT NOT NULL COMMENT 'Version of the table at the deletion',
+  `utc_date_time` DATETIME(6) NOT NULL,
+  PRIMARY KEY (`id`),
+  INDEX `idx_table_name_version` (`table_name`, `version`),
+  INDEX `idx_utc_date_time` (`utc_date_time`));
+
+-- ---------------------------------------------------------------------------------------------------------------------
+-- Triggers of the object tables writing `xbacnet`.`tbl_object_changes`, `xbacnet`.`tbl_object_versions` and
+-- `xbacnet`.`tbl_object_deletions`, and setting the versions of the rows
+-- NOTE: CHANGES SAVED BY XBACNET-SERVER (SESSION VARIABLE @xbacnet_server IS SET) ARE NOT LOGGED IN
+-- `xbacnet`.`tbl_object_changes`, BUT THEY DO INCREMENT THE VERSION OF THE TABLE
+-- NOTE: UPDATES THAT CHANGE NO COLUMN OF A ROW KEEP THE VERSIONS OF THE ROW AND OF THE TABLE
+-- NOTE: A CHANGE LOCKS THE ROW OF ITS TABLE IN `xbacnet`.`tbl_object_versions` UNTIL ITS TRANSACTION ENDS, SO THE
+-- TRANSACTIONS CHANGING THE SAME TABLE ARE SERIALIZED. THIS KEEPS THE VERSIONS IN COMMIT ORDER, WHICH THE DELTA SYNC
+-- OF XBACNET-API RELIES ON NOT TO MISS CHANGES, SO KEEP THE TRANSACTIONS CHANGING OBJECTS SHORT
+-- ---------------------------------------------------------------------------------------------------------------------
+DELIMITER $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_analog_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_analog_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_analog_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_analog_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_analog_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`units` <=> NEW.`units` AND OLD.`cov_increment` <=> NEW.`cov_increment`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_analog_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_analog_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`polarity` <=> NEW.`polarity`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`polarity` <=> NEW.`polarity` AND OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_binary_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_binary_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_binary_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_binary_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_binary_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_binary_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_binary_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_input_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_input_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_input_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_input_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_input_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_input_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_output_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_output_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_output_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_output_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text` AND
+      OLD.`relinquish_default` <=> NEW.`relinquish_default` AND
+      OLD.`current_command_priority` <=> NEW.`current_command_priority` AND
+      OLD.`priority_array` <=> NEW.`priority_array`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_output_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_output_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_insert` AFTER INSERT ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', NEW.`id`, NEW.`object_identifier`, 'insert', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_update` AFTER UPDATE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    IF OLD.`object_identifier` <> NEW.`object_identifier` THEN
+      INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+        `operation`, `utc_date_time`)
+      VALUES ('tbl_multi_state_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+    END IF;
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', NEW.`id`, NEW.`object_identifier`, 'update', UTC_TIMESTAMP(6));
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_delete` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_delete` AFTER DELETE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  IF @xbacnet_server IS NULL THEN
+    INSERT INTO `xbacnet`.`tbl_object_changes`(`table_name`, `object_id`, `object_identifier`,
+      `operation`, `utc_date_time`)
+    VALUES ('tbl_multi_state_value_objects', OLD.`id`, OLD.`object_identifier`, 'delete', UTC_TIMESTAMP(6));
+  END IF;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+  INSERT INTO `xbacnet`.`tbl_object_deletions`(`table_name`, `object_id`, `object_identifier`, `version`,
+    `utc_date_time`)
+  SELECT `table_name`, OLD.`id`, OLD.`object_identifier`, `version`, UTC_TIMESTAMP(6)
+  FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_version_insert` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_version_insert` BEFORE INSERT ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+  SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+  SET NEW.`version` = next_version;
+  SET NEW.`created_version` = next_version;
+END $$
+DROP TRIGGER IF EXISTS `xbacnet`.`trg_multi_state_value_objects_version_update` $$
+CREATE TRIGGER `xbacnet`.`trg_multi_state_value_objects_version_update` BEFORE UPDATE ON `xbacnet`.`tbl_multi_state_value_objects`
+FOR EACH ROW
+BEGIN
+  DECLARE next_version BIGINT;
+  IF NOT (OLD.`id` <=> NEW.`id` AND OLD.`object_identifier` <=> NEW.`object_identifier` AND
+      OLD.`object_name` <=> NEW.`object_name` AND OLD.`present_value` <=> NEW.`present_value` AND
+      OLD.`description` <=> NEW.`description` AND OLD.`status_flags` <=> NEW.`status_flags` AND
+      OLD.`event_state` <=> NEW.`event_state` AND OLD.`out_of_service` <=> NEW.`out_of_service` AND
+      OLD.`number_of_states` <=> NEW.`number_of_states` AND OLD.`state_text` <=> NEW.`state_text`) THEN
+    UPDATE `xbacnet`.`tbl_object_versions` SET `version` = `version` + 1 WHERE `table_name` = 'tbl_multi_state_value_objects';
+    SELECT `version` INTO next_version FROM `xbacnet`.`tbl_object_versions` WHERE `table_name` = 'tbl_multi_state_value_objects';
+    SET NEW.`version` = next_version;
+  ELSE
+    SET NEW.`version` = OLD.`version`;
+  END IF;
+  SET NEW.`created_version` = OLD.`created_version`;
+END $$
+DELIMITER ;
+
 -- ---------------------------------------------------------------------------------------------------------------------
 -- Table `xbacnet`.`tbl_sessions`
 -- ---------------------------------------------------------------------------------------------------------------------
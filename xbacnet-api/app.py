@@ -37,8 +37,9 @@ from resources import (
     AnalogInputResource, AnalogOutputResource, AnalogValueResource,
     BinaryInputResource, BinaryOutputResource, BinaryValueResource,
     MultiStateInputResource, MultiStateOutputResource, MultiStateValueResource,
-    HealthResource, StatsResource, UserResource, LoginResource, LogoutResource
+    ObjectChangesResource, ObjectExportResource, ObjectImportResource, ObjectBulkResource, HealthResource, StatsResource, UserResource, LoginResource, LogoutResource
 )
+from codec import json_handler
 from config import CORS_CONFIG, LOGGING_CONFIG
 
 # Configure logging
@@ -53,7 +54,8 @@ class RequireJSON:
     Middleware to require JSON content type for POST and PUT requests.
 
     This middleware ensures that all POST and PUT requests have proper
-    Content-Type headers and valid JSON bodies.
+    Content-Type headers and valid JSON bodies. Imports take CSV or NDJSON
+    bodies and check their content type themselves.
     """
 
     def process_request(self, req, resp):
@@ -64,7 +66,7 @@ class RequireJSON:
             req: Falcon request object
             resp: Falcon response object
         """
-        if req.method in ('POST', 'PUT'):
+        if req.method in ('POST', 'PUT') and not req.path.endswith('/import'):
             if not req.content_type or 'application/json' not in req.content_type:
                 raise falcon.HTTPBadRequest(
                     'Bad Request',
@@ -87,6 +89,10 @@ def create_app():
         ]
     )
 
+    # Parse and serialize JSON bodies with the codec of the configuration
+    app.req_options.media_handlers.update({falcon.MEDIA_JSON: json_handler})
+    app.resp_options.media_handlers.update({falcon.MEDIA_JSON: json_handler})
+
     # Create resource instances
     analog_input_resource = AnalogInputResource()
     analog_output_resource = AnalogOutputResource()
@@ -97,6 +103,10 @@ def create_app():
     multi_state_input_resource = MultiStateInputResource()
     multi_state_output_resource = MultiStateOutputResource()
     multi_state_value_resource = MultiStateValueResource()
+    object_changes_resource = ObjectChangesResource()
+    object_export_resource = ObjectExportResource()
+    object_import_resource = ObjectImportResource()
+    object_bulk_resource = ObjectBulkResource()
     health_resource = HealthResource()
     stats_resource = StatsResource()
     user_resource = UserResource()
@@ -106,37 +116,88 @@ def create_app():
     # Add routes for analog objects
     app.add_route('/api/analog-inputs', analog_input_resource)
     app.add_route('/api/analog-inputs/{object_id:int}', analog_input_resource)
+    app.add_route('/api/analog-inputs/{object_id:int}/history', analog_input_resource, suffix='history')
+    app.add_route('/api/analog-inputs/changes', analog_input_resource, suffix='changes')
+    app.add_route('/api/analog-inputs/export', analog_input_resource, suffix='export')
+    app.add_route('/api/analog-inputs/import', analog_input_resource, suffix='import')
+    app.add_route('/api/analog-inputs/bulk', analog_input_resource, suffix='bulk')
 
     app.add_route('/api/analog-outputs', analog_output_resource)
     app.add_route('/api/analog-outputs/{object_id:int}', analog_output_resource)
+    app.add_route('/api/analog-outputs/{object_id:int}/history', analog_output_resource, suffix='history')
+    app.add_route('/api/analog-outputs/changes', analog_output_resource, suffix='changes')
+    app.add_route('/api/analog-outputs/export', analog_output_resource, suffix='export')
+    app.add_route('/api/analog-outputs/import', analog_output_resource, suffix='import')
+    app.add_route('/api/analog-outputs/bulk', analog_output_resource, suffix='bulk')
 
     app.add_route('/api/analog-values', analog_value_resource)
     app.add_route('/api/analog-values/{object_id:int}', analog_value_resource)
+    app.add_route('/api/analog-values/{object_id:int}/history', analog_value_resource, suffix='history')
+    app.add_route('/api/analog-values/changes', analog_value_resource, suffix='changes')
+    app.add_route('/api/analog-values/export', analog_value_resource, suffix='export')
+    app.add_route('/api/analog-values/import', analog_value_resource, suffix='import')
+    app.add_route('/api/analog-values/bulk', analog_value_resource, suffix='bulk')
 
     # Add routes for binary objects
     app.add_route('/api/binary-inputs', binary_input_resource)
     app.add_route('/api/binary-inputs/{object_id:int}', binary_input_resource)
+    app.add_route('/api/binary-inputs/{object_id:int}/history', binary_input_resource, suffix='history')
+    app.add_route('/api/binary-inputs/changes', binary_input_resource, suffix='changes')
+    app.add_route('/api/binary-inputs/export', binary_input_resource, suffix='export')
+    app.add_route('/api/binary-inputs/import', binary_input_resource, suffix='import')
+    app.add_route('/api/binary-inputs/bulk', binary_input_resource, suffix='bulk')
 
     app.add_route('/api/binary-outputs', binary_output_resource)
     app.add_route('/api/binary-outputs/{object_id:int}', binary_output_resource)
+    app.add_route('/api/binary-outputs/{object_id:int}/history', binary_output_resource, suffix='history')
+    app.add_route('/api/binary-outputs/changes', binary_output_resource, suffix='changes')
+    app.add_route('/api/binary-outputs/export', binary_output_resource, suffix='export')
+    app.add_route('/api/binary-outputs/import', binary_output_resource, suffix='import')
+    app.add_route('/api/binary-outputs/bulk', binary_output_resource, suffix='bulk')
 
     app.add_route('/api/binary-values', binary_value_resource)
     app.add_route('/api/binary-values/{object_id:int}', binary_value_resource)
+    app.add_route('/api/binary-values/{object_id:int}/history', binary_value_resource, suffix='history')
+    app.add_route('/api/binary-values/changes', binary_value_resource, suffix='changes')
+    app.add_route('/api/binary-values/export', binary_value_resource, suffix='export')
+    app.add_route('/api/binary-values/import', binary_value_resource, suffix='import')
+    app.add_route('/api/binary-values/bulk', binary_value_resource, suffix='bulk')
 
     # Add routes for multi-state objects
     app.add_route('/api/multi-state-inputs', multi_state_input_resource)
     app.add_route('/api/multi-state-inputs/{object_id:int}', multi_state_input_resource)
+    app.add_route('/api/multi-state-inputs/{object_id:int}/history', multi_state_input_resource, suffix='history')
+    app.add_route('/api/multi-state-inputs/changes', multi_state_input_resource, suffix='changes')
+    app.add_route('/api/multi-state-inputs/export', multi_state_input_resource, suffix='export')
+    app.add_route('/api/multi-state-inputs/import', multi_state_input_resource, suffix='import')
+    app.add_route('/api/multi-state-inputs/bulk', multi_state_input_resource, suffix='bulk')
 
     app.add_route('/api/multi-state-outputs', multi_state_output_resource)
     app.add_route('/api/multi-state-outputs/{object_id:int}', multi_state_output_resource)
+    app.add_route('/api/multi-state-outputs/{object_id:int}/history', multi_state_output_resource, suffix='history')
+    app.add_route('/api/multi-state-outputs/changes', multi_state_output_resource, suffix='changes')
+    app.add_route('/api/multi-state-outputs/export', multi_state_output_resource, suffix='export')
+    app.add_route('/api/multi-state-outputs/import', multi_state_output_resource, suffix='import')
+    app.add_route('/api/multi-state-outputs/bulk', multi_state_output_resource, suffix='bulk')
 
     app.add_route('/api/multi-state-values', multi_state_value_resource)
     app.add_route('/api/multi-state-values/{object_id:int}', multi_state_value_resource)
+    app.add_route('/api/multi-state-values/{object_id:int}/history', multi_state_value_resource, suffix='history')
+    app.add_route('/api/multi-state-values/changes', multi_state_value_resource, suffix='changes')
+    app.add_route('/api/multi-state-values/export', multi_state_value_resource, suffix='export')
+    app.add_route('/api/multi-state-values/import', multi_state_value_resource, suffix='import')
+    app.add_route('/api/multi-state-values/bulk', multi_state_value_resource, suffix='bulk')
 
     # Add utility routes
     app.add_route('/api/health', health_resource)
     app.add_route('/api/stats', stats_resource)
 
+    # Add routes for the changes, export, import and bulk operations of all object types
+    app.add_route('/api/objects/changes', object_changes_resource)
+    app.add_route('/api/objects/export', object_export_resource)
+    app.add_route('/api/objects/import', object_import_resource)
+    app.add_route('/api/objects/bulk', object_bulk_resource)
+
     # Add user management routes
     app.add_route('/api/users', user_resource)
     app.add_route('/api/users/{user_id:int}', user_resource)
@@ -176,6 +237,12 @@ class RootResource:
                 'multi_state_inputs': '/api/multi-state-inputs',
                 'multi_state_outputs': '/api/multi-state-outputs',
                 'multi_state_values': '/api/multi-state-values',
+                'history': '/api/{object-type}/{id}/history?from=&to=&bucket=',
+                'live': '/api/{object-type}/{id}?source=live',
+                'changes': '/api/objects/changes?since=',
+                'export': '/api/objects/export?format=ndjson|csv&type=',
+                'import': '/api/objects/import',
+                'bulk': '/api/objects/bulk',
                 'users': '/api/users',
                 'login': '/api/login',
                 'logout': '/api/logout',
@@ -0,0 +1,88 @@
+"""
+XBACnet API Benchmark
+
+This module measures the CPU time of the request and response processing
+that does not depend on the database: validating objects with the compiled
+validators of the models against jsonschema.validate, and parsing a bulk
+request body and serializing a page of objects with each JSON codec.
+
+    python benchmark.py [--objects 1000] [--repeat 5]
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import argparse
+import timeit
+import jsonschema
+from codec import get_codec
+from models import AnalogInputModel, validate
+
+
+def make_objects(count: int) -> list:
+    """
+    Make analog input objects as the API receives and returns them.
+
+    Args:
+        count (int): Number of objects
+
+    Returns:
+        list: Objects with all properties of the analog input schema and an id
+    """
+    return [{
+        'id': index + 1,
+        'object_identifier': index + 1,
+        'object_name': f"AI-{index + 1}",
+        'present_value': 20.0 + index % 10,
+        'description': 'Supply air temperature',
+        'status_flags': '0000',
+        'event_state': 'normal',
+        'out_of_service': False,
+        'units': 'degreesCelsius',
+        'cov_increment': 0.1
+    } for index in range(count)]
+
+
+def measure(name: str, function, count: int, repeat: int):
+    """
+    Run a function and print the best time per object.
+
+    Args:
+        name (str): Name of the measurement
+        function: Function processing count objects
+        count (int): Number of objects processed by a call
+        repeat (int): Number of calls, the fastest one is reported
+    """
+    best = min(timeit.repeat(function, number=1, repeat=repeat))
+    print(f"{name:<40} {best * 1000:9.2f} ms {best / count * 1000000:9.2f} us/object")
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark the validation and JSON processing of the API.')
+    parser.add_argument('--objects', type=int, default=1000, help='objects of a bulk body or page')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of each measurement')
+    args = parser.parse_args()
+
+    objects = make_objects(args.objects)
+    items = [{key: value for key, value in item.items() if key != 'id'} for item in objects]
+    schema = AnalogInputModel.schema
+
+    measure('validate: jsonschema.validate', lambda: [jsonschema.validate(item, schema) for item in items],
+            args.objects, args.repeat)
+    measure('validate: compiled validator', lambda: [validate(AnalogInputModel.validator, item) for item in items],
+            args.objects, args.repeat)
+
+    page = {'data': objects, 'pagination': {'limit': args.objects, 'next_cursor': None}}
+    body = get_codec('json')[1]({'create': items})
+    for name in ('json', 'orjson'):
+        codec, dumps, loads = get_codec(name)
+        if codec != name:
+            print(f"{name}: not installed")
+            continue
+        measure(f"{name}: parse bulk body", lambda: loads(body), args.objects, args.repeat)
+        measure(f"{name}: serialize page", lambda: dumps(page), args.objects, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+XBACnet API Read Cache
+
+This module caches the results of the read methods of the models in each
+worker, bounded by CACHE_CONFIG['max_entries'] (least recently used entries
+are evicted first) and CACHE_CONFIG['ttl'] seconds.
+
+Writes invalidate the cached results of their table in all workers through
+a generation counter per table in an anonymous shared memory map, which the
+gunicorn master creates before it forks the workers (preload_app is set).
+A result is cached with the generation read before the database was queried
+and is only served while the generation is unchanged. Changes made by
+xbacnet-server directly in the database expire with the TTL, or at once for
+callers passing the version of the table from tbl_object_versions.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import functools
+import logging
+import mmap
+import struct
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from config import CACHE_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Tables whose results are cached, the index is the slot of the generation counter
+CACHED_TABLES = (
+    'tbl_analog_input_objects',
+    'tbl_analog_output_objects',
+    'tbl_analog_value_objects',
+    'tbl_binary_input_objects',
+    'tbl_binary_output_objects',
+    'tbl_binary_value_objects',
+    'tbl_multi_state_input_objects',
+    'tbl_multi_state_output_objects',
+    'tbl_multi_state_value_objects',
+    'tbl_users',
+)
+
+GENERATION = struct.Struct('<Q')
+
+
+class ReadCache:
+    """
+    LRU and TTL bounded cache of read results, invalidated by table generations.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        """
+        Initialize the cache and the shared generation counters.
+
+        Args:
+            max_entries (int): Maximum number of cached results, 0 disables the cache
+            ttl (float): Seconds a result is served from the cache
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.slots: Dict[str, int] = {table_name: index * GENERATION.size
+                                      for index, table_name in enumerate(CACHED_TABLES)}
+        self.generations = mmap.mmap(-1, GENERATION.size * len(CACHED_TABLES))
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, table_name: str) -> int:
+        """
+        Get the generation of a table.
+
+        Args:
+            table_name (str): Database table name
+
+        Returns:
+            int: Generation, changed by every write to the table
+        """
+        return GENERATION.unpack_from(self.generations, self.slots[table_name])[0]
+
+    def invalidate(self, table_name: str):
+        """
+        Invalidate the cached results of a table in all workers.
+
+        Two workers incrementing at the same time may both write the same
+        generation, which still differs from the generation of every result
+        cached before their writes.
+
+        Args:
+            table_name (str): Database table name
+        """
+        if table_name in self.slots:
+            GENERATION.pack_into(self.generations, self.slots[table_name], self.generation(table_name) + 1)
+
+    def get(self, key: Tuple, table_name: str, load: Callable, version: Optional[int] = None):
+        """
+        Get a result from the cache, or load and cache it.
+
+        Args:
+            key (tuple): Key of the result
+            table_name (str): Database table name the result is read from
+            load (Callable): Function reading the result from the database
+            version (int): Version of the table read before the call, a result cached
+                at another version is loaded again, None to ignore versions
+
+        Returns:
+            Cached or loaded result, which callers must not modify
+        """
+        if self.max_entries <= 0 or table_name not in self.slots:
+            return load()
+
+        generation = self.generation(table_name)
+        entry = self.entries.get(key)
+        if (entry is not None and entry[0] == generation and time.monotonic() < entry[1] and
+                (version is None or entry[3] == version)):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        result = load()
+        self.entries[key] = (generation, time.monotonic() + self.ttl, result, version)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop all cached results of this worker."""
+        self.entries.clear()
+
+    def metrics(self) -> Dict:
+        """
+        Get the metrics of the cache of this worker.
+
+        Returns:
+            dict: Number of entries, hits and misses
+        """
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Read cache of this process, created before the workers are forked
+read_cache = ReadCache(CACHE_CONFIG['max_entries'], CACHE_CONFIG['ttl'])
+
+
+def cached(method: Callable) -> Callable:
+    """
+    Cache the results of a read method of a model by its arguments.
+
+    The wrapped method takes an optional version keyword argument, the version
+    of the table the result must not be older than, see ReadCache.get.
+
+    Args:
+        method (Callable): Read method of a model with a table_name attribute
+
+    Returns:
+        Callable: Method serving the results from the read cache
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args: Hashable, version: Optional[int] = None, **kwargs: Hashable):
+        key = (self.table_name, method.__name__, args, tuple(sorted(kwargs.items())))
+        return read_cache.get(key, self.table_name, lambda: method(self, *args, **kwargs), version)
+    return wrapper
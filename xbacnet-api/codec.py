@@ -0,0 +1,53 @@
+"""
+XBACnet API JSON Codec
+
+This module selects the JSON codec of the request and response bodies by
+JSON_CONFIG['codec']: orjson, which parses and serializes several times
+faster than the standard library, json, or auto for orjson if it is
+installed and json otherwise. Both codecs raise json.JSONDecodeError for
+invalid JSON and serialize to UTF-8 bytes.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import functools
+import json
+import logging
+from typing import Any, Callable, Tuple
+from falcon import media
+from config import JSON_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def get_codec(name: str) -> Tuple[str, Callable[[Any], bytes], Callable[[Any], Any]]:
+    """
+    Get the functions of a JSON codec.
+
+    Args:
+        name (str): 'orjson', 'json' or 'auto'
+
+    Returns:
+        Tuple[str, Callable, Callable]: Name of the codec used, dumps returning UTF-8 bytes and loads
+            taking str or bytes
+    """
+    if name in ('orjson', 'auto') and orjson is not None:
+        # Integer keys are written as strings like json does
+        return 'orjson', functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS), orjson.loads
+    if name == 'orjson':
+        logger.warning("orjson is not installed, using json")
+    return 'json', lambda obj: json.dumps(obj, ensure_ascii=False).encode('utf-8'), json.loads
+
+
+# JSON codec of this process
+codec, dumps, loads = get_codec(JSON_CONFIG['codec'])
+
+# Falcon media handler of the JSON request and response bodies
+json_handler = media.JSONHandler(dumps=dumps, loads=loads)
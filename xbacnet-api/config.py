@@ -22,6 +22,12 @@ DATABASE_CONFIG = {
     'time_zone': '+00:00'
 }
 
+# Database Connection Pool Configuration
+DATABASE_POOL_CONFIG = {
+    'size': config('XBACNET_DB_POOL_SIZE', default=5, cast=int),
+    'recycle': config('XBACNET_DB_POOL_RECYCLE', default=3600, cast=int)
+}
+
 # API Server Configuration
 API_CONFIG = {
     'host': config('XBACNET_API_HOST', default='0.0.0.0'),
@@ -37,6 +43,74 @@ CORS_CONFIG = {
     'max_age': 3600
 }
 
+# xbacnet-server Change Notification Configuration
+NOTIFICATION_CONFIG = {
+    'enabled': config('XBACNET_NOTIFICATION_ENABLED', default=True, cast=bool),
+    'host': config('XBACNET_NOTIFICATION_HOST', default='127.0.0.1'),
+    'port': config('XBACNET_NOTIFICATION_PORT', default=47880, cast=int)
+}
+
+# Present Value History Configuration
+HISTORY_CONFIG = {
+    'directory': config('XBACNET_TREND_LOG_DIRECTORY', default='/xbacnet-server/trendlog'),
+    'rollup_tiers': [int(tier) for tier in config('XBACNET_HISTORY_ROLLUP_TIERS', default='60,900,3600').split(',')],
+    'default_buckets': config('XBACNET_HISTORY_DEFAULT_BUCKETS', default=300, cast=int),
+    'max_buckets': config('XBACNET_HISTORY_MAX_BUCKETS', default=10000, cast=int)
+}
+
+# Live State Configuration
+LIVE_STATE_CONFIG = {
+    'path': config('XBACNET_LIVE_STATE_PATH', default='/dev/shm/xbacnet-live-state')
+}
+
+# Delta Sync Configuration
+CHANGES_CONFIG = {
+    'max_changes': config('XBACNET_CHANGES_MAX_CHANGES', default=1000, cast=int),
+    'retention_days': config('XBACNET_CHANGES_RETENTION_DAYS', default=7, cast=int),
+    'prune_interval': config('XBACNET_CHANGES_PRUNE_INTERVAL', default=3600, cast=int)
+}
+
+# Read Cache Configuration
+CACHE_CONFIG = {
+    'max_entries': config('XBACNET_CACHE_MAX_ENTRIES', default=1000, cast=int),
+    'ttl': config('XBACNET_CACHE_TTL', default=5, cast=float)
+}
+
+# Bulk Operations Configuration
+BULK_CONFIG = {
+    'max_items': config('XBACNET_BULK_MAX_ITEMS', default=10000, cast=int),
+    'batch_size': config('XBACNET_BULK_BATCH_SIZE', default=1000, cast=int)
+}
+
+# Export Configuration
+EXPORT_CONFIG = {
+    'batch_size': config('XBACNET_EXPORT_BATCH_SIZE', default=1000, cast=int)
+}
+
+# Import Configuration
+IMPORT_CONFIG = {
+    'batch_size': config('XBACNET_IMPORT_BATCH_SIZE', default=5000, cast=int),
+    'max_errors': config('XBACNET_IMPORT_MAX_ERRORS', default=1000, cast=int)
+}
+
+# JSON Codec Configuration
+JSON_CONFIG = {
+    'codec': config('XBACNET_JSON_CODEC', default='auto')
+}
+
+# Live Stream Configuration
+STREAM_CONFIG = {
+    'enabled': config('XBACNET_STREAM_ENABLED', default=True, cast=bool),
+    'host': config('XBACNET_STREAM_HOST', default='0.0.0.0'),
+    'port': config('XBACNET_STREAM_PORT', default=8001, cast=int),
+    'poll_interval': config('XBACNET_STREAM_POLL_INTERVAL', default=0.1, cast=float),
+    'heartbeat_interval': config('XBACNET_STREAM_HEARTBEAT_INTERVAL', default=15.0, cast=float),
+    'retry': 3000,  # Reconnection delay of the clients in milliseconds
+    'queue_size': config('XBACNET_STREAM_QUEUE_SIZE', default=1000, cast=int),
+    'history_size': config('XBACNET_STREAM_HISTORY_SIZE', default=10000, cast=int),
+    'restart_delay': config('XBACNET_STREAM_RESTART_DELAY', default=5.0, cast=float)
+}
+
 # Logging Configuration
 LOGGING_CONFIG = {
     'level': config('XBACNET_LOG_LEVEL', default='INFO'),
@@ -47,7 +121,8 @@ LOGGING_CONFIG = {
 # Pagination Configuration
 PAGINATION_CONFIG = {
     'default_page_size': config('XBACNET_DEFAULT_PAGE_SIZE', default=20, cast=int),
-    'max_page_size': config('XBACNET_MAX_PAGE_SIZE', default=100, cast=int)
+    'max_page_size': config('XBACNET_MAX_PAGE_SIZE', default=100, cast=int),
+    'count_cache_ttl': config('XBACNET_COUNT_CACHE_TTL', default=30, cast=int)
 }
 
 # BACnet Object Configuration
@@ -0,0 +1,227 @@
+"""
+XBACnet API Database Connection Pool
+
+This module keeps a pool of MySQL connections per worker process, shared by
+every model and resource, instead of connecting to the database for every
+operation.
+
+The pool belongs to the process that created it: a gunicorn worker forked
+from the master (preload_app is set) starts with an empty pool and never
+uses the connections of its parent. Connections are validated with a ping
+when they are checked out and recycled after DATABASE_POOL_CONFIG['recycle']
+seconds. Callers close connections as before, which returns them to the pool.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import logging
+import os
+import time
+import mysql.connector
+from mysql.connector import Error
+from typing import Dict, List, Tuple
+from config import DATABASE_CONFIG, DATABASE_POOL_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    """
+    Connection checked out of the pool.
+
+    Behaves like the MySQL connection it wraps, except that close() returns
+    the connection to the pool.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', connection, created: float):
+        """
+        Wrap a connection checked out of the pool.
+
+        Args:
+            pool (ConnectionPool): Pool the connection belongs to
+            connection: MySQL connection
+            created (float): Time the connection was opened, in seconds since the epoch
+        """
+        self._pool = pool
+        self._connection = connection
+        self._created = created
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+    def close(self):
+        """Return the connection to the pool."""
+        if self._connection is not None:
+            self._pool._checkin(self._connection, self._created)
+            self._connection = None
+
+    def discard(self):
+        """Close the connection instead of returning it to the pool, such as one with unread rows."""
+        if self._connection is not None:
+            self._pool._discard(self._connection)
+            self._connection = None
+
+    def __del__(self):
+        # Return connections the caller did not close, such as broken ones
+        self.close()
+
+    def is_connected(self) -> bool:
+        """
+        Check that the connection is still checked out and connected.
+
+        Returns:
+            bool: True if the connection can be used
+        """
+        return self._connection is not None and self._connection.is_connected()
+
+
+class ConnectionPool:
+    """
+    Pool of MySQL connections of a process.
+    """
+
+    def __init__(self, config: Dict, size: int, recycle: float):
+        """
+        Initialize the pool, connections are opened when they are needed.
+
+        Args:
+            config (dict): MySQL connection arguments
+            size (int): Maximum number of idle connections kept open
+            recycle (float): Age in seconds after which a connection is closed instead of reused
+        """
+        self.config = config
+        self.size = size
+        self.recycle = recycle
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the connections of the pool, to be called in a forked process.
+
+        The connections are not closed, their sockets are shared with the parent process.
+        """
+        self.pid = os.getpid()
+        self.idle: List[Tuple[object, float]] = []
+        self.checked_out = 0
+        self.counters = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'invalidated': 0,
+            'discarded': 0,
+            'errors': 0,
+        }
+
+    def get_connection(self) -> PooledConnection:
+        """
+        Check out a connection, reusing an idle one if it is still valid.
+
+        Returns:
+            PooledConnection: Database connection, close() returns it to the pool
+
+        Raises:
+            mysql.connector.Error: If no connection could be opened
+        """
+        if self.pid != os.getpid():
+            self.reset()
+
+        self.counters['checkouts'] += 1
+        now = time.time()
+        while self.idle:
+            connection, created = self.idle.pop()
+            if now - created > self.recycle:
+                self.counters['recycled'] += 1
+                self._close(connection)
+            elif not connection.is_connected():
+                self.counters['invalidated'] += 1
+                self._close(connection)
+            else:
+                self.counters['reused'] += 1
+                self.checked_out += 1
+                return PooledConnection(self, connection, created)
+
+        try:
+            connection = mysql.connector.connect(**self.config)
+        except Error:
+            self.counters['errors'] += 1
+            raise
+        self.counters['created'] += 1
+        self.checked_out += 1
+        return PooledConnection(self, connection, now)
+
+    def _checkin(self, connection, created: float):
+        """
+        Take back a connection, keeping it open if the pool has room for it.
+
+        Args:
+            connection: MySQL connection
+            created (float): Time the connection was opened, in seconds since the epoch
+        """
+        if self.pid != os.getpid():
+            return
+        self.checked_out -= 1
+        try:
+            if connection.is_connected():
+                if connection.in_transaction:
+                    connection.rollback()
+                if len(self.idle) < self.size and time.time() - created <= self.recycle:
+                    self.idle.append((connection, created))
+                    return
+            self.counters['discarded'] += 1
+        except Error as e:
+            logger.warning(f"Error returning connection to the pool: {e}")
+            self.counters['discarded'] += 1
+        self._close(connection)
+
+    def _discard(self, connection):
+        """
+        Close a checked out connection without reusing it.
+
+        Args:
+            connection: MySQL connection
+        """
+        if self.pid == os.getpid():
+            self.checked_out -= 1
+            self.counters['discarded'] += 1
+        self._close(connection)
+
+    @staticmethod
+    def _close(connection):
+        """
+        Close a connection, ignoring errors of broken connections.
+
+        Args:
+            connection: MySQL connection
+        """
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def metrics(self) -> Dict:
+        """
+        Get the metrics of the pool of this process.
+
+        Returns:
+            dict: Pool size, idle and checked out connections and the counters
+        """
+        if self.pid != os.getpid():
+            self.reset()
+        return dict(self.counters, pid=self.pid, size=self.size, idle=len(self.idle), checked_out=self.checked_out)
+
+
+# Connection pool of this process
+pool = ConnectionPool(DATABASE_CONFIG, DATABASE_POOL_CONFIG['size'], DATABASE_POOL_CONFIG['recycle'])
+
+
+def get_connection() -> PooledConnection:
+    """
+    Check out a connection from the pool of this process.
+
+    Returns:
+        PooledConnection: Database connection, close() returns it to the pool
+    """
+    return pool.get_connection()
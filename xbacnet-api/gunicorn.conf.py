@@ -10,7 +10,7 @@ Date: 2024
 
 import os
 import multiprocessing
-from config import API_CONFIG
+from config import API_CONFIG, STREAM_CONFIG
 
 # Server socket configuration
 bind = f"{API_CONFIG['host']}:{API_CONFIG['port']}"
@@ -58,6 +58,36 @@ limit_request_field_size = 8190
 # Performance tuning
 worker_tmp_dir = None  # Use default temp directory (macOS compatible)
 
+# Supervisor of the live stream server, a child process of the master
+stream_supervisor = None
+
+def on_starting(server):
+    """
+    Called just before the master process is initialized.
+
+    Starts the live stream server, which holds its subscribers outside the
+    sync workers, and starts it again whenever it exits.
+
+    Args:
+        server: Gunicorn server instance
+    """
+    global stream_supervisor
+    if STREAM_CONFIG['enabled']:
+        from stream import StreamSupervisor
+        stream_supervisor = StreamSupervisor()
+        stream_supervisor.start()
+        server.log.info(f"Supervising XBACnet API stream on {STREAM_CONFIG['host']}:{STREAM_CONFIG['port']}")
+
+def on_exit(server):
+    """
+    Called just before exiting the master process.
+
+    Args:
+        server: Gunicorn server instance
+    """
+    if stream_supervisor is not None:
+        stream_supervisor.stop()
+
 def when_ready(server):
     """
     Called just after the server is started.
@@ -96,6 +126,10 @@ def post_fork(server, worker):
     """
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
+    # Start the worker with its own connection pool, the connections of the master are not shared
+    from db import pool
+    pool.reset()
+
 def post_worker_init(worker):
     """
     Called just after a worker has initialized the application.
@@ -105,6 +139,10 @@ def post_worker_init(worker):
     """
     worker.log.info("Worker initialized (pid: %s)", worker.pid)
 
+    # Let the exports and imports keep the worker alive past the timeout while they make progress
+    import resources
+    resources.worker_heartbeat = worker.notify
+
 def worker_abort(worker):
     """
     Called when a worker receives the SIGABRT signal.
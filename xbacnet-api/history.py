@@ -0,0 +1,289 @@
+"""
+XBACnet API Present Value History
+
+This module reads the trend log ring buffers recorded by xbacnet-server and
+downsamples them to min/max/avg/last per time bucket for charts.
+
+The ring buffers of 256 objects of a type share a segment file
+<objectType>-segment-<instance // 256>.dat, holding a header and the
+capacity, record size and bucket size of each ring buffer of an object,
+followed by the ring buffers of each object. A ring buffer holds a 32 byte
+header and fixed-size records: timestamp and value (two little-endian
+doubles) for the recorded values, and bucket start time, minimum, maximum,
+sum, count and last value for each rollup tier. The records of a query are
+copied out of the memory-mapped file in at most two slices and each bucket
+is reduced with the built-in min/max/sum over array slices, so no Python
+code runs per record.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from config import HISTORY_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# BACnet object types of the object tables, which name the segment files
+OBJECT_TYPES = {
+    'tbl_analog_input_objects': 'analogInput',
+    'tbl_analog_output_objects': 'analogOutput',
+    'tbl_analog_value_objects': 'analogValue',
+    'tbl_binary_input_objects': 'binaryInput',
+    'tbl_binary_output_objects': 'binaryOutput',
+    'tbl_binary_value_objects': 'binaryValue',
+    'tbl_multi_state_input_objects': 'multiStateInput',
+    'tbl_multi_state_output_objects': 'multiStateOutput',
+    'tbl_multi_state_value_objects': 'multiStateValue',
+}
+
+# Segment file layout, see the trend log segment of xbacnet-server
+SEGMENT_SIZE = 256
+SEGMENT_HEADER = struct.Struct('<4sHHI4x')
+DESCRIPTOR = struct.Struct('<IIQ')
+
+# Ring buffer layout
+HEADER = struct.Struct('<4sHHIQQ4x')
+COUNTERS = struct.Struct('<QQ')
+COUNTERS_OFFSET = 12
+
+
+def segment_path(object_type: str, object_identifier: int) -> str:
+    """
+    Get the path of the segment file holding the ring buffers of an object.
+
+    Args:
+        object_type (str): BACnet object type
+        object_identifier (int): BACnet instance number of the object
+
+    Returns:
+        str: Path of the segment file
+    """
+    return os.path.join(HISTORY_CONFIG['directory'],
+                        f"{object_type}-segment-{object_identifier // SEGMENT_SIZE}.dat")
+
+
+def find_buffer(data: mmap.mmap, object_identifier: int, bucket_size: int) -> Optional[int]:
+    """
+    Find a ring buffer of an object in a segment file.
+
+    Args:
+        data (mmap.mmap): Map of the segment file
+        object_identifier (int): BACnet instance number of the object
+        bucket_size (int): Bucket size in seconds of a rollup tier, 0 for the recorded values
+
+    Returns:
+        Optional[int]: Offset of the ring buffer, or None if the segment has no such ring buffer
+    """
+    magic, version, buffer_count, object_count = SEGMENT_HEADER.unpack_from(data)
+    if magic != b'XBTS' or version != 1 or object_count != SEGMENT_SIZE:
+        return None
+
+    object_size = 0
+    buffer_offset = None
+    for index in range(buffer_count):
+        capacity, record_size, buffer_bucket_size = DESCRIPTOR.unpack_from(
+            data, SEGMENT_HEADER.size + index * DESCRIPTOR.size)
+        if buffer_bucket_size == bucket_size:
+            buffer_offset = object_size
+        object_size += HEADER.size + capacity * record_size
+    if buffer_offset is None:
+        return None
+    data_offset = SEGMENT_HEADER.size + buffer_count * DESCRIPTOR.size
+    return data_offset + (object_identifier % SEGMENT_SIZE) * object_size + buffer_offset
+
+
+def read_records(path: str, object_identifier: int, bucket_size: int, fields: int) -> array:
+    """
+    Read the records of a ring buffer of an object.
+
+    Args:
+        path (str): Path of the segment file
+        object_identifier (int): BACnet instance number of the object
+        bucket_size (int): Bucket size in seconds of a rollup tier, 0 for the recorded values
+        fields (int): Number of doubles in a record
+
+    Returns:
+        array: Fields of the records in sequence order, one record after the other
+    """
+    records = array('d')
+    if not os.path.exists(path):
+        return records
+
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < SEGMENT_HEADER.size:
+            return records
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = find_buffer(data, object_identifier, bucket_size)
+            if offset is None:
+                logger.warning(f"No trend log ring buffer of bucket size {bucket_size} in {path}")
+                return records
+            magic, version, record_size, capacity, total, cleared = HEADER.unpack_from(data, offset)
+            if magic != b'XBTL':
+                # The ring buffer of an object without a trend log
+                return records
+            if version != 1 or record_size != fields * 8 or capacity == 0:
+                logger.warning(f"Invalid trend log ring buffer of {object_identifier} in {path}")
+                return records
+
+            # Copy the records in sequence order, the ring buffer wraps at most once
+            records_offset = offset + HEADER.size
+            count = min(total - cleared, capacity)
+            slot = (total - count) % capacity
+            head = min(count, capacity - slot)
+            records.frombytes(data[records_offset + slot * record_size:records_offset + (slot + head) * record_size])
+            records.frombytes(data[records_offset:records_offset + (count - head) * record_size])
+
+            # Drop the records overwritten by xbacnet-server while they were copied
+            total_after, cleared_after = COUNTERS.unpack_from(data, offset + COUNTERS_OFFSET)
+            overwritten = max(total_after - capacity, cleared_after) - (total - count)
+            if overwritten > 0:
+                del records[:fields * min(overwritten, count)]
+
+    return records
+
+
+def read_samples(path: str, object_identifier: int, start: float, end: float) -> Tuple[array, array]:
+    """
+    Read the recorded values of an object within a time range.
+
+    Args:
+        path (str): Path of the segment file
+        object_identifier (int): BACnet instance number of the object
+        start (float): Start of the range in seconds since the epoch, included
+        end (float): End of the range in seconds since the epoch, excluded
+
+    Returns:
+        Tuple[array, array]: Timestamps and values of the samples in ascending time order
+    """
+    records = read_records(path, object_identifier, 0, 2)
+    timestamps, values = records[0::2], records[1::2]
+    first, last = bisect_left(timestamps, start), bisect_left(timestamps, end)
+    return timestamps[first:last], values[first:last]
+
+
+def aggregate(times: array, minimums: array, maximums: array, sums: array, counts: Optional[array],
+              lasts: array, bucket: int) -> List[Dict]:
+    """
+    Combine samples or rollup buckets to min/max/avg/last per time bucket.
+
+    Buckets are aligned to multiples of the bucket size since the epoch, and
+    buckets without samples are left out.
+
+    Args:
+        times (array): Sample timestamps or rollup bucket start times in ascending order
+        minimums (array): Minimum values
+        maximums (array): Maximum values
+        sums (array): Sums of the values
+        counts (Optional[array]): Numbers of values, None for samples
+        lasts (array): Last values
+        bucket (int): Bucket size in seconds
+
+    Returns:
+        List[Dict]: Bucket start time and the statistics of its samples
+    """
+    buckets = []
+    lower = 0
+    while lower < len(times):
+        bucket_start = times[lower] // bucket * bucket
+        upper = bisect_left(times, bucket_start + bucket, lower)
+        count = upper - lower if counts is None else int(sum(counts[lower:upper]))
+        buckets.append({
+            'time': bucket_start,
+            'min': min(minimums[lower:upper]),
+            'max': max(maximums[lower:upper]),
+            'avg': sum(sums[lower:upper]) / count,
+            'last': lasts[upper - 1],
+            'count': count,
+        })
+        lower = upper
+    return buckets
+
+
+def downsample(timestamps: array, values: array, bucket: int) -> List[Dict]:
+    """
+    Reduce samples to min/max/avg/last per time bucket.
+
+    Args:
+        timestamps (array): Timestamps in seconds since the epoch in ascending order
+        values (array): Values of the samples
+        bucket (int): Bucket size in seconds
+
+    Returns:
+        List[Dict]: Bucket start time and the statistics of its samples
+    """
+    return aggregate(timestamps, values, values, values, None, values, bucket)
+
+
+def merge(buckets: List[Dict], tail: List[Dict]) -> List[Dict]:
+    """
+    Append buckets of later samples, combining the bucket both have.
+
+    Args:
+        buckets (List[Dict]): Buckets from a rollup tier
+        tail (List[Dict]): Buckets from the samples after the rollup tier
+
+    Returns:
+        List[Dict]: All buckets
+    """
+    if buckets and tail and buckets[-1]['time'] == tail[0]['time']:
+        last, first = buckets[-1], tail.pop(0)
+        count = last['count'] + first['count']
+        last['avg'] = (last['avg'] * last['count'] + first['avg'] * first['count']) / count
+        last['min'] = min(last['min'], first['min'])
+        last['max'] = max(last['max'], first['max'])
+        last['last'] = first['last']
+        last['count'] = count
+    return buckets + tail
+
+
+def get_history(table_name: str, object_identifier: int, start: float, end: float,
+                bucket: int) -> Optional[List[Dict]]:
+    """
+    Get the downsampled present value history of an object.
+
+    The buckets are combined from the largest rollup tier whose bucket size
+    divides the requested bucket size, up to the last closed bucket of the
+    tier, and from the samples after it.
+
+    Args:
+        table_name (str): Database table name of the object
+        object_identifier (int): BACnet instance number of the object
+        start (float): Start of the range in seconds since the epoch, included
+        end (float): End of the range in seconds since the epoch, excluded
+        bucket (int): Bucket size in seconds
+
+    Returns:
+        Optional[List[Dict]]: Buckets, or None if the object type has no history
+    """
+    object_type = OBJECT_TYPES.get(table_name)
+    if object_type is None:
+        return None
+    path = segment_path(object_type, object_identifier)
+
+    buckets = []
+    for tier in sorted(HISTORY_CONFIG['rollup_tiers'], reverse=True):
+        if bucket % tier != 0:
+            continue
+        records = read_records(path, object_identifier, tier, 6)
+        if not records:
+            continue
+        times = records[0::6]
+        first, last = bisect_left(times, start), bisect_left(times, end)
+        if first < last:
+            buckets = aggregate(times[first:last], records[1::6][first:last], records[2::6][first:last],
+                                records[3::6][first:last], records[4::6][first:last],
+                                records[5::6][first:last], bucket)
+        # The samples after the last closed bucket of the tier
+        start = max(start, times[-1] + tier)
+        break
+
+    timestamps, values = read_samples(path, object_identifier, start, end)
+    return merge(buckets, downsample(timestamps, values, bucket))
@@ -0,0 +1,285 @@
+"""
+XBACnet API Import
+
+This module imports objects from CSV or NDJSON files, as written by the
+export endpoints, through POST /api/{object-type}/import, POST
+/api/objects/import and the command line:
+
+    python importer.py analog-inputs.csv --type analog_input
+    python importer.py objects.ndjson
+
+The file is read incrementally. Every IMPORT_CONFIG['batch_size'] rows are
+validated against the schema of their type and upserted by object_identifier
+with multi-row statements in one transaction, so memory stays flat and a
+failed import can be run again. The rows of a batch that cannot be written
+are reported as failed and the import goes on with the next batch. Rows of
+all types carry their model name in a type column or field. Columns and
+fields that are not properties of the schema, such as id and version in
+exports, are ignored.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import jsonschema
+from mysql.connector import Error
+from db import get_connection
+from cache import read_cache
+from models import MODELS, BaseModel, row_count_cache
+from notifications import notify_server_many
+from codec import loads
+from config import IMPORT_CONFIG, LOGGING_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Import formats by file extension
+IMPORT_FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+# Model names of the object types
+OBJECT_TYPES = [name for name, model in MODELS.items() if isinstance(model, BaseModel)]
+
+
+def parse_value(value: str, schema: Dict):
+    """
+    Convert a CSV value to the type of its schema property.
+
+    Args:
+        value (str): Value of the CSV column
+        schema (dict): JSON schema of the property
+
+    Returns:
+        Converted value, or the value itself if it cannot be converted, for the validation to report
+    """
+    try:
+        if schema.get('type') == 'integer':
+            return int(value)
+        if schema.get('type') == 'number':
+            return float(value)
+        if schema.get('type') == 'boolean':
+            return {'true': True, '1': True, 'false': False, '0': False}.get(value.lower(), value)
+        if schema.get('type') in ('array', 'object'):
+            return json.loads(value)
+    except ValueError:
+        pass
+    return value
+
+
+def read_csv(lines: Iterable[str], model_name: Optional[str]) -> Iterator[Tuple[int, Optional[str], Dict]]:
+    """
+    Read the rows of a CSV file with a header row.
+
+    Empty values are left out, the other values are converted to the types of
+    the schema properties of their columns.
+
+    Args:
+        lines (Iterable[str]): Lines of the file
+        model_name (str): Model name of the rows, None to read it from the type column
+
+    Returns:
+        Iterator[Tuple[int, str, dict]]: Line number, model name and data of each row
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        object_type = model_name or row.get('type')
+        properties = MODELS[object_type].schema['properties'] if object_type in OBJECT_TYPES else {}
+        data = {column: parse_value(value, properties[column])
+                for column, value in row.items() if column in properties and value not in ('', None)}
+        yield reader.line_num, object_type, data
+
+
+def read_ndjson(lines: Iterable[str], model_name: Optional[str]) -> Iterator[Tuple[int, Optional[str], Dict]]:
+    """
+    Read the objects of an NDJSON file, one per line.
+
+    Args:
+        lines (Iterable[str]): Lines of the file
+        model_name (str): Model name of the objects, None to read it from their type field
+
+    Returns:
+        Iterator[Tuple[int, str, dict]]: Line number, model name and object of each line, None for invalid JSON
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = loads(line)
+        except json.JSONDecodeError:
+            yield line_number, model_name, None
+            continue
+        if not isinstance(data, dict):
+            yield line_number, model_name, None
+            continue
+        object_type = model_name or data.get('type')
+        properties = MODELS[object_type].schema['properties'] if object_type in OBJECT_TYPES else {}
+        yield line_number, object_type, {key: value for key, value in data.items() if key in properties}
+
+
+def import_objects(lines: Iterable[str], import_format: str, model_name: Optional[str] = None,
+                   progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Import the objects of a CSV or NDJSON file, upserting them by object_identifier.
+
+    Each batch of rows is committed on its own, the rows of a batch with the
+    same type and object_identifier are written once with the last of them.
+
+    Args:
+        lines (Iterable[str]): Lines of the file
+        import_format (str): 'csv' or 'ndjson'
+        model_name (str): Model name of all objects, None to read it from each row
+        progress (Callable): Called with the summary after each batch
+
+    Returns:
+        dict: Numbers of rows, created, updated and failed objects, and the line and
+            message of the first IMPORT_CONFIG['max_errors'] failed rows. The rows of
+            a batch that could not be written are failed rows, the other batches are
+            written all the same
+    """
+    reader = read_csv if import_format == 'csv' else read_ndjson
+    summary = {'rows': 0, 'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+
+    # Valid rows of the batch by model name, and their line numbers
+    batch: Dict[str, List[Tuple[int, Dict]]] = {}
+    batch_rows = 0
+    for line_number, object_type, data in reader(lines, model_name):
+        summary['rows'] += 1
+        if object_type not in OBJECT_TYPES:
+            add_failure(summary, line_number, f"type must be one of {', '.join(OBJECT_TYPES)}")
+        elif data is None:
+            add_failure(summary, line_number, 'Invalid JSON object')
+        else:
+            error = jsonschema.exceptions.best_match(MODELS[object_type].validator.iter_errors(data))
+            if error is not None:
+                add_failure(summary, line_number, error.message)
+            else:
+                batch.setdefault(object_type, []).append((line_number, data))
+                batch_rows += 1
+        if batch_rows >= IMPORT_CONFIG['batch_size']:
+            write_batch(batch, summary)
+            batch, batch_rows = {}, 0
+            if progress:
+                progress(summary)
+
+    write_batch(batch, summary)
+    if progress:
+        progress(summary)
+    return summary
+
+
+def add_failure(summary: Dict, line_number: int, message: str):
+    """
+    Count a failed row in the summary, keeping the first IMPORT_CONFIG['max_errors'] messages.
+
+    Args:
+        summary (dict): Summary of the import, updated in place
+        line_number (int): Line number of the row
+        message (str): Reason the row failed
+    """
+    summary['failed'] += 1
+    if len(summary['errors']) < IMPORT_CONFIG['max_errors']:
+        summary['errors'].append({'line': line_number, 'error': message})
+
+
+def write_batch(batch: Dict[str, List[Tuple[int, Dict]]], summary: Dict):
+    """
+    Upsert a batch of validated rows in one transaction and count them in the summary.
+
+    If the batch cannot be written, the transaction is rolled back and all
+    rows of the batch are counted as failed, so the caller goes on with the
+    next batch.
+
+    Args:
+        batch (dict): Line numbers and data of the rows by model name
+        summary (dict): Summary of the import, updated in place
+    """
+    if not batch:
+        return
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        connection.start_transaction()
+        results = {}
+        for object_type, rows in batch.items():
+            # The last row of an object identifier wins
+            items = {data['object_identifier']: data for _, data in rows}
+            results[object_type] = MODELS[object_type].upsert_bulk(cursor, list(items.values()))
+        connection.commit()
+    except Error as e:
+        logger.error(f"Error in import write_batch: {e}")
+        if connection and connection.is_connected():
+            connection.rollback()
+        # The database error is logged, the client is told which rows were not written
+        for rows in batch.values():
+            for line_number, _ in rows:
+                add_failure(summary, line_number, 'Database error, the batch of this row was not written')
+        return
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+    for object_type, rows in batch.items():
+        result = results[object_type]
+        for _, data in rows:
+            summary[result[data['object_identifier']][0]] += 1
+
+        table_name = MODELS[object_type].table_name
+        row_count_cache.pop(table_name, None)
+        read_cache.invalidate(table_name)
+        for status, operation in (('created', 'insert'), ('updated', 'update')):
+            object_ids = [object_id for result_status, object_id in result.values() if result_status == status]
+            if object_ids:
+                notify_server_many(table_name, object_ids, operation)
+
+
+def main():
+    """Import a file from the command line, reporting the progress on stderr."""
+    parser = argparse.ArgumentParser(description='Import BACnet objects from a CSV or NDJSON file.')
+    parser.add_argument('file', help='CSV or NDJSON file, - for standard input')
+    parser.add_argument('--type', choices=OBJECT_TYPES,
+                        help='model name of all objects, by default the type column or field of each row')
+    parser.add_argument('--format', choices=sorted(set(IMPORT_FORMATS.values())),
+                        help='format of the file, by default from its extension')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, LOGGING_CONFIG['level']), format=LOGGING_CONFIG['format'])
+    import_format = args.format or IMPORT_FORMATS.get(os.path.splitext(args.file)[1].lower())
+    if import_format is None:
+        parser.error('cannot tell the format of the file, use --format')
+
+    def report(summary: Dict):
+        print(f"{summary['rows']} rows: {summary['created']} created, {summary['updated']} updated, "
+              f"{summary['failed']} failed", file=sys.stderr)
+
+    if args.file == '-':
+        lines = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        summary = import_objects(lines, import_format, args.type, report)
+    else:
+        with open(args.file, encoding='utf-8-sig', newline='') as lines:
+            summary = import_objects(lines, import_format, args.type, report)
+
+    for error in summary['errors']:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    if summary['failed'] > len(summary['errors']):
+        print(f"{summary['failed'] - len(summary['errors'])} more failed rows", file=sys.stderr)
+    sys.exit(1 if summary['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
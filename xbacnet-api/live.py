@@ -0,0 +1,223 @@
+"""
+XBACnet API Live State
+
+This module reads the live state of the objects, which xbacnet-server
+publishes to a memory-mapped file in shared memory as soon as it changes,
+so that GET requests with source=live are served without database queries.
+
+The file holds a 24 byte header and one 40 byte slot per object. Each slot
+is a sequence lock: xbacnet-server makes the sequence odd while it writes
+the slot, and a reader unpacks the slot in place and keeps it only if the
+sequence was even and did not change meanwhile. The file is mapped once per
+worker and remapped when a restarted xbacnet-server replaces it.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import logging
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from config import LIVE_STATE_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# BACnet object type numbers of the object tables
+OBJECT_TYPE_NUMBERS = {
+    'tbl_analog_input_objects': 0,
+    'tbl_analog_output_objects': 1,
+    'tbl_analog_value_objects': 2,
+    'tbl_binary_input_objects': 3,
+    'tbl_binary_output_objects': 4,
+    'tbl_binary_value_objects': 5,
+    'tbl_multi_state_input_objects': 13,
+    'tbl_multi_state_output_objects': 14,
+    'tbl_multi_state_value_objects': 19,
+}
+
+# Object tables by BACnet object type number
+OBJECT_TABLES = {object_type: table_name for table_name, object_type in OBJECT_TYPE_NUMBERS.items()}
+
+# BACnet event states, the index is the event state number
+EVENT_STATES = ('normal', 'fault', 'offnormal', 'highLimit', 'lowLimit', 'lifeSafetyAlarm')
+
+# Live state file layout, see the live state of xbacnet-server
+HEADER = struct.Struct('<4sHHIQ4x')
+SLOT = struct.Struct('<QddIIHBB4x')
+SEQUENCE = struct.Struct('<Q')
+
+# Attempts to read a slot while xbacnet-server writes it
+READ_ATTEMPTS = 100
+
+
+class LiveState:
+    """
+    Reader of the live state file of xbacnet-server.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the reader, the file is mapped on the first read.
+
+        Args:
+            path (str): Path of the live state file
+        """
+        self.path = path
+        self.inode = None
+        self.data = None
+        self.offsets = {}
+        self.tables = []
+
+    def _map(self) -> bool:
+        """
+        Map the live state file, or map it again if it has been replaced.
+
+        Returns:
+            bool: True if the live state is available
+        """
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError:
+            return False
+        if inode == self.inode:
+            return True
+
+        with open(self.path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slot_size, count, started = HEADER.unpack_from(data)
+        if magic != b'XBLS' or version != 1 or slot_size != SLOT.size or len(data) < HEADER.size + count * SLOT.size:
+            logger.warning(f"Invalid live state file {self.path}")
+            data.close()
+            return False
+
+        # Slot offsets by object type number and database id, the slots do not move while the file exists
+        offsets = {}
+        tables = []
+        for offset in range(HEADER.size, HEADER.size + count * SLOT.size, SLOT.size):
+            _, _, _, database_id, _, object_type, _, _ = SLOT.unpack_from(data, offset)
+            offsets[(object_type, database_id)] = offset
+            tables.append(OBJECT_TABLES.get(object_type))
+
+        if self.data is not None:
+            self.data.close()
+        self.inode, self.data, self.offsets, self.tables = inode, data, offsets, tables
+        return True
+
+    def _read(self, offset: int) -> Optional[Dict]:
+        """
+        Read a slot consistently.
+
+        Args:
+            offset (int): Offset of the slot
+
+        Returns:
+            Optional[Dict]: State of the object, or None if the slot kept changing
+        """
+        for _ in range(READ_ATTEMPTS):
+            (sequence,) = SEQUENCE.unpack_from(self.data, offset)
+            if sequence & 1:
+                continue
+            fields = SLOT.unpack_from(self.data, offset)
+            if SEQUENCE.unpack_from(self.data, offset)[0] == sequence == fields[0]:
+                break
+        else:
+            return None
+
+        _, present_value, changed_at, database_id, instance, object_type, status_flags, event_state = fields
+        if object_type in (3, 4, 5):
+            present_value = 'active' if present_value else 'inactive'
+        elif object_type in (13, 14, 19):
+            present_value = int(present_value)
+        return {
+            'id': database_id,
+            'object_identifier': instance,
+            'present_value': present_value,
+            'status_flags': ''.join('1' if status_flags >> bit & 1 else '0' for bit in range(4)),
+            'event_state': EVENT_STATES[event_state] if event_state < len(EVENT_STATES) else str(event_state),
+            'changed_at': datetime.fromtimestamp(changed_at, timezone.utc).isoformat() if changed_at else None,
+        }
+
+    def get(self, table_name: str, object_id: int) -> Optional[Dict]:
+        """
+        Get the live state of an object.
+
+        Args:
+            table_name (str): Database table name of the object
+            object_id (int): Database id of the object
+
+        Returns:
+            Optional[Dict]: State of the object, or None if it is not published
+        """
+        offset = self.offsets.get((OBJECT_TYPE_NUMBERS.get(table_name), object_id))
+        return self._read(offset) if offset is not None else None
+
+    def get_all(self, table_name: str) -> List[Dict]:
+        """
+        Get the live state of all objects of a table.
+
+        Args:
+            table_name (str): Database table name of the objects
+
+        Returns:
+            List[Dict]: States of the objects ordered by database id
+        """
+        object_type = OBJECT_TYPE_NUMBERS.get(table_name)
+        states = [self._read(offset) for (slot_type, _), offset in sorted(self.offsets.items())
+                  if slot_type == object_type]
+        return [state for state in states if state is not None]
+
+    def poll(self, sequences: array) -> List[Tuple[str, Dict]]:
+        """
+        Get the objects whose slots were written since the last poll.
+
+        The sequences of all slots are copied and compared at once, only the
+        changed slots are read. When xbacnet-server has replaced the file, all
+        objects are returned.
+
+        Args:
+            sequences (array): Sequences of the slots ('Q') seen by the last poll, updated in place
+
+        Returns:
+            List[Tuple[str, Dict]]: Database table name and state of each changed object
+        """
+        inode = self.inode
+        if not self.available():
+            return []
+        count = len(self.tables)
+        current = array('Q', self.data[HEADER.size:HEADER.size + count * SLOT.size])[0::SLOT.size // SEQUENCE.size]
+        if inode != self.inode or len(sequences) != count:
+            sequences[:] = array('Q', bytes(SEQUENCE.size * count))
+        if current == sequences:
+            return []
+
+        changes = []
+        for index, (sequence, previous) in enumerate(zip(current, sequences)):
+            if sequence == previous or sequence & 1:
+                continue
+            state = self._read(HEADER.size + index * SLOT.size)
+            if state is not None:
+                sequences[index] = sequence
+                changes.append((self.tables[index], state))
+        return changes
+
+    def available(self) -> bool:
+        """
+        Check that the live state file is published, mapping it if needed.
+
+        Returns:
+            bool: True if the live state is available
+        """
+        try:
+            return self._map()
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Error mapping live state {self.path}: {e}")
+            return False
+
+
+# Live state reader of this worker
+live_state = LiveState(LIVE_STATE_CONFIG['path'])
@@ -9,13 +9,17 @@ Date: 2024
 """
 
 import jsonschema
-import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, IntegrityError
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from decimal import Decimal
-from config import DATABASE_CONFIG
+from db import get_connection
+from cache import cached, read_cache
+from config import PAGINATION_CONFIG, BULK_CONFIG, EXPORT_CONFIG
+from notifications import notify_server, notify_server_many
 import logging
+import struct
+import time
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -167,6 +171,128 @@ USER_LOGOUT_SCHEMA = {
     }
 }
 
+# Struct format of a commanded priority in the priority_array column, written by xbacnet-server
+PRIORITY_ARRAY_SLOT_FORMATS = {
+    'tbl_analog_output_objects': 'd',
+    'tbl_binary_output_objects': 'B',
+    'tbl_multi_state_output_objects': 'I',
+}
+
+# Binary present values by their enumeration
+BINARY_PV = ('inactive', 'active')
+
+
+def unpack_priority_array(table_name: str, data: bytes) -> List:
+    """
+    Unpack the priority_array column of a commandable object.
+
+    The column holds a little-endian 16 bit mask in which bit n - 1 is set when
+    priority n is commanded, followed by the values of the commanded priorities.
+
+    Args:
+        table_name (str): Database table name
+        data (bytes): Packed priority array, or None if no priority is commanded
+
+    Returns:
+        list: Values of the 16 priorities, None where not commanded
+    """
+    priority_array = [None] * 16
+    if not data:
+        return priority_array
+    slot_format = PRIORITY_ARRAY_SLOT_FORMATS[table_name]
+    mask = struct.unpack_from('<H', data)[0]
+    values = iter(struct.unpack_from('<' + slot_format * bin(mask).count('1'), data, 2))
+    for i in range(16):
+        if mask & (1 << i):
+            value = next(values)
+            priority_array[i] = BINARY_PV[value] if slot_format == 'B' else value
+    return priority_array
+
+
+# Cached row counts by table name, each with the time it was counted
+row_count_cache: Dict[str, tuple] = {}
+
+
+def count_rows(cursor, table_name: str) -> int:
+    """
+    Count the rows of a table, cached for PAGINATION_CONFIG['count_cache_ttl'] seconds.
+
+    Args:
+        cursor: Dictionary cursor of a database connection
+        table_name (str): Database table name
+
+    Returns:
+        int: Number of rows
+    """
+    cached = row_count_cache.get(table_name)
+    if cached and time.monotonic() - cached[1] < PAGINATION_CONFIG['count_cache_ttl']:
+        return cached[0]
+    cursor.execute(f"SELECT COUNT(*) as total FROM {table_name}")
+    result = cursor.fetchone()
+    total = result['total'] if result else 0
+    row_count_cache[table_name] = (total, time.monotonic())
+    return total
+
+
+def compile_schema(schema: Dict) -> jsonschema.protocols.Validator:
+    """
+    Check a JSON schema and build its validator, once instead of on every jsonschema.validate call.
+
+    Args:
+        schema (dict): JSON schema
+
+    Returns:
+        jsonschema.protocols.Validator: Validator of the schema, for the draft the schema is written in
+    """
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def validate(validator: jsonschema.protocols.Validator, data: Dict):
+    """
+    Validate data like jsonschema.validate, with a compiled validator.
+
+    Args:
+        validator (jsonschema.protocols.Validator): Validator of the schema
+        data (dict): Data to validate
+
+    Raises:
+        jsonschema.ValidationError: The most relevant error, if validation fails
+    """
+    error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
+
+
+def is_id(value: Any) -> bool:
+    """
+    Check that a value is a database id.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        bool: True if the value is a positive integer
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def chunks(items: List, size: int) -> Iterator[List]:
+    """
+    Split a list into chunks, one per statement of a bulk operation.
+
+    Args:
+        items (list): Items to split
+        size (int): Maximum number of items of a chunk
+
+    Returns:
+        Iterator[List]: Consecutive chunks of the items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 class BaseModel:
     """
     Base model class for all BACnet objects.
@@ -184,16 +310,17 @@ class BaseModel:
         """
         self.table_name = table_name
         self.schema = schema
+        self.validator = compile_schema(schema)
 
     def _get_connection(self):
         """
         Get database connection.
 
         Returns:
-            mysql.connector.connection: Database connection object
+            PooledConnection: Database connection from the pool of this worker
         """
         try:
-            connection = mysql.connector.connect(**DATABASE_CONFIG)
+            connection = get_connection()
             return connection
         except Error as e:
             logger.error(f"Error connecting to MySQL database: {e}")
@@ -213,12 +340,33 @@ class BaseModel:
             jsonschema.ValidationError: If validation fails
         """
         try:
-            jsonschema.validate(data, self.schema)
+            validate(self.validator, data)
             return data
         except jsonschema.ValidationError as e:
             logger.error(f"Data validation error: {e}")
             raise
 
+    def _serialize_row(self, row: Dict) -> Dict:
+        """
+        Convert a database row for JSON serialization.
+
+        Args:
+            row (dict): Database row
+
+        Returns:
+            dict: Row with Decimal values as float and the priority array unpacked
+        """
+        serialized_row = {}
+        for key, value in row.items():
+            if isinstance(value, Decimal):
+                serialized_row[key] = float(value)
+            elif key == 'priority_array':
+                serialized_row[key] = unpack_priority_array(self.table_name, value)
+            else:
+                serialized_row[key] = value
+        return serialized_row
+
+    @cached
     def get_all(self, page: int = 1, page_size: int = 20) -> Dict:
         """
         Get all objects with pagination.
@@ -238,26 +386,15 @@ class BaseModel:
             offset = (page - 1) * page_size
 
             # Get total count
-            count_query = f"SELECT COUNT(*) as total FROM {self.table_name}"
-            cursor.execute(count_query)
-            total_result = cursor.fetchone()
-            total = total_result['total'] if total_result else 0
+            total = count_rows(cursor, self.table_name)
 
             # Get paginated data
             data_query = f"SELECT * FROM {self.table_name} ORDER BY id LIMIT %s OFFSET %s"
             cursor.execute(data_query, (page_size, offset))
             data = cursor.fetchall()
 
-            # Convert Decimal objects to float for JSON serialization
-            serialized_data = []
-            for row in data or []:
-                serialized_row = {}
-                for key, value in row.items():
-                    if isinstance(value, Decimal):
-                        serialized_row[key] = float(value)
-                    else:
-                        serialized_row[key] = value
-                serialized_data.append(serialized_row)
+            # Convert rows for JSON serialization
+            serialized_data = [self._serialize_row(row) for row in data or []]
 
             return {
                 'data': serialized_data,
@@ -277,6 +414,134 @@ class BaseModel:
             if connection and connection.is_connected():
                 connection.close()
 
+    @cached
+    def get_after(self, after: int, limit: int, include_total: bool = False) -> Dict:
+        """
+        Get the objects after an ID, for keyset pagination.
+
+        Args:
+            after (int): ID of the last object of the previous page, 0 for the first page
+            limit (int): Number of items per page
+            include_total (bool): Whether to count all objects
+
+        Returns:
+            dict: Objects ordered by ID, the ID of the last one if there are more, and the total if requested
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = self._get_connection()
+            cursor = connection.cursor(dictionary=True)
+
+            # One more row tells whether there is a next page
+            query = f"SELECT * FROM {self.table_name} WHERE id > %s ORDER BY id LIMIT %s"
+            cursor.execute(query, (after, limit + 1))
+            data = cursor.fetchall() or []
+
+            result = {
+                'data': [self._serialize_row(row) for row in data[:limit]],
+                'next': data[limit - 1]['id'] if len(data) > limit else None
+            }
+            if include_total:
+                result['total'] = count_rows(cursor, self.table_name)
+            return result
+        except Error as e:
+            logger.error(f"Error in get_after: {e}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the version of the table, incremented by the triggers on every change.
+
+        Returns:
+            int or None: Version of the table, None if it is not available
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = self._get_connection()
+            cursor = connection.cursor()
+            query = "SELECT version FROM tbl_object_versions WHERE table_name = %s"
+            cursor.execute(query, (self.table_name,))
+            result = cursor.fetchone()
+            return int(result[0]) if result else None
+        except Error as e:
+            logger.warning(f"Error in get_version: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    def get_changes(self, since: int, limit: int) -> Optional[Dict]:
+        """
+        Get the objects created, updated and deleted after a version of the table.
+
+        The triggers set the version of a row to the version of the table at its
+        last change and record deletions in tbl_object_deletions, both indexed by
+        version, so the cost follows the number of changes. The changes are cut
+        at the version read first, which no uncommitted change can be below, as
+        the version row stays locked until the transaction of a change commits.
+
+        Args:
+            since (int): Version of the table the client has, -1 for all objects
+            limit (int): Maximum number of changes
+
+        Returns:
+            dict or None: Created, updated and deleted objects in version order, the version
+                they bring the client to and whether there are more changes, or None if
+                deletions after since were pruned and the client has to sync all objects
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = self._get_connection()
+            cursor = connection.cursor(dictionary=True)
+            query = "SELECT version, pruned_version FROM tbl_object_versions WHERE table_name = %s"
+            cursor.execute(query, (self.table_name,))
+            versions = cursor.fetchone()
+            current = versions['version'] if versions else 0
+            if versions and 0 <= since < versions['pruned_version']:
+                return None
+
+            # One more change of each kind tells whether there are more
+            query = (f"SELECT * FROM {self.table_name} WHERE version > %s AND version <= %s "
+                     f"ORDER BY version LIMIT %s")
+            cursor.execute(query, (since, current, limit + 1))
+            rows = [(row['version'], 'updated', self._serialize_row(row)) for row in cursor.fetchall() or []]
+            if since >= 0:
+                query = ("SELECT object_id, object_identifier, version FROM tbl_object_deletions "
+                         "WHERE table_name = %s AND version > %s AND version <= %s ORDER BY version LIMIT %s")
+                cursor.execute(query, (self.table_name, since, current, limit + 1))
+                rows += [(row['version'], 'deleted', {'id': row['object_id'],
+                                                       'object_identifier': row['object_identifier']})
+                         for row in cursor.fetchall() or []]
+            rows.sort(key=lambda row: row[0])
+
+            result = {'created': [], 'updated': [], 'deleted': [], 'version': current, 'more': len(rows) > limit}
+            for version, kind, row in rows[:limit]:
+                if kind == 'updated' and row['created_version'] > since:
+                    kind = 'created'
+                result[kind].append(row)
+            if result['more']:
+                result['version'] = rows[limit - 1][0]
+            return result
+        except Error as e:
+            logger.error(f"Error in get_changes: {e}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    @cached
     def get_by_id(self, object_id: int) -> Optional[Dict]:
         """
         Get object by ID.
@@ -296,15 +561,9 @@ class BaseModel:
             cursor.execute(query, (object_id,))
             result = cursor.fetchone()
 
-            # Convert Decimal objects to float for JSON serialization
+            # Convert the row for JSON serialization
             if result:
-                serialized_result = {}
-                for key, value in result.items():
-                    if isinstance(value, Decimal):
-                        serialized_result[key] = float(value)
-                    else:
-                        serialized_result[key] = value
-                return serialized_result
+                return self._serialize_row(result)
             return None
         except Error as e:
             logger.error(f"Error in get_by_id: {e}")
@@ -334,15 +593,9 @@ class BaseModel:
             cursor.execute(query, (object_identifier,))
             result = cursor.fetchone()
 
-            # Convert Decimal objects to float for JSON serialization
+            # Convert the row for JSON serialization
             if result:
-                serialized_result = {}
-                for key, value in result.items():
-                    if isinstance(value, Decimal):
-                        serialized_result[key] = float(value)
-                    else:
-                        serialized_result[key] = value
-                return serialized_result
+                return self._serialize_row(result)
             return None
         except Error as e:
             logger.error(f"Error in get_by_identifier: {e}")
@@ -378,6 +631,9 @@ class BaseModel:
             query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
             cursor.execute(query, values)
             connection.commit()
+            row_count_cache.pop(self.table_name, None)
+            read_cache.invalidate(self.table_name)
+            notify_server(self.table_name, cursor.lastrowid, 'insert')
             return cursor.lastrowid
         except Error as e:
             logger.error(f"Error in create: {e}")
@@ -415,6 +671,9 @@ class BaseModel:
             query = f"UPDATE {self.table_name} SET {', '.join(set_clauses)} WHERE id = %s"
             cursor.execute(query, values)
             connection.commit()
+            if cursor.rowcount > 0:
+                read_cache.invalidate(self.table_name)
+                notify_server(self.table_name, object_id, 'update')
             return cursor.rowcount > 0
         except Error as e:
             logger.error(f"Error in update: {e}")
@@ -445,6 +704,10 @@ class BaseModel:
             query = f"DELETE FROM {self.table_name} WHERE id = %s"
             cursor.execute(query, (object_id,))
             connection.commit()
+            if cursor.rowcount > 0:
+                row_count_cache.pop(self.table_name, None)
+                read_cache.invalidate(self.table_name)
+                notify_server(self.table_name, object_id, 'delete')
             return cursor.rowcount > 0
         except Error as e:
             logger.error(f"Error in delete: {e}")
@@ -457,6 +720,221 @@ class BaseModel:
             if connection and connection.is_connected():
                 connection.close()
 
+    def validate_bulk(self, operations: Dict) -> List[Dict]:
+        """
+        Validate the items of a bulk operation in one pass.
+
+        Args:
+            operations (dict): Objects to create, objects with their id to update and ids to delete
+
+        Returns:
+            List[Dict]: Operation, index and message of each invalid item, empty if all are valid
+        """
+        if not isinstance(operations, dict) or set(operations) - {'create', 'update', 'delete'}:
+            return [{'operation': None, 'index': None,
+                     'error': 'Expected an object with create, update and delete arrays'}]
+
+        errors = []
+        object_ids = set()
+        object_identifiers = set()
+        for operation in ('create', 'update', 'delete'):
+            items = operations.get(operation, [])
+            if not isinstance(items, list):
+                errors.append({'operation': operation, 'index': None, 'error': 'Expected an array'})
+                continue
+            for index, item in enumerate(items):
+                if operation == 'delete':
+                    object_id, data = item, None
+                elif operation == 'update':
+                    object_id = item.get('id') if isinstance(item, dict) else None
+                    data = {key: value for key, value in item.items() if key != 'id'} if object_id else None
+                else:
+                    object_id, data = None, item
+
+                if operation != 'create':
+                    if not is_id(object_id):
+                        errors.append({'operation': operation, 'index': index,
+                                       'error': 'id must be a positive integer'})
+                        continue
+                    if object_id in object_ids:
+                        errors.append({'operation': operation, 'index': index,
+                                       'error': f'id {object_id} is used by another item'})
+                        continue
+                    object_ids.add(object_id)
+                if data is None:
+                    continue
+
+                # Property names become column names of the statements
+                unknown = sorted(set(data) - set(self.schema['properties'])) if isinstance(data, dict) else []
+                error = jsonschema.exceptions.best_match(self.validator.iter_errors(data))
+                if unknown:
+                    errors.append({'operation': operation, 'index': index,
+                                   'error': f"Unknown properties: {', '.join(unknown)}"})
+                elif error is not None:
+                    errors.append({'operation': operation, 'index': index, 'error': error.message})
+                elif data['object_identifier'] in object_identifiers:
+                    errors.append({'operation': operation, 'index': index,
+                                   'error': f"object_identifier {data['object_identifier']} is used by another item"})
+                else:
+                    object_identifiers.add(data['object_identifier'])
+        return errors
+
+    def find_bulk_conflicts(self, cursor, operations: Dict) -> List[Dict]:
+        """
+        Find the items of a validated bulk operation whose object identifier belongs to another object.
+
+        The objects found are locked until the end of the transaction.
+
+        Args:
+            cursor: Cursor of the connection of the transaction
+            operations (dict): Validated bulk operation
+
+        Returns:
+            List[Dict]: Operation, index and message of each conflicting item
+        """
+        # Object identifiers claimed by the items, with the id of the object updated
+        claimed = {}
+        for operation in ('create', 'update'):
+            for index, item in enumerate(operations.get(operation, [])):
+                claimed[item['object_identifier']] = (operation, index, item['id'] if operation == 'update' else None)
+        deleted = set(operations.get('delete', []))
+
+        conflicts = []
+        for chunk in chunks(list(claimed), BULK_CONFIG['batch_size']):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT id, object_identifier FROM {self.table_name} "
+                           f"WHERE object_identifier IN ({placeholders}) FOR UPDATE", chunk)
+            for object_id, object_identifier in cursor.fetchall():
+                operation, index, updated_id = claimed[object_identifier]
+                if object_id != updated_id and object_id not in deleted:
+                    conflicts.append({'operation': operation, 'index': index,
+                                      'error': f'object_identifier {object_identifier} already exists'})
+        return conflicts
+
+    def write_bulk(self, cursor, operations: Dict) -> Dict:
+        """
+        Write a validated bulk operation with multi-row statements, without committing.
+
+        The deletes run first, so that the creates and updates can take the
+        object identifiers of the deleted objects. Updates and creates setting
+        the same columns share their statements.
+
+        Args:
+            cursor: Cursor of the connection of the transaction
+            operations (dict): Validated bulk operation without conflicts
+
+        Returns:
+            dict: Index and id of each created object, id and status of each updated and deleted object
+        """
+        batch_size = BULK_CONFIG['batch_size']
+        deletes = operations.get('delete', [])
+        updates = operations.get('update', [])
+        creates = operations.get('create', [])
+
+        # Lock the objects to update and delete, the missing ones are reported as not found
+        existing = set()
+        for chunk in chunks(deletes + [item['id'] for item in updates], batch_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT id FROM {self.table_name} WHERE id IN ({placeholders}) FOR UPDATE", chunk)
+            existing.update(object_id for (object_id,) in cursor.fetchall())
+
+        deleted = [object_id for object_id in deletes if object_id in existing]
+        for chunk in chunks(deleted, batch_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE id IN ({placeholders})", chunk)
+
+        # Updates setting the same columns join the table to a derived table of their values
+        update_groups = {}
+        for item in updates:
+            if item['id'] in existing:
+                columns = tuple(key for key in item if key != 'id')
+                update_groups.setdefault(columns, []).append(item)
+        for columns, items in update_groups.items():
+            first_row = 'SELECT %s AS id, ' + ', '.join(f'%s AS {column}' for column in columns)
+            row = 'SELECT ' + ', '.join(['%s'] * (len(columns) + 1))
+            set_clauses = ', '.join(f't.{column} = v.{column}' for column in columns)
+            for chunk in chunks(items, batch_size):
+                rows = ' UNION ALL '.join([first_row] + [row] * (len(chunk) - 1))
+                values = [value for item in chunk for value in [item['id']] + [item[column] for column in columns]]
+                cursor.execute(f"UPDATE {self.table_name} AS t JOIN ({rows}) AS v ON t.id = v.id "
+                               f"SET {set_clauses}", values)
+
+        # Creates with the same columns share multi-row INSERT statements
+        create_groups = {}
+        for item in creates:
+            create_groups.setdefault(tuple(item), []).append(item)
+        for columns, items in create_groups.items():
+            row = '(' + ', '.join(['%s'] * len(columns)) + ')'
+            for chunk in chunks(items, batch_size):
+                values = [item[column] for item in chunk for column in columns]
+                cursor.execute(f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+                               f"VALUES {', '.join([row] * len(chunk))}", values)
+
+        # Ids of the created objects by their unique object identifiers
+        created_ids = {}
+        for chunk in chunks([item['object_identifier'] for item in creates], batch_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT object_identifier, id FROM {self.table_name} "
+                           f"WHERE object_identifier IN ({placeholders})", chunk)
+            created_ids.update(cursor.fetchall())
+
+        return {
+            'created': [{'index': index, 'id': created_ids[item['object_identifier']]}
+                        for index, item in enumerate(creates)],
+            'updated': [{'id': item['id'], 'status': 'updated' if item['id'] in existing else 'not_found'}
+                        for item in updates],
+            'deleted': [{'id': object_id, 'status': 'deleted' if object_id in existing else 'not_found'}
+                        for object_id in deletes],
+        }
+
+    def upsert_bulk(self, cursor, items: List[Dict]) -> Dict[int, Tuple[str, int]]:
+        """
+        Insert validated objects, or update the objects with their object identifiers, without committing.
+
+        Items with the same columns share multi-row INSERT ... ON DUPLICATE KEY
+        UPDATE statements. Columns an item leaves out keep their values in the
+        updated object.
+
+        Args:
+            cursor: Cursor of the connection of the transaction
+            items (list): Validated objects with distinct object identifiers
+
+        Returns:
+            Dict[int, Tuple[str, int]]: Status ('created' or 'updated') and id of each object by object identifier
+        """
+        batch_size = BULK_CONFIG['batch_size']
+        object_identifiers = [item['object_identifier'] for item in items]
+
+        # Lock the objects to update, the others are created
+        existing = set()
+        for chunk in chunks(object_identifiers, batch_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT object_identifier FROM {self.table_name} "
+                           f"WHERE object_identifier IN ({placeholders}) FOR UPDATE", chunk)
+            existing.update(object_identifier for (object_identifier,) in cursor.fetchall())
+
+        groups = {}
+        for item in items:
+            groups.setdefault(tuple(item), []).append(item)
+        for columns, group in groups.items():
+            row = '(' + ', '.join(['%s'] * len(columns)) + ')'
+            updates = ', '.join(f'{column} = VALUES({column})' for column in columns if column != 'object_identifier')
+            for chunk in chunks(group, batch_size):
+                values = [item[column] for item in chunk for column in columns]
+                cursor.execute(f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+                               f"VALUES {', '.join([row] * len(chunk))} ON DUPLICATE KEY UPDATE {updates}", values)
+
+        object_ids = {}
+        for chunk in chunks(object_identifiers, batch_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT object_identifier, id FROM {self.table_name} "
+                           f"WHERE object_identifier IN ({placeholders})", chunk)
+            object_ids.update(cursor.fetchall())
+
+        return {object_identifier: ('updated' if object_identifier in existing else 'created',
+                                    object_ids[object_identifier])
+                for object_identifier in object_identifiers}
+
 class UserModel:
     """
     User management model for handling user operations.
@@ -467,16 +945,20 @@ class UserModel:
     def __init__(self):
         """Initialize user model."""
         self.table_name = 'tbl_users'
+        self.create_validator = compile_schema(USER_CREATE_SCHEMA)
+        self.update_validator = compile_schema(USER_UPDATE_SCHEMA)
+        self.login_validator = compile_schema(USER_LOGIN_SCHEMA)
+        self.logout_validator = compile_schema(USER_LOGOUT_SCHEMA)
 
     def _get_connection(self):
         """
         Get database connection.
 
         Returns:
-            mysql.connector.connection: Database connection object
+            PooledConnection: Database connection from the pool of this worker
         """
         try:
-            connection = mysql.connector.connect(**DATABASE_CONFIG)
+            connection = get_connection()
             return connection
         except Error as e:
             logger.error(f"Error connecting to MySQL database: {e}")
@@ -521,7 +1003,7 @@ class UserModel:
             jsonschema.ValidationError: If validation fails
         """
         try:
-            jsonschema.validate(data, USER_CREATE_SCHEMA)
+            validate(self.create_validator, data)
             return data
         except jsonschema.ValidationError as e:
             logger.error(f"User creation data validation error: {e}")
@@ -541,7 +1023,7 @@ class UserModel:
             jsonschema.ValidationError: If validation fails
         """
         try:
-            jsonschema.validate(data, USER_UPDATE_SCHEMA)
+            validate(self.update_validator, data)
             return data
         except jsonschema.ValidationError as e:
             logger.error(f"User update data validation error: {e}")
@@ -561,7 +1043,7 @@ class UserModel:
             jsonschema.ValidationError: If validation fails
         """
         try:
-            jsonschema.validate(data, USER_LOGIN_SCHEMA)
+            validate(self.login_validator, data)
             return data
         except jsonschema.ValidationError as e:
             logger.error(f"User login data validation error: {e}")
@@ -581,12 +1063,13 @@ class UserModel:
             jsonschema.ValidationError: If validation fails
         """
         try:
-            jsonschema.validate(data, USER_LOGOUT_SCHEMA)
+            validate(self.logout_validator, data)
             return data
         except jsonschema.ValidationError as e:
             logger.error(f"User logout data validation error: {e}")
             raise
 
+    @cached
     def get_all(self, page: int = 1, page_size: int = 20) -> Dict:
         """
         Get all users with pagination.
@@ -606,10 +1089,7 @@ class UserModel:
             offset = (page - 1) * page_size
 
             # Get total count
-            count_query = f"SELECT COUNT(*) as total FROM {self.table_name}"
-            cursor.execute(count_query)
-            total_result = cursor.fetchone()
-            total = total_result['total'] if total_result else 0
+            total = count_rows(cursor, self.table_name)
 
             # Get paginated data (exclude password and salt)
             data_query = f"SELECT id, name, uuid, display_name, email, is_admin FROM {self.table_name} ORDER BY id LIMIT %s OFFSET %s"
@@ -634,6 +1114,48 @@ class UserModel:
             if connection and connection.is_connected():
                 connection.close()
 
+    @cached
+    def get_after(self, after: int, limit: int, include_total: bool = False) -> Dict:
+        """
+        Get the users after an ID, for keyset pagination.
+
+        Args:
+            after (int): ID of the last user of the previous page, 0 for the first page
+            limit (int): Number of items per page
+            include_total (bool): Whether to count all users
+
+        Returns:
+            dict: Users ordered by ID, the ID of the last one if there are more, and the total if requested
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = self._get_connection()
+            cursor = connection.cursor(dictionary=True)
+
+            # One more row tells whether there is a next page (exclude password and salt)
+            query = (f"SELECT id, name, uuid, display_name, email, is_admin FROM {self.table_name} "
+                     f"WHERE id > %s ORDER BY id LIMIT %s")
+            cursor.execute(query, (after, limit + 1))
+            data = cursor.fetchall() or []
+
+            result = {
+                'data': data[:limit],
+                'next': data[limit - 1]['id'] if len(data) > limit else None
+            }
+            if include_total:
+                result['total'] = count_rows(cursor, self.table_name)
+            return result
+        except Error as e:
+            logger.error(f"Error in get_after: {e}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    @cached
     def get_by_id(self, user_id: int) -> Optional[Dict]:
         """
         Get user by ID.
@@ -729,6 +1251,8 @@ class UserModel:
             query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
             cursor.execute(query, values)
             connection.commit()
+            row_count_cache.pop(self.table_name, None)
+            read_cache.invalidate(self.table_name)
             return cursor.lastrowid
         except Error as e:
             logger.error(f"Error in create: {e}")
@@ -781,6 +1305,7 @@ class UserModel:
             query = f"UPDATE {self.table_name} SET {', '.join(set_clauses)} WHERE id = %s"
             cursor.execute(query, values)
             connection.commit()
+            read_cache.invalidate(self.table_name)
             return cursor.rowcount > 0
         except Error as e:
             logger.error(f"Error in update: {e}")
@@ -811,6 +1336,8 @@ class UserModel:
             query = f"DELETE FROM {self.table_name} WHERE id = %s"
             cursor.execute(query, (user_id,))
             connection.commit()
+            row_count_cache.pop(self.table_name, None)
+            read_cache.invalidate(self.table_name)
             return cursor.rowcount > 0
         except Error as e:
             logger.error(f"Error in delete: {e}")
@@ -919,6 +1446,208 @@ MultiStateValueModel = BaseModel('tbl_multi_state_value_objects', MULTI_STATE_IN
 # User model instance
 UserModel = UserModel()
 
+def prune_deletions(retention_days: int):
+    """
+    Prune the deletions older than the retention period from tbl_object_deletions.
+
+    The version of the last pruned deletion of each table is kept in
+    tbl_object_versions, so that clients with an older version resync.
+
+    Args:
+        retention_days (int): Days the deletions are kept
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        connection.start_transaction()
+        cursor.execute("SELECT UTC_TIMESTAMP(6) - INTERVAL %s DAY", (retention_days,))
+        (cutoff,) = cursor.fetchone()
+        cursor.execute("UPDATE tbl_object_versions AS v "
+                       "JOIN (SELECT table_name, MAX(version) AS version FROM tbl_object_deletions "
+                       "      WHERE utc_date_time < %s GROUP BY table_name) AS d ON d.table_name = v.table_name "
+                       "SET v.pruned_version = GREATEST(v.pruned_version, d.version)", (cutoff,))
+        cursor.execute("DELETE FROM tbl_object_deletions WHERE utc_date_time < %s", (cutoff,))
+        connection.commit()
+    except Error as e:
+        logger.error(f"Error in prune_deletions: {e}")
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def bulk_write(batches: Dict[str, Dict]) -> Dict:
+    """
+    Validate and write the bulk operations of one or more object types in one transaction.
+
+    Nothing is written if an item is invalid or conflicts with another object.
+
+    Args:
+        batches (dict): Bulk operation of each model name
+
+    Returns:
+        dict: 'results' with the results of each model name, or 'errors' with the
+            invalid ('reason': 'invalid') or conflicting ('reason': 'conflict') items
+    """
+    errors = []
+    for model_name, operations in batches.items():
+        for error in MODELS[model_name].validate_bulk(operations):
+            errors.append(dict(error, type=model_name, reason='invalid'))
+    if errors:
+        return {'errors': errors}
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        connection.start_transaction()
+        for model_name, operations in batches.items():
+            for error in MODELS[model_name].find_bulk_conflicts(cursor, operations):
+                errors.append(dict(error, type=model_name, reason='conflict'))
+        if errors:
+            connection.rollback()
+            return {'errors': errors}
+
+        results = {model_name: MODELS[model_name].write_bulk(cursor, operations)
+                   for model_name, operations in batches.items()}
+        connection.commit()
+    except IntegrityError as e:
+        # Object identifiers swapped between objects of the same request
+        logger.warning(f"Conflict in bulk_write: {e}")
+        connection.rollback()
+        return {'errors': [{'type': None, 'operation': None, 'index': None, 'error': e.msg, 'reason': 'conflict'}]}
+    except Error as e:
+        logger.error(f"Error in bulk_write: {e}")
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+    for model_name, result in results.items():
+        table_name = MODELS[model_name].table_name
+        row_count_cache.pop(table_name, None)
+        read_cache.invalidate(table_name)
+        for operation, key, status in (('delete', 'deleted', 'deleted'), ('update', 'updated', 'updated'),
+                                       ('insert', 'created', None)):
+            object_ids = [item['id'] for item in result[key] if status is None or item['status'] == status]
+            if object_ids:
+                notify_server_many(table_name, object_ids, operation)
+    return {'results': results}
+
+
+def get_columns(model_names: List[str]) -> List[str]:
+    """
+    Get the columns of the tables of object types, each column once.
+
+    Args:
+        model_names (list): Model names of the object types
+
+    Returns:
+        List[str]: Column names in the order of the types and of the columns in their tables
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        table_names = [MODELS[model_name].table_name for model_name in model_names]
+        placeholders = ', '.join(['%s'] * len(table_names))
+        cursor.execute("SELECT table_name, column_name FROM information_schema.columns "
+                       f"WHERE table_schema = DATABASE() AND table_name IN ({placeholders}) "
+                       "ORDER BY ordinal_position", table_names)
+        table_columns = {}
+        for table_name, column_name in cursor.fetchall():
+            table_columns.setdefault(table_name, []).append(column_name)
+        columns = []
+        for table_name in table_names:
+            columns.extend(column for column in table_columns.get(table_name, []) if column not in columns)
+        return columns
+    except Error as e:
+        logger.error(f"Error in get_columns: {e}")
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def export_objects(model_names: List[str]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Read all objects of object types from one consistent snapshot of the database.
+
+    The connection is checked out and the snapshot taken before this function
+    returns, so that database errors are raised to the caller. The rows are
+    then read through an unbuffered cursor EXPORT_CONFIG['batch_size'] at a
+    time while the iterator is consumed, and the connection is held until it
+    is exhausted or closed.
+
+    Args:
+        model_names (list): Model names of the object types
+
+    Returns:
+        Iterator[Tuple[str, List[Dict]]]: Model name and serialized rows of each batch, in ID order per type
+
+    Raises:
+        mysql.connector.Error: If the snapshot could not be taken
+    """
+    connection = get_connection()
+    try:
+        connection.start_transaction(consistent_snapshot=True, readonly=True)
+    except Error as e:
+        logger.error(f"Error in export_objects: {e}")
+        connection.close()
+        raise
+    return _read_batches(connection, model_names)
+
+
+def _read_batches(connection, model_names: List[str]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Read the objects of export_objects in batches.
+
+    Args:
+        connection: Connection with the snapshot transaction, owned by the iterator
+        model_names (list): Model names of the object types
+
+    Returns:
+        Iterator[Tuple[str, List[Dict]]]: Model name and serialized rows of each batch
+    """
+    finished = False
+    try:
+        for model_name in model_names:
+            model = MODELS[model_name]
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            cursor.execute(f"SELECT * FROM {model.table_name} ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(EXPORT_CONFIG['batch_size'])
+                if not rows:
+                    break
+                yield model_name, [model._serialize_row(row) for row in rows]
+            cursor.close()
+        connection.commit()
+        finished = True
+    except Error as e:
+        logger.error(f"Error in export_objects: {e}")
+        raise
+    finally:
+        # A connection with unread rows of an export that was not finished cannot be reused
+        if finished:
+            connection.close()
+        else:
+            connection.discard()
+
+
 # Model registry for easy access
 MODELS = {
     'analog_input': AnalogInputModel,
@@ -0,0 +1,80 @@
+"""
+XBACnet API Change Notifications
+
+This module notifies xbacnet-server of the object changes committed by the API,
+so that the server applies them at once instead of on the next run of its
+refreshing task.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import json
+import logging
+import socket
+from typing import List
+from config import NOTIFICATION_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# UDP socket of this process, created on first use
+_socket = None
+
+# Ids in a notification of many objects, the server reads datagrams of up to 4096 bytes
+MAX_IDS_PER_NOTIFICATION = 200
+
+
+def notify_server(table_name: str, object_id: int, operation: str) -> None:
+    """
+    Notify xbacnet-server of a committed object change.
+
+    The notification is a UDP datagram on the loopback interface and is not
+    acknowledged, a lost notification is picked up by the refreshing task of
+    the server.
+
+    Args:
+        table_name (str): Database table name
+        object_id (int): Object ID
+        operation (str): 'insert', 'update' or 'delete'
+    """
+    global _socket
+    if not NOTIFICATION_CONFIG['enabled']:
+        return
+
+    message = json.dumps({'table': table_name, 'id': object_id, 'operation': operation})
+    try:
+        if _socket is None:
+            _socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _socket.setblocking(False)
+        _socket.sendto(message.encode('utf-8'), (NOTIFICATION_CONFIG['host'], NOTIFICATION_CONFIG['port']))
+    except OSError as e:
+        logger.warning(f"Error notifying xbacnet-server: {e}")
+
+
+def notify_server_many(table_name: str, object_ids: List[int], operation: str) -> None:
+    """
+    Notify xbacnet-server of committed changes of many objects of a table.
+
+    The ids are sent in datagrams of at most MAX_IDS_PER_NOTIFICATION ids,
+    which fit the receive buffer of the server.
+
+    Args:
+        table_name (str): Database table name
+        object_ids (List[int]): Object IDs
+        operation (str): 'insert', 'update' or 'delete'
+    """
+    global _socket
+    if not NOTIFICATION_CONFIG['enabled']:
+        return
+
+    try:
+        if _socket is None:
+            _socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _socket.setblocking(False)
+        for start in range(0, len(object_ids), MAX_IDS_PER_NOTIFICATION):
+            message = json.dumps({'table': table_name, 'ids': object_ids[start:start + MAX_IDS_PER_NOTIFICATION],
+                                  'operation': operation})
+            _socket.sendto(message.encode('utf-8'), (NOTIFICATION_CONFIG['host'], NOTIFICATION_CONFIG['port']))
+    except OSError as e:
+        logger.warning(f"Error notifying xbacnet-server: {e}")
@@ -9,17 +9,355 @@ Author: XBACnet Team
 Date: 2024
 """
 
+import base64
+import csv
 import falcon
+import io
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any
-from models import MODELS
-from config import PAGINATION_CONFIG
+import math
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from models import MODELS, BaseModel, prune_deletions, bulk_write, get_columns, export_objects
+from importer import import_objects
+from codec import dumps, loads
+from history import get_history
+from live import live_state
+from db import get_connection, pool
+from cache import read_cache
+from config import PAGINATION_CONFIG, HISTORY_CONFIG, CHANGES_CONFIG, BULK_CONFIG
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Time this worker last pruned the deletions
+last_pruned = 0.0
+
+# Heartbeat of the gunicorn worker, set by post_worker_init in gunicorn.conf.py. A sync worker only beats between
+# requests and is killed after the timeout, so exports and imports beat after each batch: they run as long as they
+# make progress, and a request stalled on a client that stopped sending or reading is still ended by the timeout
+worker_heartbeat: Callable[[], None] = lambda: None
+
+# Content types of the export formats
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+def parse_time(value: str) -> float:
+    """
+    Parse a time query parameter.
+
+    Args:
+        value (str): Seconds since the epoch, or an ISO 8601 date and time, UTC if no offset is given
+
+    Returns:
+        float: Seconds since the epoch
+
+    Raises:
+        ValueError: If the value is not a valid time
+    """
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+def encode_cursor(object_id: int) -> str:
+    """
+    Encode the ID of the last item of a page as an opaque cursor.
+
+    Args:
+        object_id (int): ID of the last item of the page
+
+    Returns:
+        str: Cursor for the after query parameter
+    """
+    return base64.urlsafe_b64encode(f"id:{object_id}".encode('ascii')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor to the ID of the last item of the previous page.
+
+    Args:
+        cursor (str): Cursor from the after query parameter
+
+    Returns:
+        int: ID of the last item of the previous page
+
+    Raises:
+        ValueError: If the cursor is not valid
+    """
+    value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+    if not value.startswith('id:'):
+        raise ValueError(f"Invalid cursor {cursor}")
+    return int(value[3:])
+
+def encode_version_token(versions: Dict[str, int]) -> str:
+    """
+    Encode the versions of the object tables a client has as an opaque token.
+
+    Args:
+        versions (dict): Versions by model name
+
+    Returns:
+        str: Token for the since query parameter
+    """
+    return base64.urlsafe_b64encode(json.dumps(versions, separators=(',', ':')).encode('ascii')).decode('ascii').rstrip('=')
+
+def decode_version_token(token: str) -> Dict[str, int]:
+    """
+    Decode a version token.
+
+    Args:
+        token (str): Token from the since query parameter
+
+    Returns:
+        dict: Versions by model name
+
+    Raises:
+        ValueError: If the token is not valid
+    """
+    versions = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    if not isinstance(versions, dict) or not all(isinstance(version, int) for version in versions.values()):
+        raise ValueError(f"Invalid version token {token}")
+    return versions
+
+def get_changes(model_names: list, req: falcon.Request, resp: falcon.Response) -> Optional[Dict]:
+    """
+    Get the changes of object tables after the versions of the since query parameter.
+
+    Without since all objects are returned as created. The deletions older than
+    CHANGES_CONFIG['retention_days'] are pruned at most every
+    CHANGES_CONFIG['prune_interval'] seconds by each worker.
+
+    Args:
+        model_names (list): Names of the models of the object tables
+        req: Falcon request object
+        resp: Falcon response object
+
+    Returns:
+        dict or None: Changes by model name, the token of the versions they bring the client
+            to and whether there are more changes, or None if the response is an error
+    """
+    global last_pruned
+    try:
+        versions = decode_version_token(req.get_param('since')) if req.get_param('since') else {}
+    except ValueError:
+        resp.status = falcon.HTTP_400
+        resp.media = {'error': 'Invalid since parameter'}
+        return None
+
+    if time.time() - last_pruned > CHANGES_CONFIG['prune_interval']:
+        last_pruned = time.time()
+        prune_deletions(CHANGES_CONFIG['retention_days'])
+
+    changes = {}
+    more = False
+    remaining = CHANGES_CONFIG['max_changes']
+    for model_name in model_names:
+        since = versions.get(model_name, -1)
+        if remaining <= 0:
+            more = True
+            continue
+        result = MODELS[model_name].get_changes(since, remaining)
+        if result is None:
+            resp.status = falcon.HTTP_410
+            resp.media = {'error': 'Changes since this version were pruned, sync all objects without since'}
+            return None
+        versions[model_name] = result.pop('version')
+        more = more or result.pop('more')
+        remaining -= len(result['created']) + len(result['updated']) + len(result['deleted'])
+        changes[model_name] = result
+    return {'changes': changes, 'version': encode_version_token(versions), 'more': more}
+
+def write_bulk(batches: Dict[str, Dict], resp: falcon.Response):
+    """
+    Write the bulk operations of a request and set the response.
+
+    Args:
+        batches (dict): Bulk operation of each model name
+        resp: Falcon response object
+    """
+    items = sum(len(items) for operations in batches.values() if isinstance(operations, dict)
+                for items in operations.values() if isinstance(items, list))
+    if items > BULK_CONFIG['max_items']:
+        resp.status = falcon.HTTP_413
+        resp.media = {'error': f"A bulk request has at most {BULK_CONFIG['max_items']} items"}
+        return
+
+    result = bulk_write(batches)
+    if 'errors' in result:
+        conflict = any(error['reason'] == 'conflict' for error in result['errors'])
+        resp.status = falcon.HTTP_409 if conflict else falcon.HTTP_400
+        resp.media = {'error': 'Conflicting items' if conflict else 'Invalid items', 'errors': result['errors']}
+    else:
+        resp.status = falcon.HTTP_200
+        resp.media = result
+
+def ndjson_chunks(batches: Iterator[Tuple[str, List[Dict]]], include_type: bool) -> Iterator[bytes]:
+    """
+    Format batches of exported objects as NDJSON, one chunk per batch.
+
+    Args:
+        batches (Iterator): Model name and objects of each batch
+        include_type (bool): Whether to add the model name to each object as type
+
+    Returns:
+        Iterator[bytes]: JSON lines of the objects
+    """
+    # Closing the chunks, as the server does when the client goes away, releases the connection of the batches
+    with closing(batches):
+        for model_name, rows in batches:
+            if include_type:
+                rows = [dict(row, type=model_name) for row in rows]
+            yield b''.join(dumps(row) + b'\n' for row in rows)
+            worker_heartbeat()
+
+def csv_chunks(batches: Iterator[Tuple[str, List[Dict]]], columns: List[str], include_type: bool) -> Iterator[bytes]:
+    """
+    Format batches of exported objects as CSV with a header row, one chunk per batch.
+
+    Columns an object type does not have are empty, lists such as the
+    priority array are written as JSON.
+
+    Args:
+        batches (Iterator): Model name and objects of each batch
+        columns (list): Column names
+        include_type (bool): Whether to start each row with the model name in a type column
+
+    Returns:
+        Iterator[bytes]: Lines of the CSV file
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow((['type'] if include_type else []) + columns)
+    # Closing the chunks, as the server does when the client goes away, releases the connection of the batches
+    with closing(batches):
+        for model_name, rows in batches:
+            for row in rows:
+                values = [row.get(column) for column in columns]
+                writer.writerow(([model_name] if include_type else []) +
+                                ['' if value is None else json.dumps(value) if isinstance(value, (list, dict))
+                                 else value for value in values])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            worker_heartbeat()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def export(model_names: List[str], name: str, req: falcon.Request, resp: falcon.Response, include_type: bool):
+    """
+    Stream all objects of object types in the format of the format parameter.
+
+    Args:
+        model_names (list): Model names of the object types
+        name (str): File name of the export without extension
+        req: Falcon request object
+        resp: Falcon response object
+        include_type (bool): Whether to add the model name of each object
+    """
+    export_format = req.get_param('format', default='ndjson')
+    if export_format not in EXPORT_FORMATS:
+        resp.status = falcon.HTTP_400
+        resp.media = {'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}
+        return
+
+    columns = get_columns(model_names) if export_format == 'csv' else None
+    batches = export_objects(model_names)
+    resp.content_type = EXPORT_FORMATS[export_format]
+    resp.set_header('Content-Disposition', f'attachment; filename="{name}.{export_format}"')
+    if export_format == 'csv':
+        resp.stream = csv_chunks(batches, columns, include_type)
+    else:
+        resp.stream = ndjson_chunks(batches, include_type)
+    resp.status = falcon.HTTP_200
+
+def import_body(model_name: Optional[str], req: falcon.Request, resp: falcon.Response):
+    """
+    Import the objects of a CSV or NDJSON request body, read incrementally.
+
+    Args:
+        model_name (str): Model name of all objects, None to read it from each row
+        req: Falcon request object
+        resp: Falcon response object
+    """
+    content_type = req.content_type or ''
+    import_format = next((name for name, export_type in EXPORT_FORMATS.items()
+                          if content_type.split(';')[0] == export_type.split(';')[0]), None)
+    if import_format is None:
+        resp.status = falcon.HTTP_415
+        resp.media = {'error': f"Content-Type must be one of {', '.join(EXPORT_FORMATS.values())}"}
+        return
+
+    def progress(summary: Dict):
+        logger.info(f"Import of {req.path}: {summary['rows']} rows")
+        worker_heartbeat()
+
+    lines = io.TextIOWrapper(req.bounded_stream, encoding='utf-8-sig', newline='')
+    resp.media = import_objects(lines, import_format, model_name, progress)
+    resp.status = falcon.HTTP_200
+
+def not_modified(req: falcon.Request, resp: falcon.Response, version: int) -> bool:
+    """
+    Set the ETag of a response from the version of its table and check If-None-Match.
+
+    Args:
+        req: Falcon request object
+        resp: Falcon response object
+        version (int): Version of the table, None if it is not available
+
+    Returns:
+        bool: True if the client has the current representation and the response is 304
+    """
+    if version is None:
+        return False
+    etag = f"v{version}"
+    resp.etag = f'"{etag}"'
+    if req.if_none_match and ('*' in req.if_none_match or etag in req.if_none_match):
+        resp.status = falcon.HTTP_304
+        return True
+    return False
+
+def get_page_after(model, req: falcon.Request, resp: falcon.Response, version: int = None):
+    """
+    Respond with a page of keyset pagination.
+
+    The page starts after the cursor of the after query parameter (the first page
+    without it) and has up to limit items. The response has the cursor of the next
+    page, null on the last page, and the total number of items if total=true.
+
+    Args:
+        model: Model of the listed items
+        req: Falcon request object
+        resp: Falcon response object
+        version: Version of the table, which the items must not be older than
+    """
+    try:
+        after = decode_cursor(req.get_param('after')) if req.get_param('after') else 0
+        limit = req.get_param_as_int('limit', min_value=1) or PAGINATION_CONFIG['default_page_size']
+        include_total = req.get_param_as_bool('total', default=False)
+    except (ValueError, falcon.HTTPBadRequest):
+        resp.status = falcon.HTTP_400
+        resp.media = {'error': 'Invalid after, limit or total parameter'}
+        return
+    limit = min(limit, PAGINATION_CONFIG['max_page_size'])
+
+    result = model.get_after(after, limit, include_total, version=version)
+    pagination = {
+        'limit': limit,
+        'next_cursor': encode_cursor(result['next']) if result['next'] is not None else None
+    }
+    if include_total:
+        pagination['total'] = result['total']
+    resp.media = {'data': result['data'], 'pagination': pagination}
+    resp.status = falcon.HTTP_200
+
 class BaseResource:
     """
     Base resource class for all BACnet object types.
@@ -47,15 +385,32 @@ class BaseResource:
             object_id: Optional object ID for single object retrieval
         """
         try:
+            source = req.get_param('source', default='database')
+            if source == 'live':
+                self.on_get_live(req, resp, object_id)
+                return
+            if source != 'database':
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': 'Invalid source parameter, must be database or live'}
+                return
+
+            # The version of the table answers conditional requests without querying the objects
+            version = self.model.get_version()
+            if not_modified(req, resp, version):
+                return
+
             if object_id:
                 # Get single object by ID
-                result = self.model.get_by_id(object_id)
+                result = self.model.get_by_id(object_id, version=version)
                 if result:
                     resp.media = result
                     resp.status = falcon.HTTP_200
                 else:
                     resp.status = falcon.HTTP_404
                     resp.media = {'error': f'{self.model_name} with ID {object_id} not found'}
+            elif req.get_param('after') is not None or req.get_param('limit') is not None:
+                # Get a page of objects after a cursor
+                get_page_after(self.model, req, resp, version)
             else:
                 # Get paginated list of objects
                 page = int(req.get_param('page', default=1))
@@ -67,7 +422,7 @@ class BaseResource:
                 if page_size > PAGINATION_CONFIG['max_page_size']:
                     page_size = PAGINATION_CONFIG['max_page_size']
 
-                result = self.model.get_all(page, page_size)
+                result = self.model.get_all(page, page_size, version=version)
                 resp.media = result
                 resp.status = falcon.HTTP_200
 
@@ -76,6 +431,71 @@ class BaseResource:
             resp.status = falcon.HTTP_500
             resp.media = {'error': 'Internal server error'}
 
+    def on_get_changes(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle GET requests for the objects created, updated and deleted since a version.
+
+        Query parameter since is the version token of the previous response, all
+        objects are returned without it. Repeat with the new token while more is true.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            result = get_changes([self.model_name], req, resp)
+            if result is not None:
+                changes = result['changes'][self.model_name]
+                resp.media = dict(changes, version=result['version'], more=result['more'])
+                resp.status = falcon.HTTP_200
+
+        except Exception as e:
+            logger.error(f"Error in GET changes {self.model_name}: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+    def on_get_live(self, req: falcon.Request, resp: falcon.Response, object_id: int = None):
+        """
+        Handle GET requests for the live state published by xbacnet-server.
+
+        The present value, status flags and event state are read from shared
+        memory instead of the database, the other properties are left out.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+            object_id: Optional object ID for single object retrieval
+        """
+        if not live_state.available():
+            resp.status = falcon.HTTP_503
+            resp.media = {'error': 'Live state is not available'}
+            return
+
+        if object_id:
+            result = live_state.get(self.model.table_name, object_id)
+            if result:
+                resp.media = result
+                resp.status = falcon.HTTP_200
+            else:
+                resp.status = falcon.HTTP_404
+                resp.media = {'error': f'{self.model_name} with ID {object_id} not found'}
+            return
+
+        page = max(1, int(req.get_param('page', default=1)))
+        page_size = min(int(req.get_param('page_size', default=PAGINATION_CONFIG['default_page_size'])),
+                        PAGINATION_CONFIG['max_page_size'])
+        data = live_state.get_all(self.model.table_name)
+        resp.media = {
+            'data': data[(page - 1) * page_size:page * page_size],
+            'pagination': {
+                'page': page,
+                'page_size': page_size,
+                'total': len(data),
+                'pages': (len(data) + page_size - 1) // page_size
+            }
+        }
+        resp.status = falcon.HTTP_200
+
     def on_post(self, req: falcon.Request, resp: falcon.Response):
         """
         Handle POST requests for creating new objects.
@@ -86,7 +506,7 @@ class BaseResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Create new object
             object_id = self.model.create(data)
@@ -115,7 +535,7 @@ class BaseResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Update object
             success = self.model.update(object_id, data)
@@ -161,6 +581,119 @@ class BaseResource:
             resp.status = falcon.HTTP_500
             resp.media = {'error': 'Internal server error'}
 
+    def on_get_export(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle GET requests for exporting all objects as NDJSON or CSV.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            export([self.model_name], self.model_name, req, resp, include_type=False)
+
+        except Exception as e:
+            logger.error(f"Error in GET export {self.model_name}: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+    def on_post_import(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle POST requests for importing objects from CSV or NDJSON.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            import_body(self.model_name, req, resp)
+
+        except Exception as e:
+            logger.error(f"Error in POST import {self.model_name}: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+    def on_post_bulk(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle POST requests for creating, updating and deleting objects in one transaction.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            # Parse request body
+            data = loads(req.bounded_stream.read())
+            write_bulk({self.model_name: data}, resp)
+            if resp.status == falcon.HTTP_200:
+                resp.media = resp.media['results'][self.model_name]
+
+        except json.JSONDecodeError:
+            resp.status = falcon.HTTP_400
+            resp.media = {'error': 'Invalid JSON in request body'}
+        except Exception as e:
+            logger.error(f"Error in POST bulk {self.model_name}: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+    def on_get_history(self, req: falcon.Request, resp: falcon.Response, object_id: int):
+        """
+        Handle GET requests for the present value history of an object.
+
+        Query parameters are from and to (seconds since the epoch or ISO 8601, the last
+        day by default) and bucket (seconds, by default the range is split into
+        HISTORY_CONFIG['default_buckets'] buckets). Each bucket has the min, max, avg
+        and last present value and the number of samples.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+            object_id: Object ID
+        """
+        try:
+            try:
+                end = parse_time(req.get_param('to')) if req.get_param('to') else time.time()
+                start = parse_time(req.get_param('from')) if req.get_param('from') else end - 86400
+                bucket = req.get_param_as_int('bucket', min_value=1)
+            except (ValueError, falcon.HTTPBadRequest):
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': 'Invalid from, to or bucket parameter'}
+                return
+            if start >= end:
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': 'from must be before to'}
+                return
+            if bucket is None:
+                bucket = max(1, math.ceil((end - start) / HISTORY_CONFIG['default_buckets']))
+            if (end - start) / bucket > HISTORY_CONFIG['max_buckets']:
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': f"Too many buckets, at most {HISTORY_CONFIG['max_buckets']} are allowed"}
+                return
+
+            obj = self.model.get_by_id(object_id)
+            if not obj:
+                resp.status = falcon.HTTP_404
+                resp.media = {'error': f'{self.model_name} with ID {object_id} not found'}
+                return
+
+            buckets = get_history(self.model.table_name, obj['object_identifier'], start, end, bucket)
+            for item in buckets:
+                item['time'] = datetime.fromtimestamp(item['time'], timezone.utc).isoformat()
+            resp.media = {
+                'id': object_id,
+                'object_identifier': obj['object_identifier'],
+                'from': datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                'to': datetime.fromtimestamp(end, timezone.utc).isoformat(),
+                'bucket': bucket,
+                'data': buckets
+            }
+            resp.status = falcon.HTTP_200
+
+        except Exception as e:
+            logger.error(f"Error in GET history {self.model_name}: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
 # Resource classes for each BACnet object type
 class AnalogInputResource(BaseResource):
     """Resource for managing analog input objects."""
@@ -207,6 +740,121 @@ class MultiStateValueResource(BaseResource):
     def __init__(self):
         super().__init__('multi_state_value')
 
+class ObjectChangesResource:
+    """
+    Delta sync resource for the objects of all types.
+
+    Provides endpoint to get the objects created, updated and deleted since a version.
+    """
+
+    def on_get(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle GET requests for the changes of all object types.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            model_names = [name for name, model in MODELS.items() if isinstance(model, BaseModel)]
+            result = get_changes(model_names, req, resp)
+            if result is not None:
+                result['changes'] = {name: changes for name, changes in result['changes'].items()
+                                     if changes['created'] or changes['updated'] or changes['deleted']}
+                resp.media = result
+                resp.status = falcon.HTTP_200
+
+        except Exception as e:
+            logger.error(f"Error in GET object changes: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+class ObjectExportResource:
+    """
+    Export resource for the objects of all types.
+
+    Provides endpoint to stream the objects of all or some types as NDJSON or CSV.
+    """
+
+    def on_get(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle GET requests for exporting the objects of several types.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            model_names = [name for name, model in MODELS.items() if isinstance(model, BaseModel)]
+            types = [value for value in req.get_param('type', default='').split(',') if value]
+            if set(types) - set(model_names):
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': f"type must be one or more of {', '.join(model_names)}"}
+                return
+            export([name for name in model_names if not types or name in types], 'objects', req, resp,
+                   include_type=True)
+
+        except Exception as e:
+            logger.error(f"Error in GET object export: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+class ObjectImportResource:
+    """
+    Import resource for the objects of all types.
+
+    Provides endpoint to create or update objects of several types from CSV or NDJSON.
+    """
+
+    def on_post(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle POST requests for importing objects of several types.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            import_body(None, req, resp)
+
+        except Exception as e:
+            logger.error(f"Error in POST object import: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
+class ObjectBulkResource:
+    """
+    Bulk resource for the objects of all types.
+
+    Provides endpoint to create, update and delete objects of several types in one transaction.
+    """
+
+    def on_post(self, req: falcon.Request, resp: falcon.Response):
+        """
+        Handle POST requests for the bulk operations of several object types.
+
+        Args:
+            req: Falcon request object
+            resp: Falcon response object
+        """
+        try:
+            # Parse request body
+            data = loads(req.bounded_stream.read())
+            model_names = [name for name, model in MODELS.items() if isinstance(model, BaseModel)]
+            if not isinstance(data, dict) or not data or set(data) - set(model_names):
+                resp.status = falcon.HTTP_400
+                resp.media = {'error': f"Expected an object with bulk operations of {', '.join(model_names)}"}
+                return
+            write_bulk(data, resp)
+
+        except json.JSONDecodeError:
+            resp.status = falcon.HTTP_400
+            resp.media = {'error': 'Invalid JSON in request body'}
+        except Exception as e:
+            logger.error(f"Error in POST object bulk: {e}")
+            resp.status = falcon.HTTP_500
+            resp.media = {'error': 'Internal server error'}
+
 class HealthResource:
     """
     Health check resource for API monitoring.
@@ -223,12 +871,9 @@ class HealthResource:
             resp: Falcon response object
         """
         try:
-            import mysql.connector
-            from config import DATABASE_CONFIG
-
             # Check database connectivity
             try:
-                connection = mysql.connector.connect(**DATABASE_CONFIG)
+                connection = get_connection()
                 db_status = "connected"
                 connection.close()
             except:
@@ -266,15 +911,12 @@ class StatsResource:
             resp: Falcon response object
         """
         try:
-            import mysql.connector
-            from config import DATABASE_CONFIG
-
             stats = {}
             connection = None
             cursor = None
 
             try:
-                connection = mysql.connector.connect(**DATABASE_CONFIG)
+                connection = get_connection()
                 cursor = connection.cursor(dictionary=True)
 
                 # Get count for each object type
@@ -293,6 +935,8 @@ class StatsResource:
 
             resp.media = {
                 'object_counts': stats,
+                'connection_pool': pool.metrics(),
+                'read_cache': read_cache.metrics(),
                 'timestamp': datetime.utcnow().isoformat()
             }
             resp.status = falcon.HTTP_200
@@ -332,6 +976,9 @@ class UserResource:
                 else:
                     resp.status = falcon.HTTP_404
                     resp.media = {'error': f'User with ID {user_id} not found'}
+            elif req.get_param('after') is not None or req.get_param('limit') is not None:
+                # Get a page of users after a cursor
+                get_page_after(self.model, req, resp)
             else:
                 # Get paginated list of users
                 page = int(req.get_param('page', default=1))
@@ -362,7 +1009,7 @@ class UserResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Create new user
             user_id = self.model.create(data)
@@ -391,7 +1038,7 @@ class UserResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Update user
             success = self.model.update(user_id, data)
@@ -458,7 +1105,7 @@ class LoginResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Validate login data
             validated_data = self.model.validate_login_data(data)
@@ -509,7 +1156,7 @@ class LogoutResource:
         """
         try:
             # Parse request body
-            data = json.loads(req.bounded_stream.read().decode('utf-8'))
+            data = loads(req.bounded_stream.read())
 
             # Validate logout data
             validated_data = self.model.validate_logout_data(data)
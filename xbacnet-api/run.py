@@ -103,6 +103,8 @@ def main():
     # Add application module
     cmd.append('app:app')
     
+    # The live stream server is started and supervised by the on_starting hook of gunicorn.conf.py
+
     logger.info(f"Starting XBACnet API server on {args.host}:{args.port}")
     logger.info(f"Command: {' '.join(cmd)}")
     
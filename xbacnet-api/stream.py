@@ -0,0 +1,376 @@
+"""
+XBACnet API Live Stream
+
+This module serves GET /api/stream, a Server-Sent Events feed of the present
+value, status flag and event state changes of the objects. It runs as its own
+asyncio process next to the gunicorn workers, so a subscriber holds a socket
+instead of a sync worker.
+
+One poller reads the live state that xbacnet-server publishes to shared
+memory every STREAM_CONFIG['poll_interval'] seconds and fans the changes out
+to the subscribers. Query parameters type (model names such as analog_input,
+comma separated) and id (database ids, with a single type) filter the feed.
+Recent events are kept so that a client reconnecting with Last-Event-ID gets
+the events it missed; if they are gone, it gets a reset event and should
+reload the objects.
+
+The gunicorn master starts this process through StreamSupervisor and starts
+it again when it exits. A supervised process stops on its own when the
+master is gone, so a killed master does not leave it holding the port.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+from live import live_state, OBJECT_TYPE_NUMBERS
+from config import STREAM_CONFIG, CORS_CONFIG, LOGGING_CONFIG
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Object types of the feed by model name
+OBJECT_TYPES = [table_name[4:-8] for table_name in OBJECT_TYPE_NUMBERS]
+
+
+class Subscriber:
+    """
+    Client of the feed with its filter and queue of events.
+    """
+
+    def __init__(self, types: Set[str], ids: Optional[Set[int]]):
+        """
+        Initialize a subscriber.
+
+        Args:
+            types (set): Model names of the object types of the events
+            ids (set): Database ids of the objects of the events, None for all
+        """
+        self.types = types
+        self.ids = ids
+        self.queue: asyncio.Queue = asyncio.Queue(STREAM_CONFIG['queue_size'])
+
+    def matches(self, object_type: str, state: Dict) -> bool:
+        """
+        Check that an event passes the filter of the subscriber.
+
+        Args:
+            object_type (str): Model name of the object type
+            state (dict): State of the object
+
+        Returns:
+            bool: True if the subscriber receives the event
+        """
+        return object_type in self.types and (self.ids is None or state['id'] in self.ids)
+
+
+class LiveStream:
+    """
+    Server-Sent Events server of the live state changes.
+    """
+
+    def __init__(self):
+        """Initialize the stream with no subscribers and no events."""
+        self.epoch = time.time_ns()
+        self.next_id = 1
+        self.events: deque = deque(maxlen=STREAM_CONFIG['history_size'])
+        self.subscribers: Set[Subscriber] = set()
+        self.sequences = array('Q')
+
+    async def poll(self):
+        """Publish the changes of the live state to the subscribers."""
+        # The state at startup is not a change
+        live_state.poll(self.sequences)
+        while True:
+            await asyncio.sleep(STREAM_CONFIG['poll_interval'])
+            try:
+                for table_name, state in live_state.poll(self.sequences):
+                    self.publish(table_name[4:-8], state)
+            except Exception as e:
+                logger.error(f"Error polling the live state: {e}")
+
+    def publish(self, object_type: str, state: Dict):
+        """
+        Keep an event and queue it for the matching subscribers.
+
+        Args:
+            object_type (str): Model name of the object type
+            state (dict): State of the object
+        """
+        event = (self.next_id, object_type, self.format(self.next_id, object_type, state), state)
+        self.next_id += 1
+        self.events.append(event)
+        for subscriber in list(self.subscribers):
+            if subscriber.matches(object_type, state):
+                try:
+                    subscriber.queue.put_nowait(event[2])
+                except asyncio.QueueFull:
+                    # A subscriber that cannot keep up is dropped, it resumes with Last-Event-ID
+                    subscriber.queue = None
+                    self.subscribers.discard(subscriber)
+
+    def format(self, event_id: int, object_type: str, state: Dict) -> bytes:
+        """
+        Format a change as a Server-Sent Event.
+
+        Args:
+            event_id (int): Sequence number of the event
+            object_type (str): Model name of the object type
+            state (dict): State of the object
+
+        Returns:
+            bytes: Event in the text/event-stream format
+        """
+        data = json.dumps(dict(state, type=object_type), separators=(',', ':'))
+        return f"id: {self.epoch}-{event_id}\nevent: change\ndata: {data}\n\n".encode('utf-8')
+
+    def missed(self, last_event_id: str, subscriber: Subscriber) -> Optional[list]:
+        """
+        Get the events after the last event a client received.
+
+        Args:
+            last_event_id (str): Value of the Last-Event-ID header
+            subscriber (Subscriber): Subscriber of the client
+
+        Returns:
+            list or None: Formatted events, None if they are no longer kept
+        """
+        try:
+            epoch, event_id = (int(part) for part in last_event_id.split('-'))
+        except ValueError:
+            return None
+        if epoch != self.epoch or event_id >= self.next_id:
+            return None
+        if event_id + 1 < self.next_id and (not self.events or self.events[0][0] > event_id + 1):
+            return None
+        return [event[2] for event in self.events if event[0] > event_id and subscriber.matches(event[1], event[3])]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve an HTTP connection.
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection
+            writer (asyncio.StreamWriter): Writer of the connection
+        """
+        subscriber = None
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1')
+                if line in ('\r\n', '\n', ''):
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            if len(request_line) != 3 or request_line[0] != 'GET':
+                await self.respond(writer, '405 Method Not Allowed', {'error': 'Only GET is supported'})
+                return
+            url = urlsplit(request_line[1])
+            if url.path != '/api/stream':
+                await self.respond(writer, '404 Not Found', {'error': 'Not found'})
+                return
+
+            params = parse_qs(url.query)
+            types = set(','.join(params.get('type', [])).split(',')) - {''} or set(OBJECT_TYPES)
+            try:
+                ids = {int(value) for value in ','.join(params.get('id', [])).split(',') if value} or None
+            except ValueError:
+                ids = set()
+            if not types <= set(OBJECT_TYPES) or (ids is not None and len(types) != 1) or ids == set():
+                await self.respond(writer, '400 Bad Request',
+                                   {'error': 'Invalid type or id parameter, id requires a single type'})
+                return
+            if not live_state.available():
+                await self.respond(writer, '503 Service Unavailable', {'error': 'Live state is not available'})
+                return
+
+            subscriber = Subscriber(types, ids)
+            self.subscribers.add(subscriber)
+            origin = '*' if '*' in CORS_CONFIG['allow_origins'] else headers.get('origin')
+            writer.write(('HTTP/1.1 200 OK\r\n'
+                          'Content-Type: text/event-stream\r\n'
+                          'Cache-Control: no-cache\r\n'
+                          'Connection: keep-alive\r\n'
+                          'X-Accel-Buffering: no\r\n' +
+                          (f"Access-Control-Allow-Origin: {origin}\r\n"
+                           if origin in CORS_CONFIG['allow_origins'] or origin == '*' else '') +
+                          '\r\n').encode('latin-1'))
+            writer.write(f"retry: {STREAM_CONFIG['retry']}\n\n".encode('ascii'))
+
+            last_event_id = headers.get('last-event-id') or ','.join(params.get('last_event_id', []))
+            if last_event_id:
+                missed = self.missed(last_event_id, subscriber)
+                if missed is None:
+                    writer.write(b"event: reset\ndata: {}\n\n")
+                else:
+                    writer.writelines(missed)
+            await writer.drain()
+
+            while subscriber.queue is not None:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), STREAM_CONFIG['heartbeat_interval'])
+                except asyncio.TimeoutError:
+                    event = b": heartbeat\n\n"
+                writer.write(event)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Clients disconnecting and connections cancelled at shutdown
+            pass
+        except Exception as e:
+            logger.error(f"Error in stream connection: {e}")
+        finally:
+            if subscriber is not None:
+                self.subscribers.discard(subscriber)
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: str, body: Dict):
+        """
+        Send a JSON response and end the connection.
+
+        Args:
+            writer (asyncio.StreamWriter): Writer of the connection
+            status (str): HTTP status line text
+            body (dict): Response body
+        """
+        data = json.dumps(body).encode('utf-8')
+        writer.write((f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                      f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n").encode('latin-1') + data)
+        await writer.drain()
+
+
+async def watch_parent(parent_pid: int, stop: asyncio.Event):
+    """
+    Stop the server when its parent process is gone.
+
+    Args:
+        parent_pid (int): Process id of the gunicorn master
+        stop (asyncio.Event): Set to stop the server
+    """
+    while os.getppid() == parent_pid:
+        await asyncio.sleep(1.0)
+    logger.warning(f"XBACnet API stream parent {parent_pid} is gone, stopping")
+    stop.set()
+
+
+async def serve(parent_pid: Optional[int] = None):
+    """
+    Run the stream server until it is stopped.
+
+    Args:
+        parent_pid (int): Process id of the supervising gunicorn master, None if the server is not supervised
+    """
+    stream = LiveStream()
+    server = await asyncio.start_server(stream.handle, STREAM_CONFIG['host'], STREAM_CONFIG['port'],
+                                        backlog=2048)
+    poller = asyncio.create_task(stream.poll())
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop.set)
+    watcher = asyncio.create_task(watch_parent(parent_pid, stop)) if parent_pid is not None else None
+
+    logger.info(f"XBACnet API stream listening on {STREAM_CONFIG['host']}:{STREAM_CONFIG['port']}")
+    async with server:
+        await stop.wait()
+    poller.cancel()
+    if watcher is not None:
+        watcher.cancel()
+
+
+class StreamSupervisor:
+    """
+    Child process of the gunicorn master running the stream server, started again when it exits.
+    """
+
+    def __init__(self, command: Optional[list] = None, restart_delay: float = STREAM_CONFIG['restart_delay']):
+        """
+        Initialize the supervisor.
+
+        Args:
+            command (list): Command of the child process, by default this module supervised by the current process
+            restart_delay (float): Seconds to wait before starting the child process again
+        """
+        self.command = command or [sys.executable, os.path.abspath(__file__), '--parent-pid', str(os.getpid())]
+        self.restart_delay = restart_delay
+        self.process: Optional[subprocess.Popen] = None
+        self.starts = 0
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the child process and the thread watching it."""
+        self.thread = threading.Thread(target=self.run, name='stream-supervisor', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Run the child process until the supervisor is stopped, starting it again after each exit."""
+        while True:
+            with self.lock:
+                if self.stopping.is_set():
+                    return
+                try:
+                    self.process = subprocess.Popen(self.command)
+                    self.starts += 1
+                except OSError as e:
+                    logger.error(f"Failed to start XBACnet API stream: {e}")
+                    self.process = None
+            if self.process is not None:
+                logger.info(f"Started XBACnet API stream (pid: {self.process.pid})")
+                # The gunicorn master may reap the child first, the exit code is then 0
+                returncode = self.process.wait()
+                if self.stopping.is_set():
+                    return
+                logger.error(f"XBACnet API stream exited with {returncode}, "
+                             f"restarting in {self.restart_delay} seconds")
+            self.stopping.wait(self.restart_delay)
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the child process, killing it if it does not exit in time.
+
+        Args:
+            timeout (float): Seconds to wait for the child process to exit
+        """
+        with self.lock:
+            self.stopping.set()
+            process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+
+def main():
+    """Start the stream server."""
+    parser = argparse.ArgumentParser(description='Serve the live stream of XBACnet API.')
+    parser.add_argument('--parent-pid', type=int, help='stop when the process with this id is gone')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, LOGGING_CONFIG['level']), format=LOGGING_CONFIG['format'])
+    asyncio.run(serve(args.parent_pid))
+
+
+if __name__ == '__main__':
+    main()
@@ -239,3 +239,665 @@ class TestXBACnetAPI:
 
         result = client.simulate_delete('/api/analog-inputs/99999')
         assert result.status_code == 404
+
+    def test_unpack_priority_array(self):
+        """Test unpacking of the priority array saved by xbacnet-server."""
+        from models import unpack_priority_array
+        import struct
+
+        assert unpack_priority_array('tbl_analog_output_objects', None) == [None] * 16
+
+        data = struct.pack('<Hdd', (1 << 7) | (1 << 15), 21.5, 18.0)
+        priority_array = unpack_priority_array('tbl_analog_output_objects', data)
+        assert priority_array[7] == 21.5
+        assert priority_array[15] == 18.0
+        assert priority_array.count(None) == 14
+
+        data = struct.pack('<HB', 1 << 2, 1)
+        assert unpack_priority_array('tbl_binary_output_objects', data)[2] == 'active'
+
+    def test_notify_server(self, monkeypatch):
+        """Test the change notification sent to xbacnet-server."""
+        import socket
+        import notifications
+
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(1.0)
+        monkeypatch.setitem(notifications.NOTIFICATION_CONFIG, 'port', receiver.getsockname()[1])
+        try:
+            notifications.notify_server('tbl_analog_value_objects', 7, 'update')
+            data = json.loads(receiver.recv(4096))
+        finally:
+            receiver.close()
+
+        assert data == {'table': 'tbl_analog_value_objects', 'id': 7, 'operation': 'update'}
+
+    @staticmethod
+    def write_segment(path, layout, buffers):
+        """
+        Write a trend log segment file of xbacnet-server.
+
+        Args:
+            path: Path of the segment file
+            layout (list): Capacity, record size and bucket size of each ring buffer of an object
+            buffers (dict): Header fields and packed records of the ring buffers by object and bucket size
+        """
+        import struct
+
+        data = struct.pack('<4sHHI4x', b'XBTS', 1, len(layout), 256)
+        for descriptor in layout:
+            data += struct.pack('<IIQ', *descriptor)
+        for instance in range(256):
+            for capacity, record_size, bucket_size in layout:
+                total, cleared, records = buffers.get((instance, bucket_size), (0, 0, b''))
+                buffer = struct.pack('<4sHHIQQ4x', b'XBTL', 1, record_size, capacity, total, cleared) + records
+                data += buffer.ljust(32 + capacity * record_size, b'\0')
+        path.write_bytes(data)
+
+    def test_history_downsample(self, tmp_path):
+        """Test the history read from a wrapped trend log ring buffer of xbacnet-server."""
+        from history import read_samples, downsample
+        import struct
+
+        # Capacity 4, 6 records written: slots hold the records 5, 6, 3, 4
+        path = tmp_path / 'analogInput-segment-0.dat'
+        records = b''.join(struct.pack('<dd', timestamp, value)
+                           for timestamp, value in ((40.0, 5.0), (50.0, 6.0), (20.0, 3.0), (30.0, 4.0)))
+        self.write_segment(path, [(4, 16, 0)], {(1, 0): (6, 0, records)})
+
+        timestamps, values = read_samples(str(path), 1, 25.0, 60.0)
+        assert list(timestamps) == [30.0, 40.0, 50.0]
+        assert list(values) == [4.0, 5.0, 6.0]
+        # The ring buffers of the other objects of the segment are empty
+        assert list(read_samples(str(path), 2, 25.0, 60.0)[0]) == []
+
+        buckets = downsample(timestamps, values, 20)
+        assert buckets == [
+            {'time': 20.0, 'min': 4.0, 'max': 4.0, 'avg': 4.0, 'last': 4.0, 'count': 1},
+            {'time': 40.0, 'min': 5.0, 'max': 6.0, 'avg': 5.5, 'last': 6.0, 'count': 2},
+        ]
+
+    def test_history_rollups(self, tmp_path, monkeypatch):
+        """Test the history combined from a rollup tier and the samples after it."""
+        import history
+        import struct
+
+        monkeypatch.setitem(history.HISTORY_CONFIG, 'directory', str(tmp_path))
+        monkeypatch.setitem(history.HISTORY_CONFIG, 'rollup_tiers', [60, 900])
+
+        # Two closed 60 second buckets, then the samples of the open bucket
+        rollups = struct.pack('<dddddd', 0.0, 1.0, 3.0, 4.0, 2, 3.0)
+        rollups += struct.pack('<dddddd', 60.0, 5.0, 5.0, 5.0, 1, 5.0)
+        samples = struct.pack('<dddd', 70.0, 5.0, 125.0, 7.0) + struct.pack('<dd', 130.0, 9.0)
+        self.write_segment(tmp_path / 'analogValue-segment-0.dat', [(10, 16, 0), (10, 48, 60), (10, 48, 900)],
+                           {(3, 0): (3, 0, samples), (3, 60): (2, 0, rollups)})
+
+        buckets = history.get_history('tbl_analog_value_objects', 3, 0.0, 200.0, 120)
+        assert buckets == [
+            {'time': 0.0, 'min': 1.0, 'max': 5.0, 'avg': 3.0, 'last': 5.0, 'count': 3},
+            {'time': 120.0, 'min': 7.0, 'max': 9.0, 'avg': 8.0, 'last': 9.0, 'count': 2},
+        ]
+
+    def test_live_state(self, client, tmp_path, monkeypatch):
+        """Test the live state read from the shared memory of xbacnet-server."""
+        import live
+        import struct
+
+        path = tmp_path / 'live-state'
+        monkeypatch.setattr('resources.live_state', live.LiveState(str(path)))
+
+        result = client.simulate_get('/api/analog-inputs/7', params={'source': 'live'})
+        assert result.status_code == 503
+
+        data = struct.pack('<4sHHIQ4x', b'XBLS', 1, 40, 2, 0)
+        data += struct.pack('<QddIIHBB4x', 2, 21.5, 60.0, 7, 1001, 0, 0b1001, 3)
+        data += struct.pack('<QddIIHBB4x', 4, 1.0, 0.0, 2, 3001, 5, 0, 0)
+        path.write_bytes(data)
+
+        result = client.simulate_get('/api/analog-inputs/7', params={'source': 'live'})
+        assert result.status_code == 200
+        assert json.loads(result.content) == {
+            'id': 7, 'object_identifier': 1001, 'present_value': 21.5, 'status_flags': '1001',
+            'event_state': 'highLimit', 'changed_at': '1970-01-01T00:01:00+00:00'}
+
+        result = client.simulate_get('/api/binary-values', params={'source': 'live'})
+        assert result.status_code == 200
+        data = json.loads(result.content)
+        assert [item['present_value'] for item in data['data']] == ['active']
+        assert data['pagination']['total'] == 1
+
+        result = client.simulate_get('/api/analog-inputs/2', params={'source': 'live'})
+        assert result.status_code == 404
+        result = client.simulate_get('/api/analog-inputs/7', params={'source': 'cache'})
+        assert result.status_code == 400
+
+    def test_connection_pool(self, monkeypatch):
+        """Test that connections are reused, validated and recycled by the pool."""
+        import db
+
+        class FakeConnection:
+            def __init__(self):
+                self.connected = True
+                self.in_transaction = False
+
+            def is_connected(self):
+                return self.connected
+
+            def close(self):
+                self.connected = False
+
+        monkeypatch.setattr(db.mysql.connector, 'connect', lambda **kwargs: FakeConnection())
+        connection_pool = db.ConnectionPool({}, 1, 60)
+
+        first = connection_pool.get_connection()
+        raw = first._connection
+        first.close()
+        second = connection_pool.get_connection()
+        assert second._connection is raw
+        third = connection_pool.get_connection()
+        assert third._connection is not raw
+        assert connection_pool.metrics()['checked_out'] == 2
+
+        # Only one idle connection is kept, a broken one is replaced on checkout
+        second.close()
+        third.close()
+        assert not third.is_connected()
+        raw.connected = False
+        connection_pool.get_connection().close()
+        metrics = connection_pool.metrics()
+        assert (metrics['created'], metrics['reused'], metrics['invalidated'], metrics['discarded']) == (3, 1, 1, 1)
+        assert (metrics['idle'], metrics['checked_out']) == (1, 0)
+
+        # Old connections are recycled
+        connection_pool.idle[0] = (connection_pool.idle[0][0], 0.0)
+        connection_pool.get_connection().close()
+        assert connection_pool.metrics()['recycled'] == 1
+
+    def test_cursor_pagination(self, client, monkeypatch):
+        """Test keyset pagination with opaque cursors."""
+        from models import MODELS
+        from resources import encode_cursor, decode_cursor
+
+        assert decode_cursor(encode_cursor(100)) == 100
+        with pytest.raises(ValueError):
+            decode_cursor('bm90LWEtY3Vyc29y')
+
+        calls = []
+
+        def get_after(after, limit, include_total=False, version=None):
+            calls.append((after, limit, include_total))
+            result = {'data': [{'id': after + 1}], 'next': after + 1 if after < 5 else None}
+            if include_total:
+                result['total'] = 6
+            return result
+
+        monkeypatch.setattr(MODELS['analog_input'], 'get_after', get_after)
+
+        result = client.simulate_get('/api/analog-inputs', params={'limit': 1})
+        assert result.status_code == 200
+        data = json.loads(result.content)
+        assert data['pagination'] == {'limit': 1, 'next_cursor': encode_cursor(1)}
+
+        result = client.simulate_get('/api/analog-inputs',
+                                     params={'after': encode_cursor(5), 'limit': 1000, 'total': 'true'})
+        data = json.loads(result.content)
+        assert data['pagination'] == {'limit': 100, 'next_cursor': None, 'total': 6}
+        assert calls == [(0, 1, False), (5, 100, True)]
+
+        result = client.simulate_get('/api/analog-inputs', params={'after': 'bm90LWEtY3Vyc29y'})
+        assert result.status_code == 400
+
+    def test_read_cache(self, monkeypatch):
+        """Test that cached results are bounded and invalidated by writes in other workers."""
+        import os
+        import cache
+
+        read_cache = cache.ReadCache(2, 60)
+        loads = []
+
+        def load(value):
+            loads.append(value)
+            return value
+
+        assert read_cache.get(('a',), 'tbl_users', lambda: load(1)) == 1
+        assert read_cache.get(('a',), 'tbl_users', lambda: load(2)) == 1
+        assert loads == [1]
+
+        # A write in a forked worker invalidates the results of its table
+        pid = os.fork()
+        if pid == 0:
+            read_cache.invalidate('tbl_users')
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert read_cache.get(('a',), 'tbl_users', lambda: load(3)) == 3
+
+        # The least recently used result is evicted
+        read_cache.get(('b',), 'tbl_analog_input_objects', lambda: load(4))
+        read_cache.get(('c',), 'tbl_analog_input_objects', lambda: load(5))
+        assert read_cache.get(('a',), 'tbl_users', lambda: load(6)) == 6
+
+        # Expired results are loaded again
+        monkeypatch.setattr(cache.time, 'monotonic', lambda: 1e12)
+        assert read_cache.get(('c',), 'tbl_analog_input_objects', lambda: load(7)) == 7
+        assert loads == [1, 3, 4, 5, 6, 7]
+
+    def test_conditional_get(self, client, monkeypatch):
+        """Test that conditional GET requests are answered from the table version alone."""
+        from models import MODELS
+
+        model = MODELS['analog_input']
+        queries = []
+        monkeypatch.setattr(model, 'get_version', lambda: 7)
+        monkeypatch.setattr(model, 'get_all', lambda page, page_size, version=None: queries.append(version) or
+                            {'data': [], 'pagination': {'page': page, 'page_size': page_size, 'total': 0, 'pages': 0}})
+
+        result = client.simulate_get('/api/analog-inputs')
+        assert result.status_code == 200
+        assert result.headers['etag'] == '"v7"'
+        assert queries == [7]
+
+        result = client.simulate_get('/api/analog-inputs', headers={'If-None-Match': '"v7"'})
+        assert result.status_code == 304
+        assert result.headers['etag'] == '"v7"'
+        assert queries == [7]
+
+        monkeypatch.setattr(model, 'get_version', lambda: 8)
+        result = client.simulate_get('/api/analog-inputs', headers={'If-None-Match': '"v7"'})
+        assert result.status_code == 200
+        assert queries == [7, 8]
+
+    def test_object_changes(self, client, monkeypatch):
+        """Test delta sync of the objects changed since a version token."""
+        import resources
+        from models import MODELS
+        from resources import decode_version_token, encode_version_token
+
+        monkeypatch.setattr(resources, 'prune_deletions', lambda retention_days: None)
+        calls = []
+
+        def fake_changes(model_name, version):
+            def get_changes(since, limit):
+                calls.append((model_name, since, limit))
+                if since > version:
+                    return None
+                changed = since < version
+                return {'created': [], 'updated': [{'id': 1}] if changed else [],
+                        'deleted': [{'id': 2, 'object_identifier': 3}] if changed else [],
+                        'version': version, 'more': False}
+            return get_changes
+
+        for model_name, model in MODELS.items():
+            if model_name != 'user':
+                monkeypatch.setattr(model, 'get_changes', fake_changes(model_name, 5))
+
+        since = encode_version_token({name: 5 for name in MODELS if name != 'user'} | {'analog_input': 4})
+        result = client.simulate_get('/api/objects/changes', params={'since': since})
+        assert result.status_code == 200
+        data = json.loads(result.content)
+        assert list(data['changes']) == ['analog_input']
+        assert data['changes']['analog_input']['deleted'] == [{'id': 2, 'object_identifier': 3}]
+        assert decode_version_token(data['version'])['analog_input'] == 5
+        assert data['more'] is False
+        assert calls[0] == ('analog_input', 4, 1000)
+
+        result = client.simulate_get('/api/analog-inputs/changes')
+        data = json.loads(result.content)
+        assert calls[-1] == ('analog_input', -1, 1000)
+        assert decode_version_token(data['version']) == {'analog_input': 5}
+
+        result = client.simulate_get('/api/analog-inputs/changes',
+                                     params={'since': encode_version_token({'analog_input': 6})})
+        assert result.status_code == 410
+        result = client.simulate_get('/api/analog-inputs/changes', params={'since': 'not-a-token'})
+        assert result.status_code == 400
+
+    def test_live_stream(self, tmp_path, monkeypatch):
+        """Test the live stream events, filters and resumption with Last-Event-ID."""
+        import live
+        import stream
+        import struct
+
+        path = tmp_path / 'live-state'
+        monkeypatch.setattr('stream.live_state', live.LiveState(str(path)))
+        header = struct.pack('<4sHHIQ4x', b'XBLS', 1, 40, 2, 0)
+        path.write_bytes(header + struct.pack('<QddIIHBB4x', 2, 21.5, 60.0, 7, 1001, 0, 0, 0) +
+                         struct.pack('<QddIIHBB4x', 2, 1.0, 0.0, 2, 3001, 5, 0, 0))
+
+        live_stream = stream.LiveStream()
+        assert len(stream.live_state.poll(live_stream.sequences)) == 2
+        assert stream.live_state.poll(live_stream.sequences) == []
+
+        with open(path, 'r+b') as file:
+            file.seek(len(header))
+            file.write(struct.pack('<QddIIHBB4x', 4, 22.5, 61.0, 7, 1001, 0, 0, 0))
+        changes = stream.live_state.poll(live_stream.sequences)
+        assert [(table_name, state['present_value']) for table_name, state in changes] == [
+            ('tbl_analog_input_objects', 22.5)]
+
+        subscriber = stream.Subscriber({'analog_input'}, {7})
+        other = stream.Subscriber({'binary_value'}, None)
+        live_stream.subscribers.update({subscriber, other})
+        live_stream.publish('analog_input', changes[0][1])
+        event = subscriber.queue.get_nowait().decode('utf-8')
+        assert event.startswith(f"id: {live_stream.epoch}-1\nevent: change\n")
+        assert json.loads(event.split('data: ')[1])['type'] == 'analog_input'
+        assert other.queue.empty()
+
+        live_stream.publish('analog_input', dict(changes[0][1], present_value=23.5))
+        assert len(live_stream.missed(f"{live_stream.epoch}-1", subscriber)) == 1
+        assert live_stream.missed(f"{live_stream.epoch}-2", subscriber) == []
+        assert live_stream.missed(f"{live_stream.epoch}-1", other) == []
+        assert live_stream.missed('1-1', subscriber) is None
+
+    def test_stream_supervisor(self):
+        """Test that the supervised stream process is started again when it exits and stopped with the master."""
+        import asyncio
+        import os
+        import sys
+        import time
+        import stream
+
+        supervisor = stream.StreamSupervisor([sys.executable, '-c', 'pass'], restart_delay=0.01)
+        supervisor.start()
+        deadline = time.monotonic() + 10.0
+        while supervisor.starts < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        supervisor.stop()
+        assert supervisor.starts >= 3
+        assert not supervisor.thread.is_alive()
+
+        supervisor = stream.StreamSupervisor([sys.executable, '-c', 'import time; time.sleep(60)'])
+        supervisor.start()
+        while supervisor.process is None:
+            time.sleep(0.01)
+        supervisor.stop()
+        assert supervisor.process.returncode is not None
+        assert supervisor.starts == 1
+
+        # A supervised stream server stops when the master is gone
+        stop = asyncio.Event()
+        asyncio.run(asyncio.wait_for(stream.watch_parent(os.getppid() + 1, stop), 5.0))
+        assert stop.is_set()
+
+    def test_bulk_operations(self, client, monkeypatch):
+        """Test the validation of bulk operations and their multi-row statements."""
+        import models
+
+        item = {"object_identifier": 5001, "object_name": "AI-5001", "present_value": 20.0,
+                "status_flags": "0000", "event_state": "normal", "out_of_service": False, "units": "percent"}
+        body = {"create": [item, dict(item, object_name="AI-5001-copy"), {"object_identifier": 5002}],
+                "update": [dict(item, id=0)], "delete": [3, 3]}
+        result = client.simulate_post('/api/analog-inputs/bulk', body=json.dumps(body),
+                                      headers={'Content-Type': 'application/json'})
+        assert result.status_code == 400
+        errors = [(error['operation'], error['index']) for error in json.loads(result.content)['errors']]
+        assert errors == [('create', 1), ('create', 2), ('update', 0), ('delete', 1)]
+
+        result = client.simulate_post('/api/objects/bulk', body=json.dumps({'user': {'create': []}}),
+                                      headers={'Content-Type': 'application/json'})
+        assert result.status_code == 400
+
+        monkeypatch.setitem(models.BULK_CONFIG, 'max_items', 2)
+        result = client.simulate_post('/api/analog-inputs/bulk', body=json.dumps(body),
+                                      headers={'Content-Type': 'application/json'})
+        assert result.status_code == 413
+
+        class FakeCursor:
+            def __init__(self):
+                self.statements = []
+                self.rows = []
+
+            def execute(self, query, values):
+                self.statements.append(query.split()[0])
+                self.rows = [(7,)] if query.startswith('SELECT id ') else [(5001, 11), (5002, 12)]
+
+            def fetchall(self):
+                return self.rows
+
+        monkeypatch.setitem(models.BULK_CONFIG, 'batch_size', 1)
+        cursor = FakeCursor()
+        operations = {"create": [item, dict(item, object_identifier=5002)],
+                      "update": [dict(item, id=7, object_identifier=5003), dict(item, id=8, object_identifier=5004)],
+                      "delete": [9]}
+        result = models.AnalogInputModel.write_bulk(cursor, operations)
+        assert cursor.statements == ['SELECT', 'SELECT', 'SELECT', 'UPDATE', 'INSERT', 'INSERT', 'SELECT', 'SELECT']
+        assert result == {'created': [{'index': 0, 'id': 11}, {'index': 1, 'id': 12}],
+                          'updated': [{'id': 7, 'status': 'updated'}, {'id': 8, 'status': 'not_found'}],
+                          'deleted': [{'id': 9, 'status': 'not_found'}]}
+
+    def test_export(self, client, monkeypatch):
+        """Test the NDJSON and CSV exports and the connection of an unfinished export."""
+        import models
+
+        batches = [('analog_input', [{'id': 1, 'object_name': 'AI-1', 'present_value': 20.5}]),
+                   ('analog_output', [{'id': 2, 'object_name': 'AO-2', 'priority_array': [None, 5.0]}])]
+        monkeypatch.setattr('resources.export_objects', lambda model_names: (batch for batch in batches))
+        monkeypatch.setattr('resources.get_columns',
+                            lambda model_names: ['id', 'object_name', 'present_value', 'priority_array'])
+
+        result = client.simulate_get('/api/objects/export')
+        assert result.status_code == 200
+        assert result.headers['content-type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in result.text.splitlines()]
+        assert [(line['type'], line['id']) for line in lines] == [('analog_input', 1), ('analog_output', 2)]
+
+        result = client.simulate_get('/api/objects/export', params={'format': 'csv'})
+        assert result.status_code == 200
+        assert result.text.splitlines() == ['type,id,object_name,present_value,priority_array',
+                                            'analog_input,1,AI-1,20.5,', 'analog_output,2,AO-2,,"[null, 5.0]"']
+
+        result = client.simulate_get('/api/analog-inputs/export', params={'format': 'xml'})
+        assert result.status_code == 400
+        result = client.simulate_get('/api/objects/export', params={'type': 'user'})
+        assert result.status_code == 400
+
+        class FakeCursor:
+            def __init__(self):
+                self.rows = [[{'id': 1}], [{'id': 2}], []]
+
+            def execute(self, query):
+                pass
+
+            def fetchmany(self, size):
+                return self.rows.pop(0)
+
+            def close(self):
+                pass
+
+        class FakeConnection:
+            def __init__(self):
+                self.closed = self.discarded = False
+
+            def cursor(self, **kwargs):
+                return FakeCursor()
+
+            def commit(self):
+                pass
+
+            def close(self):
+                self.closed = True
+
+            def discard(self):
+                self.discarded = True
+
+        connection = FakeConnection()
+        assert [rows for _, rows in models._read_batches(connection, ['analog_input'])] == [[{'id': 1}], [{'id': 2}]]
+        assert connection.closed and not connection.discarded
+
+        connection = FakeConnection()
+        batches = models._read_batches(connection, ['analog_input'])
+        next(batches)
+        batches.close()
+        assert connection.discarded and not connection.closed
+
+    def test_export_stream(self, monkeypatch):
+        """Test that an export beats the worker heartbeat per batch and releases its connection when closed early."""
+        import models
+        import resources
+
+        class FakeCursor:
+            def __init__(self):
+                self.rows = [[{'id': 1}], [{'id': 2}], [{'id': 3}], []]
+
+            def execute(self, query):
+                pass
+
+            def fetchmany(self, size):
+                return self.rows.pop(0)
+
+            def close(self):
+                pass
+
+        class FakeConnection:
+            def __init__(self):
+                self.closed = self.discarded = False
+
+            def start_transaction(self, **kwargs):
+                pass
+
+            def cursor(self, **kwargs):
+                return FakeCursor()
+
+            def commit(self):
+                pass
+
+            def close(self):
+                self.closed = True
+
+            def discard(self):
+                self.discarded = True
+
+        connections = []
+        monkeypatch.setattr('models.get_connection', lambda: connections.append(FakeConnection()) or connections[-1])
+        monkeypatch.setattr(models.AnalogInputModel, '_serialize_row', lambda row: row)
+        monkeypatch.setattr('resources.get_columns', lambda model_names: ['id'])
+        heartbeats = []
+        monkeypatch.setattr(resources, 'worker_heartbeat', lambda: heartbeats.append(len(heartbeats)))
+
+        for query_string in ('', 'format=csv'):
+            # The body is read through the WSGI interface, as gunicorn does
+            environ = testing.create_environ(path='/api/analog-inputs/export', query_string=query_string)
+            body = app(environ, lambda status, headers: None)
+            chunks = [next(body), next(body)]
+            if query_string:
+                assert chunks[0].decode('utf-8').splitlines() == ['id', '1']
+            else:
+                assert json.loads(chunks[0]) == {'id': 1}
+            assert not connections[-1].closed and not connections[-1].discarded
+            body.close()
+            assert connections[-1].discarded and not connections[-1].closed
+
+        # A finished export returns its connection to the pool and beats once per batch
+        heartbeats.clear()
+        environ = testing.create_environ(path='/api/analog-inputs/export')
+        body = app(environ, lambda status, headers: None)
+        assert [json.loads(line)['id'] for line in b''.join(body).splitlines()] == [1, 2, 3]
+        assert connections[-1].closed and not connections[-1].discarded
+        assert len(heartbeats) == 3
+
+    def test_import(self, client, monkeypatch):
+        """Test the validation of imported rows and the batches they are upserted in."""
+        import importer
+
+        batches = []
+        monkeypatch.setattr('importer.write_batch', lambda batch, summary: batches.append(
+            {name: [line for line, _ in rows] for name, rows in batch.items()}))
+        monkeypatch.setitem(importer.IMPORT_CONFIG, 'batch_size', 2)
+
+        rows = ['type,id,object_identifier,object_name,present_value,status_flags,event_state,out_of_service,units',
+                'analog_input,1,1001,AI-1,20.5,0000,normal,false,percent',
+                'analog_value,2,2001,AV-1,1,0000,normal,0,percent',
+                'analog_input,3,x,AI-3,20.5,0000,normal,false,percent',
+                'user,4,1,U,1,0000,normal,false,percent',
+                'analog_input,5,1005,AI-5,21,0000,normal,true,percent']
+        summary = importer.import_objects(rows, 'csv')
+        assert batches == [{'analog_input': [2], 'analog_value': [3]}, {'analog_input': [6]}]
+        assert summary['rows'] == 5 and summary['failed'] == 2
+        assert [error['line'] for error in summary['errors']] == [4, 5]
+
+        batches.clear()
+        body = '\n'.join([json.dumps({"object_identifier": 1001, "object_name": "AI-1", "present_value": 20.5,
+                                      "status_flags": "0000", "event_state": "normal", "out_of_service": False,
+                                      "units": "percent", "id": 9}), 'not json', ''])
+        result = client.simulate_post('/api/analog-inputs/import', body=body,
+                                      headers={'Content-Type': 'application/x-ndjson'})
+        assert result.status_code == 200
+        assert json.loads(result.content)['errors'] == [{'line': 2, 'error': 'Invalid JSON object'}]
+        assert batches == [{'analog_input': [1]}]
+
+        result = client.simulate_post('/api/analog-inputs/import', body='{}',
+                                      headers={'Content-Type': 'application/json'})
+        assert result.status_code == 415
+
+    def test_import_database_error(self, client, monkeypatch):
+        """Test that the rows of a batch that could not be written are failed rows and the import goes on."""
+        import importer
+        from mysql.connector import Error
+
+        class FakeConnection:
+            def __init__(self):
+                self.rolled_back = False
+
+            def cursor(self):
+                return self
+
+            def start_transaction(self):
+                pass
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                self.rolled_back = True
+
+            def is_connected(self):
+                return True
+
+            def close(self):
+                pass
+
+        connections = []
+        monkeypatch.setattr('importer.get_connection', lambda: connections.append(FakeConnection()) or connections[-1])
+        monkeypatch.setattr('importer.notify_server_many', lambda table_name, object_ids, operation: None)
+        monkeypatch.setitem(importer.IMPORT_CONFIG, 'batch_size', 2)
+
+        def upsert_bulk(cursor, items):
+            if len(connections) == 1:
+                raise Error(msg='Lock wait timeout exceeded')
+            return {item['object_identifier']: ('created', item['object_identifier']) for item in items}
+
+        monkeypatch.setattr(importer.MODELS['analog_input'], 'upsert_bulk', upsert_bulk)
+        item = {"object_name": "AI", "present_value": 20.5, "status_flags": "0000", "event_state": "normal",
+                "out_of_service": False, "units": "percent"}
+        body = '\n'.join(json.dumps(dict(item, object_identifier=identifier)) for identifier in range(1, 5))
+        result = client.simulate_post('/api/analog-inputs/import', body=body,
+                                      headers={'Content-Type': 'application/x-ndjson'})
+        assert result.status_code == 200
+        summary = json.loads(result.content)
+        assert (summary['rows'], summary['created'], summary['failed']) == (4, 2, 2)
+        assert [error['line'] for error in summary['errors']] == [1, 2]
+        assert 'Lock wait' not in summary['errors'][0]['error']
+        assert connections[0].rolled_back and not connections[1].rolled_back
+
+    def test_compiled_validators_and_codecs(self):
+        """Test that the compiled validators and the JSON codecs behave like jsonschema and json."""
+        import jsonschema
+        from codec import get_codec
+        from models import AnalogInputModel, UserModel
+
+        invalid = {"object_identifier": "invalid", "object_name": "", "present_value": 25.5}
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(invalid, AnalogInputModel.schema)
+        with pytest.raises(jsonschema.ValidationError) as compiled:
+            AnalogInputModel.validate_data(invalid)
+        assert compiled.value.message == expected.value.message
+        assert UserModel.validate_login_data({'name': 'admin', 'password': 'secret'})
+
+        value = {'name': 'Température', 'values': [1, 2.5, None, True], 'nested': {'id': 7}}
+        for name in ('json', 'orjson'):
+            _, dumps, loads = get_codec(name)
+            assert loads(dumps(value)) == value
+            assert loads(dumps({1: 'a'})) == {'1': 'a'}
+            with pytest.raises(json.JSONDecodeError):
+                loads(b'invalid json')
@@ -23,30 +23,282 @@ Date: 2024
 from bacpypes.debugging import bacpypes_debugging, ModuleLogger
 from bacpypes.consolelogging import ConfigArgumentParser
 from bacpypes.core import run
-from bacpypes.task import RecurringTask
+from bacpypes.task import RecurringTask, OneShotTask
 from bacpypes.object import AnalogInputObject
-from bacpypes.object import AnalogOutputObject
 from bacpypes.object import AnalogValueObject
 from bacpypes.object import BinaryInputObject
-from bacpypes.object import BinaryOutputObject
 from bacpypes.object import BinaryValueObject
 from bacpypes.object import MultiStateInputObject
-from bacpypes.object import MultiStateOutputObject
 from bacpypes.object import MultiStateValueObject
+from bacpypes.object import TrendLogObject, Property, register_object_type
 from bacpypes.local.device import LocalDeviceObject
+from bacpypes.local.object import AnalogOutputCmdObject
+from bacpypes.local.object import BinaryOutputCmdObject
+from bacpypes.local.object import MultiStateOutputCmdObject
 from bacpypes.app import BIPSimpleApplication
 from bacpypes.service.cov import ChangeOfValueServices
 from bacpypes.service.object import ReadWritePropertyMultipleServices
-from bacpypes.basetypes import PriorityArray, PriorityValue
-from bacpypes.primitivedata import Integer
+from bacpypes.basetypes import PriorityArray, PriorityValue, OptionalUnsigned, ErrorType, ObjectPropertyReference
+from bacpypes.basetypes import DateTime, DeviceObjectPropertyReference, LogRecord, LogRecordLogDatum, ResultFlags
+from bacpypes.basetypes import ObjectType, TimeStamp, NotificationParameters, NotificationParametersOutOfRange
+from bacpypes.basetypes import NotificationParametersChangeOfState, PropertyStates, EventState
+from bacpypes.primitivedata import Null, Unsigned, Date, Time
+from bacpypes.constructeddata import Array, ListOf, SequenceOfAny
+from bacpypes.apdu import SimpleAckPDU, WritePropertyMultipleError, ReadRangeACK, UnconfirmedEventNotificationRequest
+from bacpypes.pdu import Address
+from bacpypes.object import PropertyError
+from bacpypes.errors import ExecutionError, InvalidTag, InvalidParameterDatatype
 import mysql.connector
+import asyncore
+import ast
+import json
+import math
+import mmap
+from array import array
+import numpy
+import os
+import socket
+import struct
+import time
 import settings
 
 # Global variables for debugging and application state
 _debug = 0  # Debug level (0 = off, higher values = more verbose)
 _log = ModuleLogger(globals())  # Logger for debugging and error messages
 pro_application = None  # Main BACnet application instance
+persistence = None  # Persistence task instance
 object_list = list()  # List of all BACnet objects managed by this server
+persistence_object_dict = dict()  # Objects with written properties waiting for the persistence task
+coalesced_write_dict = dict()  # Open write coalescing windows keyed by object identifier
+trend_log_list = list()  # Trend log objects recording the present values of the objects
+trend_log_segment_dict = dict()  # Open trend log segment files keyed by object type and segment number
+alarm_object_dict = dict()  # Objects with event state transitions waiting for the persistence task
+
+# Database tables of the object types whose writable properties are saved by the persistence task
+PERSISTENCE_TABLE_DICT = {
+    'analogOutput': 'tbl_analog_output_objects',
+    'binaryOutput': 'tbl_binary_output_objects',
+    'multiStateOutput': 'tbl_multi_state_output_objects',
+}
+
+# Database tables of the object types whose present values are written by the ingest listener
+INGEST_TABLE_DICT = {
+    'analogInput': 'tbl_analog_input_objects',
+    'analogValue': 'tbl_analog_value_objects',
+    'binaryInput': 'tbl_binary_input_objects',
+    'binaryValue': 'tbl_binary_value_objects',
+    'multiStateInput': 'tbl_multi_state_input_objects',
+    'multiStateValue': 'tbl_multi_state_value_objects',
+}
+
+# Database tables of all object types
+OBJECT_TABLE_DICT = dict(PERSISTENCE_TABLE_DICT, **INGEST_TABLE_DICT)
+
+# Object types of the ingest listener by their BACnet object type number
+INGEST_OBJECT_TYPE_DICT = {
+    0: 'analogInput',
+    2: 'analogValue',
+    3: 'binaryInput',
+    5: 'binaryValue',
+    13: 'multiStateInput',
+    19: 'multiStateValue',
+}
+
+# Priority value choice and struct format of a commanded priority in the priority_array column
+PRIORITY_ARRAY_SLOT_DICT = {
+    'analogOutput': ('real', 'd'),
+    'binaryOutput': ('enumerated', 'B'),
+    'multiStateOutput': ('unsigned', 'I'),
+}
+
+# Log datum choice of the trend log records of each object type
+TREND_LOG_DATUM_DICT = {
+    'analogInput': 'realValue',
+    'analogOutput': 'realValue',
+    'analogValue': 'realValue',
+    'binaryInput': 'enumValue',
+    'binaryOutput': 'enumValue',
+    'binaryValue': 'enumValue',
+    'multiStateInput': 'unsignedValue',
+    'multiStateOutput': 'unsignedValue',
+    'multiStateValue': 'unsignedValue',
+}
+
+# The trend log of an object has the instance number: object type number * TREND_LOG_INSTANCE_FACTOR + instance number.
+# Objects with an instance number from TREND_LOG_INSTANCE_FACTOR are not recorded.
+TREND_LOG_INSTANCE_FACTOR = 100000
+
+# Number of objects of one type whose trend log ring buffers share a segment file, xbacnet-api reads the same layout
+TREND_LOG_SEGMENT_SIZE = 256
+
+# Properties of the commandable objects whose writes go through the write coalescing windows
+COMMAND_PROPERTIES = ('presentValue', 'priorityArray')
+
+# Columns read by the refreshing task, which are also the columns of the change probe fingerprints of the tables.
+# The present values of output objects are saved by this server and are not refreshed, so they are left out.
+REFRESHING_COLUMN_DICT = {
+    'tbl_analog_input_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                 'status_flags', 'event_state', 'out_of_service', 'units', 'cov_increment'),
+    'tbl_analog_output_objects': ('id', 'object_identifier', 'object_name', 'description', 'status_flags',
+                                  'event_state', 'out_of_service', 'units', 'relinquish_default', 'cov_increment'),
+    'tbl_analog_value_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                 'status_flags', 'event_state', 'out_of_service', 'units', 'cov_increment'),
+    'tbl_binary_input_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                 'status_flags', 'event_state', 'out_of_service', 'polarity'),
+    'tbl_binary_output_objects': ('id', 'object_identifier', 'object_name', 'description', 'status_flags',
+                                  'event_state', 'out_of_service', 'polarity', 'relinquish_default'),
+    'tbl_binary_value_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                 'status_flags', 'event_state', 'out_of_service'),
+    'tbl_multi_state_input_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                      'status_flags', 'event_state', 'out_of_service', 'number_of_states',
+                                      'state_text'),
+    'tbl_multi_state_output_objects': ('id', 'object_identifier', 'object_name', 'description', 'status_flags',
+                                       'event_state', 'out_of_service', 'number_of_states', 'state_text',
+                                       'relinquish_default'),
+    'tbl_multi_state_value_objects': ('id', 'object_identifier', 'object_name', 'present_value', 'description',
+                                      'status_flags', 'event_state', 'out_of_service', 'number_of_states',
+                                      'state_text'),
+}
+
+
+def pack_priority_array(object_type, priority_array):
+    """
+    Pack a priority array into the format of the priority_array column.
+
+    The column holds a little-endian 16 bit mask in which bit n - 1 is set when priority n is
+    commanded, followed by the values of the commanded priorities in priority order. An object
+    commanded at one priority takes a few bytes instead of sixteen slots.
+
+    Args:
+        object_type (str): BACnet object type of the commandable object
+        priority_array (PriorityArray): Priority array of the object
+
+    Returns:
+        bytes: Packed priority array, or None if no priority is commanded
+    """
+    choice, slot_format = PRIORITY_ARRAY_SLOT_DICT[object_type]
+    mask = 0
+    values = list()
+    for i in range(1, 17):
+        priority_value = priority_array[i]
+        if priority_value.null is None:
+            mask |= 1 << (i - 1)
+            values.append(getattr(priority_value, choice))
+    if mask == 0:
+        return None
+    return struct.pack('<H' + slot_format * len(values), mask, *values)
+
+
+def unpack_priority_array(object_type, data):
+    """
+    Unpack the priority_array column into a priority array.
+
+    Args:
+        object_type (str): BACnet object type of the commandable object
+        data (bytes): Packed priority array, or None if no priority is commanded
+
+    Returns:
+        PriorityArray: Priority array with the commanded priorities set
+    """
+    priority_array = PriorityArray()
+    if not data:
+        return priority_array
+    choice, slot_format = PRIORITY_ARRAY_SLOT_DICT[object_type]
+    mask = struct.unpack_from('<H', data)[0]
+    values = iter(struct.unpack_from('<' + slot_format * bin(mask).count('1'), data, 2))
+    for i in range(1, 17):
+        if mask & (1 << (i - 1)):
+            priority_array[i] = PriorityValue(**{choice: next(values)})
+    return priority_array
+
+
+@bacpypes_debugging
+class CommandPriorityMixIn(object):
+    """
+    Commandable output object support for the server.
+
+    Keeps Current_Command_Priority in step with the priority array after every write, and
+    remembers the packed priority array last saved to the database so that the persistence
+    task only rewrites the priority_array column of objects whose commands changed.
+    """
+
+    # Packed priority array last saved to or loaded from the database
+    _persisted_priority_array = None
+
+    def WriteProperty(self, property, value, arrayIndex=None, priority=None, direct=False):
+        if _debug:
+            CommandPriorityMixIn._debug("WriteProperty %r %r arrayIndex=%r priority=%r direct=%r",
+                                        property, value, arrayIndex, priority, direct)
+        super(CommandPriorityMixIn, self).WriteProperty(property, value, arrayIndex=arrayIndex,
+                                                        priority=priority, direct=direct)
+        if property in COMMAND_PROPERTIES:
+            self.update_current_command_priority()
+
+    def command_priority(self):
+        """
+        Get the priority the present value is taken from.
+
+        Returns:
+            int: Highest commanded priority, or None if no priority is commanded
+        """
+        for i in range(1, 17):
+            if self.priorityArray[i].null is None:
+                return i
+        return None
+
+    def update_current_command_priority(self):
+        """
+        Set Current_Command_Priority from the priority array.
+
+        Returns:
+            int: Highest commanded priority, or None if no priority is commanded
+        """
+        command_priority = self.command_priority()
+        if command_priority is None:
+            self.currentCommandPriority = OptionalUnsigned(null=())
+        else:
+            self.currentCommandPriority = OptionalUnsigned(unsigned=command_priority)
+        return command_priority
+
+    def restore_priority_array(self, data):
+        """
+        Restore the commands of the object from the priority_array column.
+
+        The present value is taken from the highest commanded priority. When no priority is
+        commanded, the present value loaded from the database is kept, so that rows saved before
+        the priority array was persisted keep their values.
+
+        Args:
+            data (bytes): Packed priority array, or None if no priority is commanded
+        """
+        self.priorityArray = unpack_priority_array(self.objectType, data)
+        self._persisted_priority_array = data
+        if self.update_current_command_priority() is not None:
+            self.presentValue = self._highest_priority_value()[0]
+
+    def apply_relinquish_default(self):
+        """
+        Take the present value from Relinquish_Default when no priority is commanded.
+
+        Returns:
+            bool: True if the present value changed
+        """
+        if self.command_priority() is not None or self.presentValue == self.relinquishDefault:
+            return False
+        self.presentValue = self.relinquishDefault
+        return True
+
+
+class ProAnalogOutputObject(CommandPriorityMixIn, AnalogOutputCmdObject):
+    """Commandable analog output object."""
+
+
+class ProBinaryOutputObject(CommandPriorityMixIn, BinaryOutputCmdObject):
+    """Commandable binary output object."""
+
+
+class ProMultiStateOutputObject(CommandPriorityMixIn, MultiStateOutputCmdObject):
+    """Commandable multi-state output object."""
 
 
 @bacpypes_debugging
@@ -61,23 +313,327 @@ class ProApplication(BIPSimpleApplication, ReadWritePropertyMultipleServices, Ch
 
     The application handles BACnet communication, property access, and value change notifications.
     """
-    pass
+
+    def do_WritePropertyRequest(self, apdu):
+        """
+        Handle a WriteProperty request, coalescing bursts of commands.
+
+        Writes to the present value or priority array of output objects are applied immediately, but the
+        property monitors (COV detection) and the persistence of the object are deferred
+        to the end of the write coalescing window of the object.
+
+        Args:
+            apdu: WriteProperty request APDU
+        """
+        if _debug:
+            ProApplication._debug("do_WritePropertyRequest %r", apdu)
+
+        obj = self.get_object_id(apdu.objectIdentifier)
+        if (obj is None or apdu.propertyIdentifier not in COMMAND_PROPERTIES or
+                obj.objectType not in PERSISTENCE_TABLE_DICT):
+            super(ProApplication, self).do_WritePropertyRequest(apdu)
+            return
+
+        coalesced_write = CoalescedWrite.open(obj)
+        coalesced_write.hold_monitors()
+        try:
+            super(ProApplication, self).do_WritePropertyRequest(apdu)
+        finally:
+            coalesced_write.release_monitors()
+
+    def do_WritePropertyMultipleRequest(self, apdu):
+        """
+        Handle a WritePropertyMultiple request as one change set.
+
+        The writes are applied in order and stop at the first failed write. Present value and
+        priority array writes to output objects go through the write coalescing windows like WriteProperty
+        requests. When settings.WRITE_PROPERTY_MULTIPLE_ACK is 'persisted', the written output
+        objects are saved in one database transaction before the request is acknowledged,
+        otherwise the request is acknowledged at once and the objects are saved by the next
+        run of the persistence task. The transaction runs on the core loop and blocks it until
+        the database answers, or until settings.PERSISTENCE_LOCK_WAIT_TIMEOUT on locked rows.
+
+        Args:
+            apdu: WritePropertyMultiple request APDU
+        """
+        if _debug:
+            ProApplication._debug("do_WritePropertyMultipleRequest %r", apdu)
+
+        change_set = dict()  # Written output objects keyed by object identifier
+        resp = None
+
+        for write_access_spec in apdu.listOfWriteAccessSpecs:
+            obj = self.get_object_id(write_access_spec.objectIdentifier)
+
+            for property_value in write_access_spec.listOfProperties:
+                coalesced_write = None
+                try:
+                    if not obj:
+                        raise ExecutionError(errorClass='object', errorCode='unknownObject')
+
+                    if (property_value.propertyIdentifier in COMMAND_PROPERTIES and
+                            obj.objectType in PERSISTENCE_TABLE_DICT):
+                        coalesced_write = CoalescedWrite.open(obj)
+                        coalesced_write.hold_monitors()
+                        change_set[obj.objectIdentifier] = coalesced_write
+
+                    self.write_property(obj, property_value.propertyIdentifier,
+                                        property_value.propertyArrayIndex,
+                                        property_value.value,
+                                        property_value.priority)
+                except (ExecutionError, PropertyError, InvalidTag, InvalidParameterDatatype) as err:
+                    if isinstance(err, PropertyError):
+                        err = ExecutionError(errorClass='property', errorCode='unknownProperty')
+                    elif not isinstance(err, ExecutionError):
+                        err = ExecutionError(errorClass='property', errorCode='invalidDataType')
+                    if _debug:
+                        ProApplication._debug("    - failed write: %r", err)
+
+                    # Report the first failed write, the preceding writes stay applied
+                    resp = WritePropertyMultipleError(
+                        errorType=ErrorType(errorClass=err.errorClass, errorCode=err.errorCode),
+                        firstFailedWriteAttempt=ObjectPropertyReference(
+                            objectIdentifier=write_access_spec.objectIdentifier,
+                            propertyIdentifier=property_value.propertyIdentifier,
+                            propertyArrayIndex=property_value.propertyArrayIndex),
+                        context=apdu)
+                    break
+                finally:
+                    if coalesced_write is not None:
+                        coalesced_write.release_monitors()
+
+            if resp is not None:
+                break
+
+        # Save the change set before acknowledging the request
+        if settings.WRITE_PROPERTY_MULTIPLE_ACK == 'persisted' and len(change_set) > 0:
+            change_object_dict = dict((object_id, coalesced_write.obj)
+                                      for object_id, coalesced_write in change_set.items())
+            if persistence is not None and persistence.persist(change_object_dict):
+                for coalesced_write in change_set.values():
+                    coalesced_write.pending_persistence = False
+
+        if resp is None:
+            resp = SimpleAckPDU(context=apdu)
+        self.response(resp)
+
+    def do_ReadRangeRequest(self, apdu):
+        """
+        Handle a ReadRange request of the log buffer of a trend log object.
+
+        The records are selected by position, sequence number or time as in the request, or all
+        records when no range is given, up to TREND_LOG_READ_RANGE_COUNT records per response.
+
+        Args:
+            apdu: ReadRange request APDU
+        """
+        if _debug:
+            ProApplication._debug("do_ReadRangeRequest %r", apdu)
+
+        obj = self.get_object_id(apdu.objectIdentifier)
+        if obj is None:
+            raise ExecutionError(errorClass='object', errorCode='unknownObject')
+        if not isinstance(obj, ProTrendLogObject) or apdu.propertyIdentifier != 'logBuffer':
+            raise ExecutionError(errorClass='property', errorCode='propertyIsNotAList')
+        if apdu.propertyArrayIndex is not None:
+            raise ExecutionError(errorClass='property', errorCode='propertyIsNotAnArray')
+
+        trend_log_buffer = obj._trend_log_buffer
+        first = trend_log_buffer.first_sequence_number()
+        last = trend_log_buffer.total
+
+        # Find the reference sequence number and the signed number of records
+        if apdu.range is None:
+            reference, count = first, last - first + 1
+        elif apdu.range.byPosition is not None:
+            reference = first + apdu.range.byPosition.referenceIndex - 1
+            count = apdu.range.byPosition.count
+        elif apdu.range.bySequenceNumber is not None:
+            reference = apdu.range.bySequenceNumber.referenceSequenceNumber
+            count = apdu.range.bySequenceNumber.count
+        else:
+            count = apdu.range.byTime.count
+            timestamp = trend_log_timestamp(apdu.range.byTime.referenceTime)
+            if count > 0:
+                # The first record after the reference time
+                reference = trend_log_buffer.bisect(timestamp, True)
+            else:
+                # The last record before the reference time
+                reference = trend_log_buffer.bisect(timestamp, False) - 1
+        if apdu.range is not None and count == 0:
+            raise ExecutionError(errorClass='services', errorCode='parameterOutOfRange')
+        if apdu.range is not None and apdu.range.byTime is None and (reference < first or reference > last):
+            # A reference index or sequence number that is not in the buffer selects no records
+            count = 0
+
+        # Select the records, the ones next to the reference when there are too many for one response
+        if count >= 0:
+            start, stop = max(reference, first), min(reference + count - 1, last)
+            more_items = stop - start + 1 > settings.TREND_LOG_READ_RANGE_COUNT
+            stop = min(stop, start + settings.TREND_LOG_READ_RANGE_COUNT - 1)
+        else:
+            start, stop = max(reference + count + 1, first), min(reference, last)
+            more_items = stop - start + 1 > settings.TREND_LOG_READ_RANGE_COUNT
+            start = max(start, stop - settings.TREND_LOG_READ_RANGE_COUNT + 1)
+
+        log_records = list()
+        for timestamp, value in trend_log_buffer.read(start, stop):
+            log_records.append(LogRecord(
+                timestamp=trend_log_date_time(timestamp),
+                logDatum=LogRecordLogDatum(**{obj._log_datum_choice: obj.log_datum(value)}),
+            ))
+
+        item_data = SequenceOfAny()
+        item_data.cast_in(ListOf(LogRecord)(log_records))
+        resp = ReadRangeACK(
+            context=apdu,
+            objectIdentifier=apdu.objectIdentifier,
+            propertyIdentifier=apdu.propertyIdentifier,
+            resultFlags=ResultFlags([int(len(log_records) > 0 and start == first),
+                                     int(len(log_records) > 0 and stop == last),
+                                     int(more_items)]),
+            itemCount=len(log_records),
+            itemData=item_data,
+        )
+        if apdu.range is not None and apdu.range.byPosition is None and len(log_records) > 0:
+            resp.firstSequenceNumber = start
+        if _debug:
+            ProApplication._debug("    - resp: %r", resp)
+        self.response(resp)
+
+    def write_property(self, obj, property_identifier, property_array_index, property_value, priority):
+        """
+        Cast the value of a write request to the datatype of the property and write it to the object.
+
+        Args:
+            obj: BACnet object to write
+            property_identifier: Identifier of the property
+            property_array_index: Optional array index
+            property_value (Any): Encoded value from the request
+            priority: Optional write priority
+        """
+        # Check if the property exists
+        if obj.ReadProperty(property_identifier, property_array_index) is None:
+            raise PropertyError(property_identifier)
+
+        # Get the datatype, special case for null
+        if property_value.is_application_class_null():
+            datatype = Null
+        else:
+            datatype = obj.get_datatype(property_identifier)
+
+        # Special case for array parts, others are managed by cast_out
+        if issubclass(datatype, Array) and (property_array_index is not None):
+            if property_array_index == 0:
+                value = property_value.cast_out(Unsigned)
+            else:
+                value = property_value.cast_out(datatype.subtype)
+        else:
+            value = property_value.cast_out(datatype)
+
+        obj.WriteProperty(property_identifier, value, property_array_index, priority)
+
+
+########################################################################################################################
+# Write Coalescing - Collapses Bursts of WriteProperty on the Same Point
+#
+# Supervisory controllers may write the same output present value many times a second. The first write to an object
+# opens a window of WRITE_COALESCING_WINDOW seconds. Every write within the window is applied to the object at once,
+# so that ReadProperty always returns the latest command, but the property monitors of the present value are held
+# back while the write is applied. When the window closes, the monitors are called once with the value from before
+# the burst and the final value, which gives a single COV notification, and the object is queued once for the
+# persistence task, unless the final value was already saved with a WritePropertyMultiple change set.
+#
+########################################################################################################################
+@bacpypes_debugging
+class CoalescedWrite(OneShotTask):
+
+    def __init__(self, obj):
+        """
+        Initialize the coalescing window of an object.
+
+        Args:
+            obj: BACnet object being written
+        """
+        if _debug:
+            CoalescedWrite._debug("__init__ %r", obj)
+        OneShotTask.__init__(self)
+
+        self.obj = obj
+        # Present value before the first write of the burst
+        self.old_value = obj.presentValue
+        # Property monitors detached while a write is applied
+        self.held_monitors = None
+        # Cleared when the written value was already saved with a WritePropertyMultiple change set
+        self.pending_persistence = True
+
+    @staticmethod
+    def open(obj):
+        """
+        Get the open coalescing window of an object, opening a new one if there is none.
+
+        Args:
+            obj: BACnet object being written
+
+        Returns:
+            CoalescedWrite: Coalescing window of the object
+        """
+        coalesced_write = coalesced_write_dict.get(obj.objectIdentifier, None)
+        if coalesced_write is None:
+            coalesced_write = CoalescedWrite(obj)
+            coalesced_write.install_task(delta=settings.WRITE_COALESCING_WINDOW)
+            coalesced_write_dict[obj.objectIdentifier] = coalesced_write
+        coalesced_write.pending_persistence = True
+        return coalesced_write
+
+    def hold_monitors(self):
+        """Detach the present value monitors of the object while a write is applied."""
+        self.held_monitors = self.obj._property_monitors.pop('presentValue', None)
+
+    def release_monitors(self):
+        """Reattach the present value monitors of the object."""
+        if self.held_monitors is not None:
+            self.obj._property_monitors['presentValue'] = self.held_monitors
+            self.held_monitors = None
+
+    def process_task(self):
+        """Close the window: notify the monitors of the final value and queue the object for persistence."""
+        if _debug:
+            CoalescedWrite._debug("process_task %r", self.obj.objectIdentifier)
+
+        del coalesced_write_dict[self.obj.objectIdentifier]
+
+        new_value = self.obj.presentValue
+        if new_value != self.old_value and 'presentValue' in self.obj._property_monitors:
+            for fn in list(self.obj._property_monitors['presentValue']):
+                fn(self.old_value, new_value)
+
+        if self.pending_persistence:
+            persistence_object_dict[self.obj.objectIdentifier] = self.obj
 
 
 ########################################################################################################################
 # Persistence Task - Saves Writable Properties to Database
 #
-# This task periodically saves all writable properties from BACnet objects to the database.
+# This task periodically saves the writable properties of BACnet objects to the database.
 # According to BACnet standards, writable properties (marked as 'W') are required to be present
 # in all BACnet standard objects of that type and can be changed through WriteProperty services.
 #
 # The task specifically handles the following writable object properties:
-# - Analog Output Object: Present_Value
-# - Binary Output Object: Present_Value
-# - Multi-state Output Object: Present_Value
+# - Analog Output Object: Present_Value, Priority_Array, Current_Command_Priority
+# - Binary Output Object: Present_Value, Priority_Array, Current_Command_Priority
+# - Multi-state Output Object: Present_Value, Priority_Array, Current_Command_Priority
+#
+# It also saves the present values of the input and value objects written by the ingest listener, and the event states
+# and status flags of the objects whose event state was changed by the alarm engine.
 #
 # These properties are updated when BACnet clients use WriteProperty services to change values.
-# The persistence task ensures that these changes are saved to the database for reliability.
+# Written objects are queued in persistence_object_dict when their write coalescing window closes,
+# and the task saves the queued objects in one batched transaction. Objects that fail to save are
+# queued again for the next run.
+#
+# The priority array is saved packed in the priority_array column, and only for the objects whose packed priority
+# array differs from the one last saved, so relinquishing or commanding a priority rewrites one column of one row.
 #
 ########################################################################################################################
 @bacpypes_debugging
@@ -104,6 +660,11 @@ class Persistence(RecurringTask):
             # Connect to MySQL database using settings configuration
             self.cnx = mysql.connector.connect(**settings.xbacnet)
             self.cursor = self.cnx.cursor(dictionary=True)  # Use dictionary cursor for named columns
+            # Keep the changes saved by this server out of tbl_object_changes
+            self.cursor.execute(" SET @xbacnet_server = 1 ")
+            # Fail fast on locked rows, persisted WritePropertyMultiple requests block the core loop
+            self.cursor.execute(" SET SESSION innodb_lock_wait_timeout = %s ",
+                                (settings.PERSISTENCE_LOCK_WAIT_TIMEOUT,))
         except Exception as e:
             _log.error("Error in WriteablePropertiesPersistence init " + str(e))
             # Clean up database connections on error
@@ -114,132 +675,170 @@ class Persistence(RecurringTask):
 
     ####################################################################################################################
     # PROCEDURES:
-    # STEP 1: Check database connectivity
-    # STEP 2: Read writable properties of objects
-    # STEP 3: Update properties to database
+    # STEP 1: Take over the queued objects
+    # STEP 2: Update properties to database
     ####################################################################################################################
     def process_task(self):
         """
         Main task execution method that runs periodically.
 
         This method:
-        1. Checks database connectivity and reconnects if necessary
-        2. Reads current values of writable properties from BACnet objects
-        3. Updates the database with the current property values
+        1. Takes over the BACnet objects queued since the last run
+        2. Updates the database with the current property values in one transaction
         """
-        global object_list
+        global persistence_object_dict, alarm_object_dict
         if _debug:
             Persistence._debug("process_task")
 
+        # Nothing was written since the last run
+        if len(persistence_object_dict) == 0 and len(alarm_object_dict) == 0:
+            return
+
         ################################################################################################################
-        # STEP 1: Check database connectivity
+        # STEP 1: Take over the queued objects
         ################################################################################################################
-        # Verify database connection is still active, reconnect if needed
-        if not self.cursor or not self.cnx.is_connected():
-            try:
-                # Reconnect to database
-                self.cnx = mysql.connector.connect(**settings.xbacnet)
-                self.cursor = self.cnx.cursor(dictionary=True)
-            except Exception as e:
-                _log.error("Error in WriteablePropertiesPersistence process_task " + str(e))
-                # Clean up connections on error
-                if self.cursor:
-                    self.cursor.close()
-                if self.cnx:
-                    self.cnx.close()
+        # Objects written from now on are queued for the next run
+        pending_object_dict = persistence_object_dict
+        persistence_object_dict = dict()
+        pending_alarm_dict = alarm_object_dict
+        alarm_object_dict = dict()
 
         ################################################################################################################
-        # STEP 2: Read writable properties of objects
+        # STEP 2: Update properties to database
         ################################################################################################################
-        if _debug:
-            Persistence._debug("STEP 2: Read writable properties of objects: " + str(object_list))
+        if not self.persist(pending_object_dict, pending_alarm_dict):
+            # Queue the objects again for the next run, keeping objects queued in the meantime
+            for object_id, pro_object in pending_object_dict.items():
+                persistence_object_dict.setdefault(object_id, pro_object)
+            for object_id, pro_object in pending_alarm_dict.items():
+                alarm_object_dict.setdefault(object_id, pro_object)
+
+    def connect(self):
+        """
+        Check database connectivity and reconnect if necessary.
 
-        # Initialize dictionaries to store current values of writable properties
-        analog_output_object_dict = dict()      # Store analog output present values
-        binary_output_object_dict = dict()      # Store binary output present values
-        multi_state_output_object_dict = dict() # Store multi-state output present values
+        Returns:
+            bool: True if the database connection is available
+        """
+        if self.cursor and self.cnx.is_connected():
+            return True
+        try:
+            # Reconnect to database
+            self.cnx = mysql.connector.connect(**settings.xbacnet)
+            self.cursor = self.cnx.cursor(dictionary=True)
+            # Keep the changes saved by this server out of tbl_object_changes
+            self.cursor.execute(" SET @xbacnet_server = 1 ")
+            # Fail fast on locked rows, persisted WritePropertyMultiple requests block the core loop
+            self.cursor.execute(" SET SESSION innodb_lock_wait_timeout = %s ",
+                                (settings.PERSISTENCE_LOCK_WAIT_TIMEOUT,))
+            return True
+        except Exception as e:
+            _log.error("Error in WriteablePropertiesPersistence connect " + str(e))
+            self.cursor = None
+            self.cnx = None
+            return False
 
-        # Iterate through all BACnet objects and extract writable properties
-        for i in range(len(object_list)):
-            if object_list[i].objectType == 'analogOutput':
-                # Store analog output present value with object identifier as key
-                analog_output_object_dict[object_list[i].objectIdentifier[1]] = object_list[i].presentValue
-            elif object_list[i].objectType == 'binaryOutput':
-                # Store binary output present value with object identifier as key
-                binary_output_object_dict[object_list[i].objectIdentifier[1]] = object_list[i].presentValue
-            elif object_list[i].objectType == 'multiStateOutput':
-                # Store multi-state output present value with object identifier as key
-                multi_state_output_object_dict[object_list[i].objectIdentifier[1]] = object_list[i].presentValue
-            else:
-                # Skip non-writable object types
-                pass
+    def persist(self, change_set, alarm_set=None):
+        """
+        Save the writable properties of a change set of objects in one database transaction.
 
-        ################################################################################################################
-        # STEP 3: Update properties to database
-        ################################################################################################################
+        The present values and command priorities of each output object type are saved with one
+        UPDATE statement per PERSISTENCE_BATCH_SIZE objects, followed by the packed priority arrays
+        of the objects whose commands changed since they were last saved, the ingested present
+        values of the input and value objects, and the event states and status flags set by the
+        alarm engine. All statements are committed together.
 
+        Args:
+            change_set (dict): BACnet objects keyed by object identifier
+            alarm_set (dict): BACnet objects with event state transitions keyed by object identifier
+
+        Returns:
+            bool: True if the transaction was committed
+        """
         if _debug:
-            Persistence._debug("STEP 3: Update properties to database: " + str(object_list))
+            Persistence._debug("persist %r", change_set)
 
-        # Update analog output objects in database
-        if len(analog_output_object_dict) > 0:
-            for object_identifier in analog_output_object_dict:
-                try:
-                    # Update present_value for analog output object
-                    update = (" UPDATE tbl_analog_output_objects "
-                              " SET present_value = %s "
-                              " WHERE (object_identifier = %s ")
-                    self.cursor.execute(update, (analog_output_object_dict[object_identifier],
-                                                 object_identifier,))
-                    self.cnx.commit()  # Commit the transaction
-                except Exception as e:
-                    # Handle database errors and clean up connections
-                    if self.cursor:
-                        self.cursor.close()
-                    if self.cnx:
-                        self.cnx.close()
-
-        # Update binary output objects in database
-        if len(binary_output_object_dict) > 0:
-            for object_identifier in binary_output_object_dict:
-                try:
-                    # Update present_value for binary output object
-                    update = (" UPDATE tbl_binary_output_objects "
-                              " SET present_value = %s "
-                              " WHERE (object_identifier = %s ")
-                    self.cursor.execute(update, (binary_output_object_dict[object_identifier],
-                                                 object_identifier,))
-                    self.cnx.commit()  # Commit the transaction
-                except Exception as e:
-                    # Handle database errors and clean up connections
-                    if self.cursor:
-                        self.cursor.close()
-                    if self.cnx:
-                        self.cnx.close()
-
-        # Update multi-state output objects in database
-        if len(multi_state_output_object_dict) > 0:
-            for object_identifier in multi_state_output_object_dict:
-                try:
-                    # Update present_value for multi-state output object
-                    update = (" UPDATE tbl_multi_state_output_objects "
-                              " SET present_value = %s "
-                              " WHERE (object_identifier = %s ")
-                    self.cursor.execute(update, (multi_state_output_object_dict[object_identifier],
-                                                 object_identifier,))
-                    self.cnx.commit()  # Commit the transaction
-                except Exception as e:
-                    # Handle database errors and clean up connections
-                    if self.cursor:
-                        self.cursor.close()
-                    if self.cnx:
-                        self.cnx.close()
-
-        # Clean up database connections
-        if self.cursor:
-            self.cursor.close()
-        if self.cnx:
-            self.cnx.close()
+        if not self.connect():
+            return False
+
+        # Packed priority arrays to remember once the transaction is committed
+        packed_priority_arrays = list()
+        try:
+            for object_type, table_name in PERSISTENCE_TABLE_DICT.items():
+                pro_objects = [pro_object for pro_object in change_set.values()
+                               if pro_object.objectType == object_type]
+
+                # Read the writable properties of the objects of this type
+                values = [(pro_object.objectIdentifier[1], pro_object.presentValue, pro_object.command_priority())
+                          for pro_object in pro_objects]
+                self.update(table_name, ('present_value', 'current_command_priority'), values)
+
+                # Pack the priority arrays and keep the ones that changed
+                changed = list()
+                for pro_object in pro_objects:
+                    data = pack_priority_array(object_type, pro_object.priorityArray)
+                    if data != pro_object._persisted_priority_array:
+                        changed.append((pro_object.objectIdentifier[1], data))
+                        packed_priority_arrays.append((pro_object, data))
+                self.update(table_name, ('priority_array', ), changed)
+
+            for object_type, table_name in INGEST_TABLE_DICT.items():
+                # Read the ingested present values of the objects of this type
+                values = [(pro_object.objectIdentifier[1], pro_object.presentValue)
+                          for pro_object in change_set.values()
+                          if pro_object.objectType == object_type]
+                self.update(table_name, ('present_value', ), values)
+
+            for object_type, table_name in OBJECT_TABLE_DICT.items():
+                # Read the event states and status flags of the objects of this type
+                values = [(pro_object.objectIdentifier[1], pro_object.eventState,
+                           ''.join(str(int(flag)) for flag in AlarmEngine.status_flags(pro_object)))
+                          for pro_object in (alarm_set or {}).values()
+                          if pro_object.objectType == object_type]
+                self.update(table_name, ('event_state', 'status_flags'), values)
+
+            self.cnx.commit()  # Commit the transaction
+            for pro_object, data in packed_priority_arrays:
+                pro_object._persisted_priority_array = data
+            return True
+        except Exception as e:
+            _log.error("Error in WriteablePropertiesPersistence persist " + str(e))
+            # Handle database errors and clean up connections
+            try:
+                self.cnx.rollback()
+            except Exception:
+                pass
+            if self.cursor:
+                self.cursor.close()
+            if self.cnx:
+                self.cnx.close()
+            self.cursor = None
+            self.cnx = None
+            return False
+
+    def update(self, table_name, column_names, rows):
+        """
+        Update columns of objects with one UPDATE statement per PERSISTENCE_BATCH_SIZE objects.
+
+        Args:
+            table_name (str): Database table of the objects
+            column_names (tuple): Columns to update
+            rows (list): Tuples of the object identifier followed by the values of the columns
+        """
+        for i in range(0, len(rows), settings.PERSISTENCE_BATCH_SIZE):
+            batch = rows[i:i + settings.PERSISTENCE_BATCH_SIZE]
+            update = (" UPDATE " + table_name +
+                      " SET " + ", ".join(column_name + " = CASE object_identifier " +
+                                          " WHEN %s THEN %s " * len(batch) +
+                                          " END "
+                                          for column_name in column_names) +
+                      " WHERE object_identifier IN (" + ", ".join(["%s"] * len(batch)) + ") ")
+            params = list()
+            for j in range(len(column_names)):
+                for row in batch:
+                    params.extend((row[0], row[j + 1]))
+            params.extend(row[0] for row in batch)
+            self.cursor.execute(update, params)
 
 ########################################################################################################################
 # Refreshing Task - Updates Readable Properties from Database
@@ -247,6 +846,12 @@ class Persistence(RecurringTask):
 # This task periodically refreshes all readable properties of BACnet objects from the database.
 # It ensures that the BACnet objects reflect the current state stored in the database.
 #
+# Each run first finds the changed objects, and only reads those from the database. With REFRESHING_FEED 'changes'
+# the task consumes tbl_object_changes, which the triggers of the object tables append to, from the last consumed
+# sequence number and prunes the consumed entries, so the cost of a run follows the number of changes. With 'probe',
+# or when the change log cannot be read, it probes all tables with one aggregate query returning the row count and a
+# checksum of the refreshed columns per table, and reads the tables whose fingerprint moved since the last refresh.
+#
 # IMPORTANT: This task does NOT refresh the following writable properties:
 # - Analog Output Object: Present_Value
 # - Binary Output Object: Present_Value
@@ -277,12 +882,36 @@ class Refreshing(RecurringTask):
         # Save the interval for reference
         self.interval = interval
 
+        # Fingerprints (row count, checksum) of the tables as of the last refresh, keyed by table name
+        self.fingerprint_dict = dict()
+
+        # Column expressions of the fingerprints keyed by table name. The present values saved by this server for the
+        # ingest listener and the virtual points are left out, so that saving them does not move the fingerprints
+        self.probe_column_dict = dict()
+        for table_name, column_names in REFRESHING_COLUMN_DICT.items():
+            instances = sorted(instance for object_type, instance in settings.VIRTUAL_POINT_DICT
+                               if OBJECT_TABLE_DICT.get(object_type, None) == table_name)
+            if settings.INGEST_ADDRESS is not None and table_name in INGEST_TABLE_DICT.values():
+                column_names = tuple(column_name for column_name in column_names if column_name != 'present_value')
+            elif instances:
+                column_names = tuple(
+                    "IF(object_identifier IN (" + ", ".join(str(instance) for instance in instances) + "), "
+                    "NULL, present_value)" if column_name == 'present_value' else column_name
+                    for column_name in column_names)
+            self.probe_column_dict[table_name] = column_names
+
+        # Sequence number of the last consumed change log entry, None until the first run
+        self.last_change_id = None
+        # Sequence number of the last change log entry read by the current run
+        self.next_change_id = None
+
         # Initialize database connection variables
         self.cursor = None
         self.cnx = None
         try:
             # Connect to MySQL database using settings configuration
-            self.cnx = mysql.connector.connect(**settings.xbacnet)
+            # Autocommit, so that every query reads the latest committed rows over the kept connection
+            self.cnx = mysql.connector.connect(autocommit=True, **settings.xbacnet)
             self.cursor = self.cnx.cursor(dictionary=True)  # Use dictionary cursor for named columns
         except Exception as e:
             _log.error("Error in  ReadablePropertiesRefreshing init " + str(e))
@@ -295,8 +924,8 @@ class Refreshing(RecurringTask):
     ####################################################################################################################
     # PROCEDURES:
     # STEP 1: Check database connectivity
-    # STEP 2: Read objects from database
-    # STEP 3: Update properties of objects
+    # STEP 2: Find the changed objects
+    # STEP 3: Refresh the changed objects
     ####################################################################################################################
     def process_task(self):
         """
@@ -304,451 +933,2196 @@ class Refreshing(RecurringTask):
 
         This method:
         1. Checks database connectivity and reconnects if necessary
-        2. Reads all object properties from the database
-        3. Updates the corresponding BACnet object properties
+        2. Finds the changed objects from the change log, or probes all tables for changes
+        3. Reads the properties of the changed objects from the database and updates the
+           corresponding BACnet object properties
         """
-        global object_list
         if _debug:
             Refreshing._debug("process_task")
 
+        ################################################################################################################
+        # STEP 1: Check database connectivity
+        ################################################################################################################
+        # Verify database connection is still active, reconnect if needed
+        if not self.connect():
+            return
+
+        ################################################################################################################
+        # STEP 2: Find the changed objects
+        ################################################################################################################
+        # Ids of the changed objects keyed by table name, a table maps to None when all of its objects are read
+        changed_table_dict = None
+        fingerprint_dict = None
+        if settings.REFRESHING_FEED == 'changes':
+            changed_table_dict = self.read_changes()
+        if changed_table_dict is None:
+            fingerprint_dict = self.probe()
+            if fingerprint_dict is not None:
+                changed_table_dict = dict.fromkeys(fingerprint_dict)
+        if changed_table_dict is None or len(changed_table_dict) == 0:
+            if _debug:
+                Refreshing._debug("no object changed")
+            return
+
+        ################################################################################################################
+        # STEP 3: Refresh the changed objects
+        ################################################################################################################
+        self.refresh(changed_table_dict)
+
+        # Remember what was refreshed, the connection is kept for the next run
+        if fingerprint_dict is not None:
+            self.fingerprint_dict.update(fingerprint_dict)
+        elif self.next_change_id != self.last_change_id:
+            self.consume_changes()
+
+    ####################################################################################################################
+    # PROCEDURES:
+    # STEP 1: Read the changed objects from database
+    # STEP 2: Update properties of objects
+    ####################################################################################################################
+    def refresh(self, changed_table_dict):
+        """
+        Refresh the properties of changed objects from the database.
+
+        Args:
+            changed_table_dict (dict): Ids of the changed objects keyed by table name, a table maps to
+                None when all of its objects are read
+        """
+        global object_list
+        if _debug:
+            Refreshing._debug("refresh %r", changed_table_dict)
+
+        if _debug:
+            Refreshing._debug("before refresh object list: " + str(object_list))
+
+        ################################################################################################################
+        # STEP 1: Read the changed objects from database
+        ################################################################################################################
+        # Initialize dictionaries to store object properties from database
+        analog_input_object_dict = dict()      # Analog input objects
+        analog_output_object_dict = dict()     # Analog output objects
+        analog_value_object_dict = dict()      # Analog value objects
+        binary_input_object_dict = dict()      # Binary input objects
+        binary_output_object_dict = dict()     # Binary output objects
+        binary_value_object_dict = dict()      # Binary value objects
+        multi_state_input_object_dict = dict() # Multi-state input objects
+        multi_state_output_object_dict = dict() # Multi-state output objects
+        multi_state_value_object_dict = dict() # Multi-state value objects
+
+        # Step 1.1: Read analog input objects from database
+        if 'tbl_analog_input_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_analog_input_objects',
+                                             changed_table_dict['tbl_analog_input_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = float(row['present_value'])
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['units'] = row['units']
+                    result['cov_increment'] = float(row['cov_increment'])
+                    analog_input_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(analog_input_object_dict))
+
+        # step 1.2
+        if 'tbl_analog_output_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_analog_output_objects',
+                                             changed_table_dict['tbl_analog_output_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['units'] = row['units']
+                    result['relinquish_default'] = float(row['relinquish_default'])
+                    result['cov_increment'] = float(row['cov_increment'])
+                    analog_output_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(analog_output_object_dict))
+
+        # step 1.3
+        if 'tbl_analog_value_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_analog_value_objects',
+                                             changed_table_dict['tbl_analog_value_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = float(row['present_value'])
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['units'] = row['units']
+                    result['cov_increment'] = float(row['cov_increment'])
+                    analog_value_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(analog_value_object_dict))
+
+        # step 1.4
+        if 'tbl_binary_input_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_binary_input_objects',
+                                             changed_table_dict['tbl_binary_input_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = row['present_value']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['polarity'] = row['polarity']
+                    binary_input_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(binary_input_object_dict))
+
+        # step 1.5
+        if 'tbl_binary_output_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_binary_output_objects',
+                                             changed_table_dict['tbl_binary_output_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['polarity'] = row['polarity']
+                    result['relinquish_default'] = row['relinquish_default']
+                    binary_output_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(binary_output_object_dict))
+
+        # step 1.6
+        if 'tbl_binary_value_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_binary_value_objects',
+                                             changed_table_dict['tbl_binary_value_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = row['present_value']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    binary_value_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(binary_value_object_dict))
+
+        # step 1.7
+        if 'tbl_multi_state_input_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_multi_state_input_objects',
+                                             changed_table_dict['tbl_multi_state_input_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = row['present_value']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['number_of_states'] = row['number_of_states']
+                    if (row['state_text'] is not None and
+                            isinstance(row['state_text'], str) and
+                            len(row['state_text']) > 0):
+                        result['state_text'] = str(row['state_text']).split(";")
+                    else:
+                        result['state_text'] = None
+                    multi_state_input_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(multi_state_input_object_dict))
+
+        # step 1.8
+        if 'tbl_multi_state_output_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_multi_state_output_objects',
+                                             changed_table_dict['tbl_multi_state_output_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['number_of_states'] = row['number_of_states']
+                    if (row['state_text'] is not None and
+                            isinstance(row['state_text'], str) and
+                            len(row['state_text']) > 0):
+                        result['state_text'] = str(row['state_text']).split(";")
+                    else:
+                        result['state_text'] = None
+                    result['relinquish_default'] = row['relinquish_default']
+                    multi_state_output_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(multi_state_output_object_dict))
+
+        # step 1.9
+        if 'tbl_multi_state_value_objects' in changed_table_dict:
+            rows_objects = self.read_objects('tbl_multi_state_value_objects',
+                                             changed_table_dict['tbl_multi_state_value_objects'])
+
+            if rows_objects is not None and len(rows_objects) > 0:
+                for row in rows_objects:
+                    if _debug:
+                        _log.debug(str(row))
+                    result = dict()
+                    result['id'] = row['id']
+                    result['object_identifier'] = int(row['object_identifier'])
+                    result['object_name'] = row['object_name']
+                    result['present_value'] = row['present_value']
+                    result['description'] = row['description']
+                    result['status_flags'] = row['status_flags']
+                    result['event_state'] = row['event_state']
+                    result['out_of_service'] = bool(row['out_of_service'])
+                    result['number_of_states'] = row['number_of_states']
+                    if (row['state_text'] is not None and
+                            isinstance(row['state_text'], str) and
+                            len(row['state_text']) > 0):
+                        result['state_text'] = str(row['state_text']).split(";")
+                    else:
+                        result['state_text'] = None
+                    multi_state_value_object_dict[result['object_identifier']] = result
+            if _debug:
+                _log.debug(str(multi_state_value_object_dict))
+
+        ################################################################################################################
+        # STEP 2: Update properties of objects
+        ################################################################################################################
+        for i in range(len(object_list)):
+
+            if object_list[i].objectType == 'analogInput':
+                # step 2.1
+                result = analog_input_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                      int(result['status_flags'][1]),
+                                                      int(result['status_flags'][2]),
+                                                      int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].units = result['units']
+                    object_list[i].covIncrement = result['cov_increment']
+            elif object_list[i].objectType == 'analogOutput':
+                # step 2.2
+                result = analog_output_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT REFRESH PRESENT VALUE OF ANALOG OUTPUT OBJECT
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].units = result['units']
+                    # NOTE: THE PRESENT VALUE FOLLOWS A CHANGED RELINQUISH DEFAULT WHEN NO PRIORITY IS COMMANDED
+                    if object_list[i].relinquishDefault != result['relinquish_default']:
+                        object_list[i].relinquishDefault = result['relinquish_default']
+                        if object_list[i].apply_relinquish_default():
+                            persistence_object_dict[object_list[i].objectIdentifier] = object_list[i]
+                    object_list[i].covIncrement = result['cov_increment']
+            elif object_list[i].objectType == 'analogValue':
+                # step 2.3
+                result = analog_value_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].units = result['units']
+                    object_list[i].covIncrement = result['cov_increment']
+            elif object_list[i].objectType == 'binaryInput':
+                # step 2.4
+                result = binary_input_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].polarity = result['polarity']
+            elif object_list[i].objectType == 'binaryOutput':
+                # step 2.5
+                result = binary_output_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT REFRESH PRESENT VALUE OF BINARY OUTPUT OBJECT
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].polarity = result['polarity']
+                    # NOTE: THE PRESENT VALUE FOLLOWS A CHANGED RELINQUISH DEFAULT WHEN NO PRIORITY IS COMMANDED
+                    if object_list[i].relinquishDefault != result['relinquish_default']:
+                        object_list[i].relinquishDefault = result['relinquish_default']
+                        if object_list[i].apply_relinquish_default():
+                            persistence_object_dict[object_list[i].objectIdentifier] = object_list[i]
+            elif object_list[i].objectType == 'binaryValue':
+                # step 2.6
+                result = binary_value_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+            elif object_list[i].objectType == 'multiStateInput':
+                # step 2.7
+                result = multi_state_input_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].numberOfStates = result['number_of_states']
+                    object_list[i].stateText = result['state_text']
+            elif object_list[i].objectType == 'multiStateOutput':
+                # step 2.8
+                result = multi_state_output_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT REFRESH PRESENT VALUE OF MULTI STATE OUTPUT OBJECT
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].numberOfStates = result['number_of_states']
+                    object_list[i].stateText = result['state_text']
+                    # NOTE: THE PRESENT VALUE FOLLOWS A CHANGED RELINQUISH DEFAULT WHEN NO PRIORITY IS COMMANDED
+                    if object_list[i].relinquishDefault != result['relinquish_default']:
+                        object_list[i].relinquishDefault = result['relinquish_default']
+                        if object_list[i].apply_relinquish_default():
+                            persistence_object_dict[object_list[i].objectIdentifier] = object_list[i]
+            elif object_list[i].objectType == 'multiStateValue':
+                # step 2.9
+                result = multi_state_value_object_dict.get(object_list[i].objectIdentifier[1], None)
+                if result is not None:
+                    object_list[i].objectName = result['object_name']
+                    # NOTE: DO NOT OVERWRITE AN INGESTED PRESENT VALUE WAITING FOR THE PERSISTENCE TASK
+                    if object_list[i].objectIdentifier not in persistence_object_dict:
+                        object_list[i].presentValue = result['present_value']
+                    object_list[i].description = result['description']
+                    object_list[i].statusFlags = [int(result['status_flags'][0]),
+                                                  int(result['status_flags'][1]),
+                                                  int(result['status_flags'][2]),
+                                                  int(result['status_flags'][3])]
+                    object_list[i].eventState = result['event_state']
+                    object_list[i].outOfService = result['out_of_service']
+                    object_list[i].numberOfStates = result['number_of_states']
+                    object_list[i].stateText = result['state_text']
+            else:
+                pass
+
+        if _debug:
+            Refreshing._debug("after refresh object list: " + str(object_list))
+
+    def connect(self):
+        """
+        Check database connectivity and reconnect if necessary.
+
+        Returns:
+            bool: True if the database connection is available
+        """
+        if self.cursor and self.cnx.is_connected():
+            return True
+        try:
+            # Reconnect to database
+            self.cnx = mysql.connector.connect(autocommit=True, **settings.xbacnet)
+            self.cursor = self.cnx.cursor(dictionary=True)
+            return True
+        except Exception as e:
+            _log.error("Error in ReadablePropertiesRefreshing connect " + str(e))
+            self.cursor = None
+            self.cnx = None
+            return False
+
+    def read_changes(self):
+        """
+        Read the next entries of the change log.
+
+        The first run starts from the end of the change log and reads all tables. The entries are
+        read in sequence order and reading stops at a missing sequence number, which may belong to
+        a transaction that is not committed yet, until the entry after it is older than
+        CHANGE_LOG_GAP_TIMEOUT seconds.
+
+        Returns:
+            dict: Ids of the changed objects keyed by table name, a table maps to None when all of
+                its objects are read, or None if the change log could not be read
+        """
+        try:
+            if self.last_change_id is None:
+                self.cursor.execute(" SELECT COALESCE(MAX(id), 0) AS id FROM tbl_object_changes ")
+                self.next_change_id = int(self.cursor.fetchone()['id'])
+                return dict.fromkeys(REFRESHING_COLUMN_DICT)
+
+            query = (" SELECT id, table_name, object_id, "
+                     "        TIMESTAMPDIFF(MICROSECOND, utc_date_time, UTC_TIMESTAMP(6)) AS age "
+                     " FROM tbl_object_changes "
+                     " WHERE id > %s "
+                     " ORDER BY id "
+                     " LIMIT %s ")
+            self.cursor.execute(query, (self.last_change_id, settings.CHANGE_LOG_BATCH_SIZE))
+            rows = self.cursor.fetchall()
+        except Exception as e:
+            _log.error("Error in ReadablePropertiesRefreshing read_changes " + str(e))
+            return None
+
+        changed_table_dict = dict()
+        self.next_change_id = self.last_change_id
+        for row in rows:
+            if row['id'] != self.next_change_id + 1 and row['age'] < settings.CHANGE_LOG_GAP_TIMEOUT * 1000000:
+                if _debug:
+                    Refreshing._debug("    - waiting for change: %r", self.next_change_id + 1)
+                break
+            if row['table_name'] in REFRESHING_COLUMN_DICT:
+                changed_table_dict.setdefault(row['table_name'], set()).add(int(row['object_id']))
+            self.next_change_id = row['id']
+        if _debug:
+            Refreshing._debug("    - changed objects: %r", changed_table_dict)
+        return changed_table_dict
+
+    def consume_changes(self):
+        """
+        Prune the change log entries that were refreshed.
+
+        The last consumed entry is kept, so that the sequence continues from it after a restart.
+        """
+        try:
+            self.cursor.execute(" DELETE FROM tbl_object_changes WHERE id < %s ", (self.next_change_id,))
+        except Exception as e:
+            _log.error("Error in ReadablePropertiesRefreshing consume_changes " + str(e))
+        self.last_change_id = self.next_change_id
+
+    def read_objects(self, table_name, ids):
+        """
+        Read the refreshed columns of the objects of a table.
+
+        Args:
+            table_name (str): Database table of the objects
+            ids (set): Ids of the objects to read, or None to read all objects
+
+        Returns:
+            list: Rows of the objects
+        """
+        query = " SELECT " + ", ".join(REFRESHING_COLUMN_DICT[table_name]) + " FROM " + table_name + " "
+        if ids is None:
+            self.cursor.execute(query)
+        else:
+            ids = list(ids)
+            query += " WHERE id IN (" + ", ".join(["%s"] * len(ids)) + ") "
+            self.cursor.execute(query, ids)
+        return self.cursor.fetchall()
+
+    def probe(self):
+        """
+        Probe all tables for changes with one aggregate query.
+
+        Each table is fingerprinted with its row count and the XOR of the CRC32 checksums of the
+        refreshed columns of its rows, so the database computes the fingerprints without sending
+        any rows, and idle tables are not read at all. The present values saved by this server
+        are left out, see probe_column_dict.
+
+        Returns:
+            dict: Fingerprints of the tables whose fingerprint moved since the last refresh, keyed by
+                table name, or None if the probe failed
+        """
+        query = " UNION ALL ".join(
+            " SELECT '" + table_name + "' AS table_name, COUNT(*) AS row_count, "
+            "        BIT_XOR(CRC32(JSON_ARRAY(" + ", ".join(column_names) + "))) AS checksum "
+            " FROM " + table_name + " "
+            for table_name, column_names in self.probe_column_dict.items())
+        try:
+            self.cursor.execute(query)
+            rows = self.cursor.fetchall()
+        except Exception as e:
+            _log.error("Error in ReadablePropertiesRefreshing probe " + str(e))
+            return None
+
+        changed_table_dict = dict()
+        for row in rows:
+            fingerprint = (int(row['row_count']), int(row['checksum']))
+            if self.fingerprint_dict.get(row['table_name'], None) != fingerprint:
+                changed_table_dict[row['table_name']] = fingerprint
+        if _debug:
+            Refreshing._debug("    - changed tables: %r", changed_table_dict)
+        return changed_table_dict
+
+
+########################################################################################################################
+# Change Notifications - Applies the Changes Committed by xbacnet-api at Once
+#
+# After it committed a change of an object, xbacnet-api sends a UDP datagram to NOTIFICATION_ADDRESS on the loopback
+# interface, for example {"table": "tbl_analog_value_objects", "id": 1, "operation": "update"}. The datagrams are read
+# on the core loop of the application and the notified objects are refreshed at once by the refreshing task, so a
+# change made through the API reaches the BACnet network without waiting for REFRESHING_INTERVAL. Notifications are
+# not acknowledged, a lost notification is picked up by the next run of the refreshing task.
+#
+########################################################################################################################
+@bacpypes_debugging
+class ChangeNotifications(asyncore.dispatcher):
+
+    def __init__(self, refreshing, address):
+        """
+        Initialize the notification socket.
+
+        Args:
+            refreshing (Refreshing): Refreshing task that refreshes the notified objects
+            address (tuple): Host and port to receive the notifications on
+        """
+        if _debug:
+            ChangeNotifications._debug("__init__ %r %r", refreshing, address)
+        asyncore.dispatcher.__init__(self)
+
+        self.refreshing = refreshing
+        self.create_socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.bind(address)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def handle_read(self):
+        """Read the pending notifications and refresh the notified objects together."""
+        if _debug:
+            ChangeNotifications._debug("handle_read")
+
+        # Ids of the notified objects keyed by table name
+        changed_table_dict = dict()
+        while True:
+            try:
+                data = self.socket.recv(4096)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                _log.error("Error in ChangeNotifications handle_read " + str(e))
+                break
+
+            try:
+                notification = json.loads(data.decode('utf-8'))
+                table_name = notification['table']
+                # Notifications of bulk operations carry the ids of many objects
+                if 'ids' in notification:
+                    object_ids = [int(object_id) for object_id in notification['ids']]
+                else:
+                    object_ids = [int(notification['id'])]
+            except Exception as e:
+                _log.error("Error in ChangeNotifications invalid notification " + str(e))
+                continue
+            if table_name in REFRESHING_COLUMN_DICT:
+                changed_table_dict.setdefault(table_name, set()).update(object_ids)
+
+        if len(changed_table_dict) == 0 or not self.refreshing.connect():
+            return
+        try:
+            self.refreshing.refresh(changed_table_dict)
+        except Exception as e:
+            _log.error("Error in ChangeNotifications refresh " + str(e))
+
+    def handle_error(self):
+        # Keep the socket open, the default closes it
+        _log.exception("Error in ChangeNotifications handle_error")
+
+
+########################################################################################################################
+# Trend Log Segment - Ring Buffers of Present Values in Shared Memory-Mapped Files
+#
+# The ring buffers of up to TREND_LOG_SEGMENT_SIZE objects of one type share a segment file
+# <objectType>-segment-<instance // TREND_LOG_SEGMENT_SIZE>.dat in TREND_LOG_DIRECTORY, which is mapped once and
+# closed, so a segment holds one file descriptor and one memory mapping however many objects it records:
+#
+# - segment header (16 bytes): magic b'XBTS', version 1 (unsigned short), number of ring buffers per object (unsigned
+#   short), number of objects per segment (unsigned int), 4 padding bytes
+# - one descriptor per ring buffer (16 bytes): capacity in records (unsigned int), record size (unsigned int), bucket
+#   size in seconds of a rollup tier, 0 for the recorded values (unsigned long long)
+# - the ring buffers of the object with instance % TREND_LOG_SEGMENT_SIZE == 0, then those of the next one and so on
+#
+# A segment file whose layout differs from the settings is created again and its records are dropped. The file is
+# sparse, disk blocks are allocated as the records are written.
+#
+# Each ring buffer holds a header and a fixed number of records, which are overwritten oldest first when the buffer
+# is full:
+#
+# - header (32 bytes): magic b'XBTL', version 1 (unsigned short), record size (unsigned short), capacity in records
+#   (unsigned int), total number of records written (unsigned long long), number of records written before the buffer
+#   was last cleared (unsigned long long), 4 padding bytes
+# - record of the recorded values (16 bytes): timestamp in seconds since the epoch (double), value (double)
+# - record of a rollup tier of TREND_LOG_ROLLUP_TIERS (48 bytes): bucket start time, minimum, maximum, sum and number
+#   of the values, last value, all little-endian
+#
+# Record n (sequence number n + 1) is stored in slot n % capacity. A record is written before the total is updated, so
+# readers in other processes see only complete records. Appending a record is O(1) and the memory used is bounded by
+# the mapped files, which the operating system pages in and out. The retention of a rollup tier is its number of
+# buckets times its bucket size, the oldest buckets are overwritten in place, so the files never grow and writers are
+# never blocked by a compaction.
+#
+########################################################################################################################
+@bacpypes_debugging
+class TrendLogSegment(object):
+
+    header = struct.Struct('<4sHHI4x')
+    descriptor = struct.Struct('<IIQ')
+
+    def __init__(self, path, layout):
+        """
+        Open and map the segment file, creating it if it does not exist or has another layout.
+
+        Args:
+            path (str): Path of the segment file
+            layout (tuple): Capacity and bucket size in seconds, 0 for the recorded values, of each ring buffer of an
+                object
+        """
+        if _debug:
+            TrendLogSegment._debug("__init__ %r %r", path, layout)
+        self.path = path
+        self.layout = layout
+
+        # Offsets of the ring buffers of an object from the start of its ring buffers
+        self.buffer_offset_list = list()
+        self.object_size = 0
+        for capacity, bucket_size in layout:
+            self.buffer_offset_list.append(self.object_size)
+            self.object_size += TrendLogBuffer.header.size + capacity * self.buffer_class(bucket_size).record.size
+        self.data_offset = self.header.size + len(layout) * self.descriptor.size
+        size = self.data_offset + TREND_LOG_SEGMENT_SIZE * self.object_size
+
+        with open(path, 'r+b' if os.path.exists(path) else 'w+b') as file:
+            if os.fstat(file.fileno()).st_size != size or file.read(self.data_offset) != self.pack_layout():
+                # A new file, or a file of another layout whose records are dropped
+                file.truncate(0)
+                file.truncate(size)
+                file.seek(0)
+                file.write(self.pack_layout())
+                file.flush()
+            # The map keeps a duplicate of the file descriptor, the file itself is closed
+            self.map = mmap.mmap(file.fileno(), size)
+
+    @staticmethod
+    def buffer_class(bucket_size):
+        """
+        Get the ring buffer class of a ring buffer of the layout.
+
+        Args:
+            bucket_size (int): Bucket size in seconds, 0 for the recorded values
+
+        Returns:
+            type: TrendLogBuffer or TrendLogRollupBuffer
+        """
+        return TrendLogRollupBuffer if bucket_size else TrendLogBuffer
+
+    def pack_layout(self):
+        """
+        Pack the segment header and the descriptors of the ring buffers.
+
+        Returns:
+            bytes: Start of the segment file
+        """
+        data = self.header.pack(b'XBTS', 1, len(self.layout), TREND_LOG_SEGMENT_SIZE)
+        for capacity, bucket_size in self.layout:
+            data += self.descriptor.pack(capacity, self.buffer_class(bucket_size).record.size, bucket_size)
+        return data
+
+    @staticmethod
+    def open(object_type, instance):
+        """
+        Get the open segment of an object, opening its segment file if it is not open.
+
+        Args:
+            object_type (str): BACnet object type
+            instance (int): Instance number of the object
+
+        Returns:
+            TrendLogSegment: Segment holding the ring buffers of the object
+        """
+        key = (object_type, instance // TREND_LOG_SEGMENT_SIZE)
+        trend_log_segment = trend_log_segment_dict.get(key, None)
+        if trend_log_segment is None:
+            trend_log_segment = TrendLogSegment(
+                os.path.join(settings.TREND_LOG_DIRECTORY,
+                             object_type + '-segment-' + str(instance // TREND_LOG_SEGMENT_SIZE) + '.dat'),
+                ((settings.TREND_LOG_BUFFER_SIZE, 0),) + tuple(
+                    (bucket_count, bucket_size) for bucket_size, bucket_count in settings.TREND_LOG_ROLLUP_TIERS),
+            )
+            trend_log_segment_dict[key] = trend_log_segment
+        return trend_log_segment
+
+    def buffers(self, instance):
+        """
+        Get the ring buffers of an object.
+
+        Args:
+            instance (int): Instance number of the object
+
+        Returns:
+            list: TrendLogBuffer of the recorded values, then a TrendLogRollupBuffer per rollup tier
+        """
+        offset = self.data_offset + (instance % TREND_LOG_SEGMENT_SIZE) * self.object_size
+        return [self.buffer_class(bucket_size)(self.map, offset + buffer_offset, capacity)
+                for (capacity, bucket_size), buffer_offset in zip(self.layout, self.buffer_offset_list)]
+
+    def close(self):
+        """Write the records to the file and unmap it."""
+        self.map.flush()
+        self.map.close()
+
+
+@bacpypes_debugging
+class TrendLogBuffer(object):
+
+    header = struct.Struct('<4sHHIQQ4x')
+    counters = struct.Struct('<QQ')
+    counters_offset = 12
+    record = struct.Struct('<dd')
+
+    def __init__(self, data, offset, capacity):
+        """
+        Open a ring buffer in a segment, clearing it if its header does not match.
+
+        Args:
+            data (mmap.mmap): Map of the segment file
+            offset (int): Offset of the ring buffer in the segment file
+            capacity (int): Number of records in the ring buffer
+        """
+        if _debug:
+            TrendLogBuffer._debug("__init__ %r %r", offset, capacity)
+        self.map = data
+        self.offset = offset
+        self.records_offset = offset + self.header.size
+        self.capacity = capacity
+
+        magic, version, record_size, buffer_capacity, self.total, self.cleared = \
+            self.header.unpack_from(self.map, offset)
+        if (magic, version, record_size, buffer_capacity) != (b'XBTL', 1, self.record.size, capacity):
+            self.total = 0
+            self.cleared = 0
+            self.header.pack_into(self.map, offset, b'XBTL', 1, self.record.size, capacity, 0, 0)
+
+    def append(self, *values):
+        """
+        Append a record, overwriting the oldest record when the buffer is full.
+
+        Args:
+            *values: Fields of the record, the timestamp in seconds since the epoch first
+        """
+        self.record.pack_into(self.map, self.records_offset + (self.total % self.capacity) * self.record.size,
+                              *values)
+        self.total += 1
+        self.counters.pack_into(self.map, self.offset + self.counters_offset, self.total, self.cleared)
+
+    def clear(self):
+        """Delete all records, keeping the total number of records written."""
+        self.cleared = self.total
+        self.counters.pack_into(self.map, self.offset + self.counters_offset, self.total, self.cleared)
+
+    def record_count(self):
+        """
+        Get the number of records in the buffer.
+
+        Returns:
+            int: Number of records
+        """
+        return min(self.total - self.cleared, self.capacity)
+
+    def first_sequence_number(self):
+        """
+        Get the sequence number of the oldest record, the sequence number of the first record written being 1.
+
+        Returns:
+            int: Sequence number, one more than the total when the buffer is empty
+        """
+        return self.total - self.record_count() + 1
+
+    def read_record(self, sequence_number):
+        """
+        Read a record by sequence number.
+
+        Args:
+            sequence_number (int): Sequence number of a record in the buffer
+
+        Returns:
+            tuple: Timestamp and value
+        """
+        return self.record.unpack_from(
+            self.map, self.records_offset + ((sequence_number - 1) % self.capacity) * self.record.size)
+
+    def read(self, start, stop):
+        """
+        Read the records of a range of sequence numbers.
+
+        Args:
+            start (int): First sequence number
+            stop (int): Last sequence number, included
+
+        Returns:
+            generator: Timestamps and values
+        """
+        for sequence_number in range(start, stop + 1):
+            yield self.read_record(sequence_number)
+
+    def bisect(self, timestamp, right):
+        """
+        Find a record by time with a binary search, the timestamps of the records being ascending.
+
+        Args:
+            timestamp (float): Seconds since the epoch
+            right (bool): True to find the first record after the time, False the first record at or after it
+
+        Returns:
+            int: Sequence number, one more than the total when all records are before the time
+        """
+        low, high = self.first_sequence_number(), self.total + 1
+        while low < high:
+            middle = (low + high) // 2
+            record_timestamp = self.read_record(middle)[0]
+            if record_timestamp < timestamp or (right and record_timestamp == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class TrendLogRollupBuffer(TrendLogBuffer):
+
+    # Bucket start time, minimum, maximum, sum and number of the values, last value
+    record = struct.Struct('<dddddd')
+
+
+@bacpypes_debugging
+class TrendLogRollup(object):
+
+    def __init__(self, bucket_size, trend_log_buffer):
+        """
+        Initialize a rollup tier of a trend log.
+
+        Args:
+            bucket_size (int): Bucket size in seconds
+            trend_log_buffer (TrendLogRollupBuffer): Ring buffer of the closed buckets
+        """
+        if _debug:
+            TrendLogRollup._debug("__init__ %r %r", bucket_size, trend_log_buffer)
+        self.bucket_size = bucket_size
+        self.trend_log_buffer = trend_log_buffer
+
+        # Open bucket: start time, minimum, maximum, sum and number of the values, last value
+        self.bucket = None
+
+    def add(self, timestamp, value):
+        """
+        Add a value to the open bucket, closing the bucket first when the value is in a later bucket.
+
+        Args:
+            timestamp (float): Seconds since the epoch
+            value (float): Recorded value
+        """
+        bucket_start = timestamp // self.bucket_size * self.bucket_size
+        if self.bucket is not None and self.bucket[0] != bucket_start:
+            self.close()
+        if self.bucket is None:
+            self.bucket = [bucket_start, value, value, value, 1, value]
+        else:
+            bucket = self.bucket
+            bucket[1] = min(bucket[1], value)
+            bucket[2] = max(bucket[2], value)
+            bucket[3] += value
+            bucket[4] += 1
+            bucket[5] = value
+
+    def close(self):
+        """Write the open bucket to the ring buffer."""
+        if self.bucket is not None:
+            self.trend_log_buffer.append(*self.bucket)
+            self.bucket = None
+
+    def close_ended(self, now):
+        """
+        Close the open bucket if its time has passed.
+
+        Args:
+            now (float): Seconds since the epoch
+        """
+        if self.bucket is not None and now >= self.bucket[0] + self.bucket_size:
+            self.close()
+
+    def resume(self, trend_log_buffer):
+        """
+        Add the recorded values after the last closed bucket, which were in open buckets when the server stopped.
+
+        Args:
+            trend_log_buffer (TrendLogBuffer): Ring buffer of the recorded values
+        """
+        if self.trend_log_buffer.record_count() > 0:
+            last_end = self.trend_log_buffer.read_record(self.trend_log_buffer.total)[0] + self.bucket_size
+        else:
+            last_end = 0.0
+        for timestamp, value in trend_log_buffer.read(trend_log_buffer.bisect(last_end, False),
+                                                      trend_log_buffer.total):
+            self.add(timestamp, value)
+
+
+def trend_log_date_time(timestamp):
+    """
+    Convert a timestamp to a BACnet date and time in local time.
+
+    Args:
+        timestamp (float): Seconds since the epoch
+
+    Returns:
+        DateTime: BACnet date and time
+    """
+    t = time.localtime(timestamp)
+    return DateTime(
+        date=Date((t.tm_year - 1900, t.tm_mon, t.tm_mday, t.tm_wday + 1)),
+        time=Time((t.tm_hour, t.tm_min, t.tm_sec, int((timestamp % 1) * 100))),
+    )
+
+
+def trend_log_timestamp(date_time):
+    """
+    Convert a BACnet date and time in local time to a timestamp.
+
+    Args:
+        date_time (DateTime): BACnet date and time
+
+    Returns:
+        float: Seconds since the epoch
+    """
+    year, month, day, day_of_week = date_time.date.value
+    hour, minute, second, hundredth = date_time.time.value
+    if 255 in (year, month, day, hour, minute, second, hundredth):
+        # Unspecified values are not supported in the reference time
+        raise ExecutionError(errorClass='services', errorCode='parameterOutOfRange')
+    return time.mktime((year + 1900, month, day, hour, minute, second, 0, 0, -1)) + hundredth / 100.0
+
+
+########################################################################################################################
+# Trend Log Object - Exposes the Ring Buffer of an Object
+#
+# The log buffer can only be read with ReadRange, Record_Count and Total_Record_Count are read from the ring buffer
+# and writing 0 to Record_Count clears the ring buffer. The present value is recorded when it changes.
+#
+########################################################################################################################
+@bacpypes_debugging
+class TrendLogBufferProperty(Property):
+
+    def __init__(self):
+        Property.__init__(self, 'logBuffer', ListOf(LogRecord), default=None, optional=False, mutable=False)
+
+    def ReadProperty(self, obj, arrayIndex=None):
+        # The log buffer may not fit in a response, it is read with ReadRange
+        raise ExecutionError(errorClass='property', errorCode='readAccessDenied')
+
+
+@bacpypes_debugging
+class TrendLogCountProperty(Property):
+
+    def __init__(self, identifier):
+        Property.__init__(self, identifier, Unsigned, default=None, optional=False,
+                          mutable=(identifier == 'recordCount'))
+
+    def ReadProperty(self, obj, arrayIndex=None):
+        if arrayIndex is not None:
+            raise ExecutionError(errorClass='property', errorCode='propertyIsNotAnArray')
+        if self.identifier == 'recordCount':
+            return obj._trend_log_buffer.record_count()
+        return obj._trend_log_buffer.total
+
+    def WriteProperty(self, obj, value, arrayIndex=None, priority=None, direct=False):
+        if _debug:
+            TrendLogCountProperty._debug("WriteProperty %r %r", obj, value)
+        if not self.mutable:
+            raise ExecutionError(errorClass='property', errorCode='writeAccessDenied')
+        if arrayIndex is not None:
+            raise ExecutionError(errorClass='property', errorCode='propertyIsNotAnArray')
+        if value != 0:
+            raise ExecutionError(errorClass='property', errorCode='valueOutOfRange')
+        obj._trend_log_buffer.clear()
+
+
+@register_object_type
+@bacpypes_debugging
+class ProTrendLogObject(TrendLogObject):
+
+    properties = [
+        TrendLogBufferProperty(),
+        TrendLogCountProperty('recordCount'),
+        TrendLogCountProperty('totalRecordCount'),
+    ]
+
+    def __init__(self, logged_object, trend_log_buffer, trend_log_rollups, **kwargs):
+        """
+        Initialize the trend log object of an object and start recording its present value.
+
+        Args:
+            logged_object: BACnet object whose present value is recorded
+            trend_log_buffer (TrendLogBuffer): Ring buffer of the records
+            trend_log_rollups (list): Rollup tiers of the records
+            **kwargs: Properties of the trend log object
+        """
+        if _debug:
+            ProTrendLogObject._debug("__init__ %r %r", logged_object, kwargs)
+        TrendLogObject.__init__(self, **kwargs)
+        self._trend_log_buffer = trend_log_buffer
+        self._trend_log_rollups = trend_log_rollups
+        self._log_datum_choice = TREND_LOG_DATUM_DICT[logged_object.objectType]
+
+        # Record the present value at startup if it changed while the server was stopped
+        value = self.log_value(logged_object.presentValue)
+        if trend_log_buffer.record_count() == 0 or \
+                trend_log_buffer.read_record(trend_log_buffer.total)[1] != value:
+            trend_log_buffer.append(time.time(), value)
+
+        # Reopen the buckets of the rollup tiers
+        for trend_log_rollup in trend_log_rollups:
+            trend_log_rollup.resume(trend_log_buffer)
+
+        logged_object._property_monitors['presentValue'].append(self.present_value_changed)
+
+    def present_value_changed(self, old_value, new_value):
+        """
+        Record a changed present value of the logged object.
+
+        Args:
+            old_value: Previous present value
+            new_value: Present value
+        """
+        if new_value == old_value or not self.enable:
+            return
+        try:
+            timestamp, value = time.time(), self.log_value(new_value)
+            self._trend_log_buffer.append(timestamp, value)
+            for trend_log_rollup in self._trend_log_rollups:
+                trend_log_rollup.add(timestamp, value)
+        except Exception as e:
+            _log.error("Error in ProTrendLogObject present_value_changed " + str(e))
+
+    @staticmethod
+    def log_value(value):
+        """
+        Convert a present value to the value of a record.
+
+        Args:
+            value: Present value, binary values are 'active' or 'inactive'
+
+        Returns:
+            float: Value of the record
+        """
+        if isinstance(value, str):
+            return 1.0 if value == 'active' else 0.0
+        if hasattr(value, 'get_long'):
+            return float(value.get_long())
+        return float(value)
+
+    def log_datum(self, value):
+        """
+        Convert the value of a record to the value of a log datum.
+
+        Args:
+            value (float): Value of the record
+
+        Returns:
+            Value of the log datum choice of the object type
+        """
+        if self._log_datum_choice == 'realValue':
+            return value
+        return int(value)
+
+
+def create_trend_log(logged_object, device_identifier):
+    """
+    Open the ring buffers of an object in its segment file and create the trend log object exposing them.
+
+    Args:
+        logged_object: BACnet object whose present value is recorded
+        device_identifier (tuple): Object identifier of the local device
+
+    Returns:
+        ProTrendLogObject: Trend log object, or None if the object instance has no trend log instance or its segment
+            file could not be opened
+    """
+    object_type, instance = logged_object.objectIdentifier
+    if instance >= TREND_LOG_INSTANCE_FACTOR:
+        _log.error("Error in create_trend_log no trend log instance for " + str(logged_object.objectIdentifier))
+        return None
+
+    try:
+        trend_log_buffers = TrendLogSegment.open(object_type, instance).buffers(instance)
+    except (OSError, ValueError) as e:
+        _log.error("Error in create_trend_log " + str(logged_object.objectIdentifier) + " " + str(e))
+        return None
+    trend_log_buffer = trend_log_buffers[0]
+    trend_log_rollups = [TrendLogRollup(bucket_size, rollup_buffer) for (bucket_size, bucket_count), rollup_buffer
+                         in zip(settings.TREND_LOG_ROLLUP_TIERS, trend_log_buffers[1:])]
+    return ProTrendLogObject(
+        logged_object,
+        trend_log_buffer,
+        trend_log_rollups,
+        objectIdentifier=('trendLog', ObjectType.enumerations[object_type] * TREND_LOG_INSTANCE_FACTOR + instance),
+        objectName=logged_object.objectName + ' Trend Log',
+        statusFlags=[0, 0, 0, 0],
+        eventState='normal',
+        enable=True,
+        logDeviceObjectProperty=DeviceObjectPropertyReference(
+            objectIdentifier=logged_object.objectIdentifier,
+            propertyIdentifier='presentValue',
+            deviceIdentifier=device_identifier,
+        ),
+        stopWhenFull=False,
+        bufferSize=settings.TREND_LOG_BUFFER_SIZE,
+        loggingType='cov',
+    )
+
+
+########################################################################################################################
+# Trend Log Compaction - Closes the Ended Buckets of the Rollup Tiers
+#
+# A bucket is closed when a value of a later bucket is recorded, this task closes the buckets of the values which did
+# not change since, so the rollup tiers are complete up to TREND_LOG_ROLLUP_INTERVAL ago.
+#
+########################################################################################################################
+@bacpypes_debugging
+class TrendLogCompaction(RecurringTask):
+
+    def __init__(self, interval):
+        """
+        Initialize the trend log compaction task.
+
+        Args:
+            interval (float): Task interval in seconds
+        """
+        if _debug:
+            TrendLogCompaction._debug("__init__ %r", interval)
+        RecurringTask.__init__(self, interval * 1000)  # Convert seconds to milliseconds
+
+    def process_task(self):
+        """Close the ended buckets of all rollup tiers."""
+        if _debug:
+            TrendLogCompaction._debug("process_task")
+        now = time.time()
+        for pro_object in trend_log_list:
+            for trend_log_rollup in pro_object._trend_log_rollups:
+                try:
+                    trend_log_rollup.close_ended(now)
+                except Exception as e:
+                    _log.error("Error in TrendLogCompaction process_task " + str(e))
+
+
+########################################################################################################################
+# Alarm Engine - Intrinsic Reporting of Analog and Binary Objects
+#
+# The objects with a rule in ALARM_RULE_DICT, keyed by object identifier or object type, are evaluated by the engine:
+#
+# - analog objects (out of range): 'high_limit' and 'low_limit', either may be left out, 'deadband' of the return to
+#   normal and 'time_delay' in seconds. All analog objects are evaluated per cycle with masks over numpy arrays.
+# - binary objects (change of state): 'alarm_value' and 'time_delay' in seconds. They are evaluated when the present
+#   value changes, and by the cycle while a transition waits for its time delay.
+#
+# On a transition the event state and the IN_ALARM status flag of the object are set, the object is queued for the
+# persistence task and an UnconfirmedEventNotification is sent to ALARM_RECIPIENTS. Event states copied from the
+# database by the refreshing task are overwritten with the state of the engine on the next cycle.
+#
+########################################################################################################################
+@bacpypes_debugging
+class AlarmEngine(RecurringTask):
+
+    # Event states of the analog objects, the index is the state code in the state array
+    ANALOG_STATES = ('normal', 'highLimit', 'lowLimit')
+    ANALOG_CODE_DICT = {state: code for code, state in enumerate(ANALOG_STATES)}
+
+    def __init__(self, interval, objects, rule_dict):
+        """
+        Initialize the alarm engine with the objects having a rule.
+
+        Args:
+            interval (float): Cycle interval in seconds
+            objects (list): BACnet objects
+            rule_dict (dict): Rules by object identifier or object type
+        """
+        if _debug:
+            AlarmEngine._debug("__init__ %r %r", interval, rule_dict)
+        RecurringTask.__init__(self, interval * 1000)  # Convert seconds to milliseconds
+
+        # Analog objects and their limits, deadbands, time delays, states and pending transitions in parallel arrays
+        self.analog_objects = list()
+        high_limits, low_limits, deadbands, analog_time_delays, analog_states = list(), list(), list(), list(), list()
+
+        # Binary objects and their alarm values, time delays and states, and the ones waiting for a time delay
+        self.binary_objects = list()
+        self.alarm_values = list()
+        self.binary_time_delays = list()
+        self.binary_states = list()
+        self.pending_binary_dict = dict()
+
+        for pro_object in objects:
+            rule = rule_dict.get(pro_object.objectIdentifier, rule_dict.get(pro_object.objectType, None))
+            if rule is None:
+                continue
+            if pro_object.objectType in ('analogInput', 'analogOutput', 'analogValue'):
+                self.analog_objects.append(pro_object)
+                high_limits.append(rule.get('high_limit', float('inf')))
+                low_limits.append(rule.get('low_limit', float('-inf')))
+                deadbands.append(rule.get('deadband', 0.0))
+                analog_time_delays.append(rule.get('time_delay', 0.0))
+                state = pro_object.eventState
+                analog_states.append(self.ANALOG_STATES.index(state) if state in self.ANALOG_STATES else 0)
+            elif pro_object.objectType in ('binaryInput', 'binaryOutput', 'binaryValue'):
+                index = len(self.binary_objects)
+                self.binary_objects.append(pro_object)
+                self.alarm_values.append(rule.get('alarm_value', 'active'))
+                self.binary_time_delays.append(rule.get('time_delay', 0.0))
+                self.binary_states.append('offnormal' if pro_object.eventState == 'offnormal' else 'normal')
+                pro_object._property_monitors['presentValue'].append(
+                    lambda old_value, new_value, index=index: self.evaluate_binary(index, time.time()))
+
+        self.high_limits = numpy.array(high_limits, dtype=numpy.float64)
+        self.low_limits = numpy.array(low_limits, dtype=numpy.float64)
+        self.deadbands = numpy.array(deadbands, dtype=numpy.float64)
+        self.analog_time_delays = numpy.array(analog_time_delays, dtype=numpy.float64)
+        self.analog_states = numpy.array(analog_states, dtype=numpy.int8)
+        # Target state of the transition waiting for its time delay, -1 for none, and the time it started
+        self.pending_states = numpy.full(len(self.analog_objects), -1, dtype=numpy.int8)
+        self.pending_times = numpy.zeros(len(self.analog_objects), dtype=numpy.float64)
+
+    def process_task(self):
+        """Evaluate all analog objects and the binary objects waiting for a time delay."""
+        now = time.time()
+        try:
+            self.evaluate_analog(now)
+            for index in list(self.pending_binary_dict):
+                self.evaluate_binary(index, now)
+        except Exception as e:
+            _log.error("Error in AlarmEngine process_task " + str(e))
+
+    def evaluate_analog(self, now):
+        """
+        Evaluate the limits of all analog objects in one pass.
+
+        The present values, event states and IN_ALARM flags are gathered into arrays and the target states, pending
+        transitions and expired time delays are computed with array masks, so Python code runs per object only to
+        gather the values and for the objects with a transition or an overwritten event state.
+
+        Args:
+            now (float): Seconds since the epoch
+        """
+        analog_objects = self.analog_objects
+        count = len(analog_objects)
+        if count == 0:
+            return
+        high_limits, low_limits, deadbands = self.high_limits, self.low_limits, self.deadbands
+        states, pending_states, pending_times = self.analog_states, self.pending_states, self.pending_times
+
+        # Read the values directly, bypassing the property lookup
+        values = numpy.fromiter((pro_object._values['presentValue'] for pro_object in analog_objects),
+                                numpy.float64, count)
+        event_states = numpy.fromiter((self.ANALOG_CODE_DICT.get(pro_object._values['eventState'], -1)
+                                       for pro_object in analog_objects), numpy.int8, count)
+        in_alarms = numpy.fromiter((self.in_alarm(pro_object) for pro_object in analog_objects), numpy.int8, count)
+
+        # Target states, assigned from the lowest precedence up: back to normal only beyond the deadband
+        targets = numpy.zeros(count, dtype=numpy.int8)
+        targets[(states == 1) & (values >= high_limits - deadbands)] = 1
+        targets[(states == 2) & (values <= low_limits + deadbands)] = 2
+        targets[values < low_limits] = 2
+        targets[values > high_limits] = 1
+
+        stable = targets == states
+        pending_states[stable] = -1
+        # The event states overwritten from the database
+        for i in numpy.flatnonzero(stable & ((event_states != states) | (in_alarms != (states != 0)))):
+            self.set_event_state(analog_objects[i], self.ANALOG_STATES[states[i]])
+
+        started = ~stable & (pending_states != targets)
+        pending_states[started] = targets[started]
+        pending_times[started] = now
+        for i in numpy.flatnonzero(~stable & (now - pending_times >= self.analog_time_delays)):
+            state, target = int(states[i]), int(targets[i])
+            states[i] = target
+            pending_states[i] = -1
+            limit = high_limits[i] if target == 1 or (target == 0 and state == 1) else low_limits[i]
+            self.transition(analog_objects[i], self.ANALOG_STATES[state], self.ANALOG_STATES[target], now,
+                            NotificationParameters(outOfRange=NotificationParametersOutOfRange(
+                                exceedingValue=float(values[i]),
+                                statusFlags=self.status_flags(analog_objects[i], target != 0),
+                                deadband=float(deadbands[i]),
+                                exceededLimit=float(limit),
+                            )), 'outOfRange')
+
+    def evaluate_binary(self, index, now):
+        """
+        Evaluate the present value of a binary object against its alarm value.
+
+        Args:
+            index (int): Index of the binary object
+            now (float): Seconds since the epoch
+        """
+        pro_object = self.binary_objects[index]
+        value = pro_object._values['presentValue']
+        if not isinstance(value, str):
+            value = 'active' if int(value) else 'inactive'
+        state = self.binary_states[index]
+        target = 'offnormal' if value == self.alarm_values[index] else 'normal'
+
+        if target == state:
+            self.pending_binary_dict.pop(index, None)
+            if pro_object._values['eventState'] != state or \
+                    self.status_flags(pro_object)[0] != int(state != 'normal'):
+                # The event state was overwritten from the database
+                self.set_event_state(pro_object, state)
+            return
+        pending = self.pending_binary_dict.get(index, None)
+        if pending is None or pending[0] != target:
+            pending = self.pending_binary_dict[index] = (target, now)
+        if now - pending[1] >= self.binary_time_delays[index]:
+            self.binary_states[index] = target
+            del self.pending_binary_dict[index]
+            self.transition(pro_object, state, target, now,
+                            NotificationParameters(changeOfState=NotificationParametersChangeOfState(
+                                newState=PropertyStates(binaryValue=value),
+                                statusFlags=self.status_flags(pro_object, target != 'normal'),
+                            )), 'changeOfState')
+
+    @staticmethod
+    def in_alarm(pro_object):
+        """
+        Get the IN_ALARM status flag of an object without copying its status flags.
+
+        Args:
+            pro_object: BACnet object
+
+        Returns:
+            int: IN_ALARM flag
+        """
+        flags = pro_object._values['statusFlags']
+        return (flags.value if hasattr(flags, 'value') else flags)[0]
+
+    @staticmethod
+    def status_flags(pro_object, in_alarm=None):
+        """
+        Get the status flags of an object.
+
+        Args:
+            pro_object: BACnet object
+            in_alarm (bool): IN_ALARM flag to set, None to keep it
+
+        Returns:
+            list: IN_ALARM, FAULT, OVERRIDDEN and OUT_OF_SERVICE flags
+        """
+        flags = pro_object._values['statusFlags']
+        flags = list(flags.value if hasattr(flags, 'value') else flags)
+        if in_alarm is not None:
+            flags[0] = int(in_alarm)
+        return flags
+
+    def set_event_state(self, pro_object, event_state):
+        """
+        Set the event state and the IN_ALARM status flag of an object and queue it for the persistence task.
+
+        Args:
+            pro_object: BACnet object
+            event_state (str): Event state
+        """
+        pro_object.eventState = event_state
+        pro_object.statusFlags = self.status_flags(pro_object, event_state != 'normal')
+        alarm_object_dict[pro_object.objectIdentifier] = pro_object
+
+    def transition(self, pro_object, from_state, to_state, now, event_values, event_type):
+        """
+        Apply an event state transition and notify the recipients.
+
+        Args:
+            pro_object: BACnet object
+            from_state (str): Previous event state
+            to_state (str): Event state
+            now (float): Seconds since the epoch
+            event_values (NotificationParameters): Event values of the notification
+            event_type (str): Event type of the notification
+        """
+        if _debug:
+            AlarmEngine._debug("transition %r %r -> %r", pro_object.objectIdentifier, from_state, to_state)
+        self.set_event_state(pro_object, to_state)
+
+        for recipient in settings.ALARM_RECIPIENTS:
+            try:
+                request = UnconfirmedEventNotificationRequest(
+                    processIdentifier=settings.ALARM_PROCESS_IDENTIFIER,
+                    initiatingDeviceIdentifier=pro_application.localDevice.objectIdentifier,
+                    eventObjectIdentifier=pro_object.objectIdentifier,
+                    timeStamp=TimeStamp(dateTime=trend_log_date_time(now)),
+                    notificationClass=settings.ALARM_NOTIFICATION_CLASS,
+                    priority=settings.ALARM_PRIORITY_DICT[to_state if to_state == 'normal' else 'offnormal'],
+                    eventType=event_type,
+                    notifyType='alarm',
+                    ackRequired=False,
+                    fromState=from_state,
+                    toState=to_state,
+                    eventValues=event_values,
+                )
+                request.pduDestination = Address(recipient)
+                pro_application.request(request)
+            except Exception as e:
+                _log.error("Error in AlarmEngine transition " + str(e))
+
+
+########################################################################################################################
+# Virtual Points - Present Values Computed from Other Objects
+#
+# The analog, binary and multi-state value objects in VIRTUAL_POINT_DICT have their present value computed by an
+# expression over the present values of other objects, which are referenced as objectType[instance], for example
+#
+#     'analogInput[1] + analogInput[2]'
+#     'avg(analogInput[11], analogInput[12], analogInput[13])'
+#     'analogValue[100] > 25 and binaryInput[3]'
+#
+# Expressions may use numbers, arithmetic, comparison and boolean operators, conditional expressions and the functions
+# of EXPRESSION_FUNCTION_DICT. Binary values are 1 for active and 0 for inactive. The result is a real for analog
+# values, active if true for binary values and an integer for multi-state values.
+#
+# The expressions are compiled once at startup into a dependency graph. When the present value of an object changes,
+# the virtual points depending on it, directly or through other virtual points, are recomputed once each in
+# topological order. Virtual points in a dependency cycle are not computed. The computed values are saved by the
+# persistence task.
+#
+########################################################################################################################
+
+# Functions available in the expressions of the virtual points
+EXPRESSION_FUNCTION_DICT = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'sum': lambda *values: sum(values),
+    'avg': lambda *values: sum(values) / len(values),
+}
+
+# Syntax allowed in the expressions of the virtual points
+EXPRESSION_NODE_TYPES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Subscript, ast.Call,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UnaryOp, ast.USub, ast.UAdd, ast.Not,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.IfExp,
+)
+
+
+def compile_expression(expression):
+    """
+    Compile the expression of a virtual point.
+
+    Args:
+        expression (str): Expression over the present values of other objects
+
+    Returns:
+        tuple: Code object evaluating the expression with the function value(object_type, instance),
+               and the set of the object identifiers referenced
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    tree = ast.parse(expression, mode='eval')
+    dependencies = set()
+
+    class ReferenceTransformer(ast.NodeTransformer):
+        def visit_Subscript(self, node):
+            # objectType[instance] is replaced with value('objectType', instance)
+            if not isinstance(node.value, ast.Name) or node.value.id not in TREND_LOG_DATUM_DICT or \
+                    not isinstance(node.slice, ast.Constant) or type(node.slice.value) is not int:
+                raise ValueError("invalid object reference " + ast.unparse(node))
+            dependencies.add((node.value.id, node.slice.value))
+            return ast.copy_location(ast.Call(func=ast.Name(id='value', ctx=ast.Load()),
+                                              args=[ast.Constant(node.value.id), node.slice], keywords=[]), node)
+
+    # Object types may only be used in references
+    reference_names = set(id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Subscript))
+    for node in ast.walk(tree):
+        if not isinstance(node, EXPRESSION_NODE_TYPES):
+            raise ValueError("invalid syntax " + type(node).__name__)
+        if isinstance(node, ast.Call) and \
+                (not isinstance(node.func, ast.Name) or node.func.id not in EXPRESSION_FUNCTION_DICT or node.keywords):
+            raise ValueError("invalid function call " + ast.unparse(node))
+        if isinstance(node, ast.Name) and node.id not in EXPRESSION_FUNCTION_DICT and id(node) not in reference_names:
+            raise ValueError("invalid name " + node.id)
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError("invalid constant " + repr(node.value))
+
+    tree = ast.fix_missing_locations(ReferenceTransformer().visit(tree))
+    return compile(tree, '<virtual point>', 'eval'), dependencies
+
+
+@bacpypes_debugging
+class VirtualPoints(object):
+
+    def __init__(self, application, expression_dict):
+        """
+        Compile the expressions of the virtual points and build their dependency graph.
+
+        Args:
+            application: BACnet application with the objects
+            expression_dict (dict): Expressions by object identifier of the virtual points
+        """
+        if _debug:
+            VirtualPoints._debug("__init__ %r", expression_dict)
+        self.application = application
+
+        # Compiled expressions and the virtual points depending on each object
+        self.code_dict = dict()
+        dependent_dict = dict()
+        for object_identifier, expression in expression_dict.items():
+            pro_object = application.get_object_id(object_identifier)
+            if pro_object is None or object_identifier[0] not in ('analogValue', 'binaryValue', 'multiStateValue'):
+                _log.error("Error in VirtualPoints no value object " + str(object_identifier))
+                continue
+            try:
+                code, dependencies = compile_expression(expression)
+            except (SyntaxError, ValueError) as e:
+                _log.error("Error in VirtualPoints expression of " + str(object_identifier) + " " + str(e))
+                continue
+            missing = [dependency for dependency in dependencies if application.get_object_id(dependency) is None]
+            if missing:
+                _log.error("Error in VirtualPoints unknown objects " + str(missing) + " in " + str(object_identifier))
+                continue
+            self.code_dict[object_identifier] = (pro_object, code)
+            for dependency in dependencies:
+                dependent_dict.setdefault(dependency, set()).add(object_identifier)
+
+        # Topological order of the virtual points, the ones in a dependency cycle are left out
+        in_degree_dict = dict.fromkeys(self.code_dict, 0)
+        for dependency, dependents in dependent_dict.items():
+            if dependency in self.code_dict:
+                for dependent in dependents:
+                    in_degree_dict[dependent] += 1
+        ready = [object_identifier for object_identifier, in_degree in in_degree_dict.items() if in_degree == 0]
+        self.order_dict = dict()
+        while ready:
+            object_identifier = ready.pop()
+            self.order_dict[object_identifier] = len(self.order_dict)
+            for dependent in dependent_dict.get(object_identifier, ()):
+                in_degree_dict[dependent] -= 1
+                if in_degree_dict[dependent] == 0:
+                    ready.append(dependent)
+        for object_identifier in self.code_dict:
+            if object_identifier not in self.order_dict:
+                _log.error("Error in VirtualPoints dependency cycle " + str(object_identifier))
+
+        # The virtual points to recompute when an object changes, in topological order
+        self.affected_dict = dict()
+        for dependency in dependent_dict:
+            affected = set()
+            pending = [dependency]
+            while pending:
+                for dependent in dependent_dict.get(pending.pop(), ()):
+                    if dependent in self.order_dict and dependent not in affected:
+                        affected.add(dependent)
+                        pending.append(dependent)
+            if affected:
+                self.affected_dict[dependency] = sorted(affected, key=self.order_dict.get)
+
+        # Recompute on the changes of the objects, the changes of the virtual points are propagated by the source
+        self.computing = False
+        for dependency in self.affected_dict:
+            application.get_object_id(dependency)._property_monitors['presentValue'].append(
+                lambda old_value, new_value, dependency=dependency: self.changed(dependency, old_value, new_value))
+
+        # Compute all virtual points once
+        self.compute(sorted(self.order_dict, key=self.order_dict.get))
+
+    def changed(self, object_identifier, old_value, new_value):
+        """
+        Recompute the virtual points affected by a changed present value.
+
+        Args:
+            object_identifier (tuple): Object identifier of the changed object
+            old_value: Previous present value
+            new_value: Present value
+        """
+        if self.computing or new_value == old_value:
+            return
+        self.compute(self.affected_dict[object_identifier])
+
+    def value(self, object_type, instance):
+        """
+        Get the present value of an object referenced by an expression.
+
+        Args:
+            object_type (str): BACnet object type
+            instance (int): Instance number of the object
+
+        Returns:
+            Present value, 1 or 0 for binary values
+        """
+        value = self.application.get_object_id((object_type, instance))._values['presentValue']
+        if isinstance(value, str):
+            return 1 if value == 'active' else 0
+        if hasattr(value, 'get_long'):
+            return value.get_long()
+        return value
+
+    def compute(self, object_identifiers):
+        """
+        Compute virtual points in order and queue the changed ones for the persistence task.
+
+        Args:
+            object_identifiers (list): Object identifiers of the virtual points in topological order
+        """
+        namespace = dict(EXPRESSION_FUNCTION_DICT, value=self.value, __builtins__={})
+        self.computing = True
+        try:
+            for object_identifier in object_identifiers:
+                pro_object, code = self.code_dict[object_identifier]
+                try:
+                    result = eval(code, namespace)
+                    if object_identifier[0] == 'analogValue':
+                        result = float(result)
+                    elif object_identifier[0] == 'binaryValue':
+                        result = 'active' if result else 'inactive'
+                    else:
+                        result = int(result)
+                except Exception as e:
+                    _log.error("Error in VirtualPoints compute " + str(object_identifier) + " " + str(e))
+                    continue
+                if result != pro_object._values['presentValue']:
+                    pro_object.presentValue = result
+                    persistence_object_dict[object_identifier] = pro_object
+        finally:
+            self.computing = False
+
+
+########################################################################################################################
+# Snapshot Export - Columnar File of the Present Values of All Objects
+#
+# Every SNAPSHOT_INTERVAL seconds the present values of all objects are written to SNAPSHOT_PATH in a columnar layout,
+# to a temporary file first which is then renamed over the snapshot, so readers always map a complete snapshot:
+#
+# - header (24 bytes): magic b'XBSN', version 1 (unsigned short), 0 (unsigned short), number of objects n
+#   (unsigned int), snapshot time in seconds since the epoch (double), 4 padding bytes
+# - n doubles: time of the last change of the present value in seconds since the epoch, 0 if not changed since start
+# - n doubles: present value, binary values are 1 for active and 0 for inactive
+# - n unsigned ints: instance number
+# - n unsigned shorts: BACnet object type number
+# - n unsigned chars: status flags, bit 0 IN_ALARM, bit 1 FAULT, bit 2 OVERRIDDEN, bit 3 OUT_OF_SERVICE
+#
+# All values are little-endian and every column is aligned to its item size, so a reader can map each column as an
+# array, for example with numpy.frombuffer(data, '<f8', n, 24) for the change times.
+#
+########################################################################################################################
+@bacpypes_debugging
+class SnapshotExport(RecurringTask):
+
+    header = struct.Struct('<4sHHId4x')
+
+    def __init__(self, interval, path, objects):
+        """
+        Initialize the snapshot export task and start tracking the changes of the present values.
+
+        Args:
+            interval (float): Interval in seconds between snapshots
+            path (str): Path of the snapshot file
+            objects (list): BACnet objects in the snapshot
+        """
+        if _debug:
+            SnapshotExport._debug("__init__ %r %r", interval, path)
+        RecurringTask.__init__(self, interval * 1000)  # Convert seconds to milliseconds
+        self.path = path
+        self.objects = list(objects)
+
+        # The identifier columns do not change, they are packed once
+        self.instances = array('I', [pro_object.objectIdentifier[1] for pro_object in self.objects])
+        self.object_types = array('H', [ObjectType.enumerations[pro_object.objectType]
+                                        for pro_object in self.objects])
+
+        # Time of the last change of each present value
+        self.change_times = array('d', [0.0] * len(self.objects))
+        for index, pro_object in enumerate(self.objects):
+            pro_object._property_monitors['presentValue'].append(
+                lambda old_value, new_value, index=index: self.changed(index, old_value, new_value))
+
+    def changed(self, index, old_value, new_value):
+        """
+        Record the time of a change of a present value.
+
+        Args:
+            index (int): Index of the object
+            old_value: Previous present value
+            new_value: Present value
+        """
+        if new_value != old_value:
+            self.change_times[index] = time.time()
+
+    def process_task(self):
+        """Write a snapshot of the present values of all objects."""
+        if _debug:
+            SnapshotExport._debug("process_task")
+        try:
+            present_values = array('d')
+            status_flags = bytearray()
+            for pro_object in self.objects:
+                present_values.append(ProTrendLogObject.log_value(pro_object._values['presentValue']))
+                status_flags.append(self.status_flags_mask(pro_object))
+
+            temporary_path = self.path + '.tmp'
+            with open(temporary_path, 'wb') as file:
+                file.write(self.header.pack(b'XBSN', 1, 0, len(self.objects), time.time()))
+                file.write(self.change_times.tobytes())
+                file.write(present_values.tobytes())
+                file.write(self.instances.tobytes())
+                file.write(self.object_types.tobytes())
+                file.write(status_flags)
+            os.replace(temporary_path, self.path)
+        except Exception as e:
+            _log.error("Error in SnapshotExport process_task " + str(e))
+
+    @staticmethod
+    def status_flags_mask(pro_object):
+        """
+        Get the status flags of an object as a bit mask.
+
+        Args:
+            pro_object: BACnet object
+
+        Returns:
+            int: Bit 0 IN_ALARM, bit 1 FAULT, bit 2 OVERRIDDEN, bit 3 OUT_OF_SERVICE
+        """
+        flags = AlarmEngine.status_flags(pro_object)
+        return int(flags[0]) | int(flags[1]) << 1 | int(flags[2]) << 2 | int(flags[3]) << 3
+
+
+########################################################################################################################
+# Live State - Present Values of All Objects in Shared Memory
+#
+# The state of every object is published to a memory-mapped file at LIVE_STATE_PATH (on /dev/shm by default) as soon
+# as it changes, so that the workers of xbacnet-api can read it without querying the database. The file is created
+# under a temporary name and renamed into place at startup, a restarted server replaces it with a new file:
+#
+# - header (24 bytes): magic b'XBLS', version 1 (unsigned short), slot size (unsigned short), number of objects
+#   (unsigned int), start time of the server in nanoseconds since the epoch (unsigned long long), 4 padding bytes
+# - one 40 byte slot per object: sequence (unsigned long long), present value (double), time of the last change in
+#   seconds since the epoch (double), database id (unsigned int), instance number (unsigned int), BACnet object type
+#   number (unsigned short), status flags (unsigned char, bits as in the snapshot export), event state number
+#   (unsigned char), 4 padding bytes
+#
+# Each slot is a sequence lock: the server makes the sequence odd before it writes the slot and even again afterwards.
+# A reader copies the slot and uses it only if the sequence is even and has not changed while it was copied.
+#
+########################################################################################################################
+@bacpypes_debugging
+class LiveState(object):
+
+    header = struct.Struct('<4sHHIQ4x')
+    slot = struct.Struct('<QddIIHBB4x')
+    sequence = struct.Struct('<Q')
+
+    def __init__(self, path, objects, database_id_dict):
+        """
+        Create the live state file and publish the state of the objects on their changes.
+
+        Args:
+            path (str): Path of the live state file
+            objects (list): BACnet objects to publish
+            database_id_dict (dict): Database ids by BACnet object identifier
+        """
+        if _debug:
+            LiveState._debug("__init__ %r", path)
+        self.objects = list(objects)
+        self.database_ids = array('I', [database_id_dict.get(pro_object.objectIdentifier, 0)
+                                        for pro_object in self.objects])
+        self.sequences = array('Q', [0] * len(self.objects))
+        self.change_times = array('d', [0.0] * len(self.objects))
+
+        size = self.header.size + self.slot.size * len(self.objects)
+        temporary_path = path + '.tmp'
+        self.file = open(temporary_path, 'w+b')
+        self.file.truncate(size)
+        self.data = mmap.mmap(self.file.fileno(), size)
+        self.header.pack_into(self.data, 0, b'XBLS', 1, self.slot.size, len(self.objects), time.time_ns())
+        for index, pro_object in enumerate(self.objects):
+            self.publish(index)
+            for property_identifier in ('presentValue', 'statusFlags', 'eventState'):
+                pro_object._property_monitors[property_identifier].append(
+                    lambda old_value, new_value, index=index, property_identifier=property_identifier:
+                    self.changed(index, property_identifier, old_value, new_value))
+        os.replace(temporary_path, path)
+
+    def changed(self, index, property_identifier, old_value, new_value):
+        """
+        Publish the state of an object on a change of a property.
+
+        Args:
+            index (int): Index of the object
+            property_identifier (str): Identifier of the changed property
+            old_value: Previous value of the property
+            new_value: Value of the property
+        """
+        if new_value == old_value:
+            return
+        if property_identifier == 'presentValue':
+            self.change_times[index] = time.time()
+        self.publish(index)
+
+    def publish(self, index):
+        """
+        Write the state of an object to its slot.
+
+        Args:
+            index (int): Index of the object
+        """
+        try:
+            pro_object = self.objects[index]
+            offset = self.header.size + self.slot.size * index
+            sequence = self.sequences[index] + 1
+            present_value = ProTrendLogObject.log_value(pro_object._values['presentValue'])
+            event_state = pro_object._values['eventState']
+            event_state = EventState.enumerations.get(str(event_state), 0) if event_state is not None else 0
+
+            # An odd sequence marks the slot as being written
+            self.sequence.pack_into(self.data, offset, sequence)
+            self.slot.pack_into(self.data, offset, sequence, present_value, self.change_times[index],
+                                self.database_ids[index], pro_object.objectIdentifier[1],
+                                ObjectType.enumerations[pro_object.objectType],
+                                SnapshotExport.status_flags_mask(pro_object), event_state)
+            self.sequence.pack_into(self.data, offset, sequence + 1)
+            self.sequences[index] = sequence + 1
+        except Exception as e:
+            _log.error("Error in LiveState publish " + str(e))
+
+    def close(self):
+        """Unmap and close the live state file."""
+        self.data.close()
+        self.file.close()
+
+
+########################################################################################################################
+# Ingest Filter - Drops Insignificant Telemetry
+#
+# An ingested value is applied only when it is a significant change of the present value of the object:
+#
+# - deadband: absolute change of an analog value, the covIncrement of the object by default
+# - deadband_percent: change of an analog value in percent of the present value, the larger deadband applies
+# - minimum_interval: seconds after an applied value within which the next values are dropped
+# - maximum_silence: seconds after which a value is applied even if it did not change, so the object is saved as alive
+#
+# Binary and multi-state values are significant whenever they differ from the present value. The parameters are read
+# from INGEST_FILTER_DICT, keyed by object identifier such as ('analogInput', 1) or by object type, the object
+# identifier taking precedence.
+#
+########################################################################################################################
+@bacpypes_debugging
+class IngestFilter:
+
+    def __init__(self, filter_dict):
+        """
+        Initialize the ingest filter.
+
+        Args:
+            filter_dict (dict): Filter parameters by object identifier or object type
+        """
         if _debug:
-            Refreshing._debug("before refresh object list: " + str(object_list))
+            IngestFilter._debug("__init__ %r", filter_dict)
+        self.filter_dict = filter_dict
 
-        ################################################################################################################
-        # STEP 1: Check database connectivity
-        ################################################################################################################
-        # Verify database connection is still active, reconnect if needed
-        if not self.cursor or not self.cnx.is_connected():
-            try:
-                # Reconnect to database
-                self.cnx = mysql.connector.connect(**settings.xbacnet)
-                self.cursor = self.cnx.cursor(dictionary=True)
-            except Exception as e:
-                _log.error("Error in ReadablePropertiesRefreshing process_task " + str(e))
-                # Clean up connections on error
-                if self.cursor:
-                    self.cursor.close()
-                if self.cnx:
-                    self.cnx.close()
+        # Monotonic time of the last applied value by object identifier
+        self.applied_time_dict = dict()
 
-        ################################################################################################################
-        # STEP 2: Read objects from database
-        ################################################################################################################
-        # Initialize dictionaries to store object properties from database
-        analog_input_object_dict = dict()      # Analog input objects
-        analog_output_object_dict = dict()     # Analog output objects
-        analog_value_object_dict = dict()      # Analog value objects
-        binary_input_object_dict = dict()      # Binary input objects
-        binary_output_object_dict = dict()     # Binary output objects
-        binary_value_object_dict = dict()      # Binary value objects
-        multi_state_input_object_dict = dict() # Multi-state input objects
-        multi_state_output_object_dict = dict() # Multi-state output objects
-        multi_state_value_object_dict = dict() # Multi-state value objects
+    def accept(self, pro_object, value, now=None):
+        """
+        Check whether a value is a significant change of the present value of an object.
 
-        # Step 2.1: Read analog input objects from database
-        # TODO: Add recovery mechanism for database server availability after system reboot
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, cov_increment "
-                 " FROM tbl_analog_input_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+        Args:
+            pro_object: BACnet object
+            value: Converted value to apply
+            now (float): Monotonic time of the value, the current time by default
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_input_object_dict[result['object_identifier']] = result
+        Returns:
+            bool: True if the value should be applied, and then it is recorded as applied
+        """
+        if now is None:
+            now = time.monotonic()
+        object_identifier = pro_object.objectIdentifier
+        parameters = self.filter_dict.get(object_identifier, self.filter_dict.get(object_identifier[0], {}))
+
+        applied_time = self.applied_time_dict.get(object_identifier, None)
+        if applied_time is not None:
+            elapsed = now - applied_time
+            maximum_silence = parameters.get('maximum_silence', None)
+            if maximum_silence is None or elapsed < maximum_silence:
+                if elapsed < parameters.get('minimum_interval', 0.0):
+                    return False
+                if not self.significant(pro_object, value, parameters):
+                    return False
+
+        self.applied_time_dict[object_identifier] = now
+        return True
+
+    def significant(self, pro_object, value, parameters):
+        """
+        Check whether a value differs enough from the present value of an object.
 
-        if _debug:
-            _log.debug(str(analog_input_object_dict))
+        Args:
+            pro_object: BACnet object
+            value: Converted value to apply
+            parameters (dict): Filter parameters of the object
 
-        # step 2.2
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, relinquish_default, current_command_priority, cov_increment "
-                 " FROM tbl_analog_output_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+        Returns:
+            bool: True if the change is significant
+        """
+        present_value = pro_object.presentValue
+        if pro_object.objectType not in ('analogInput', 'analogValue') or present_value is None:
+            return value != present_value
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_output_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(analog_output_object_dict))
+        deadband = parameters.get('deadband', None)
+        if deadband is None:
+            deadband = getattr(pro_object, 'covIncrement', None) or 0.0
+        deadband_percent = parameters.get('deadband_percent', None)
+        if deadband_percent is not None:
+            deadband = max(deadband, abs(present_value) * deadband_percent / 100.0)
 
-        # step 2.3
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, cov_increment "
-                 " FROM tbl_analog_value_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+        change = abs(value - present_value)
+        return change > 0.0 and change >= deadband
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_value_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(analog_value_object_dict))
 
-        # step 2.4
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, polarity "
-                 " FROM tbl_binary_input_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+########################################################################################################################
+# Ingest Listener - Applies Telemetry Pushed by Field Gateways
+#
+# Field gateways push the present values of input and value objects in UDP datagrams to INGEST_ADDRESS. The values are
+# applied to the objects on the core loop of the application, which gives the COV notifications, and the objects are
+# queued for the persistence task, so no database round trip is made per value. A datagram is either
+#
+# - a binary frame: the magic b'XB', a version byte 1 and the number of records as little-endian unsigned short,
+#   followed by the records of object type number (unsigned char), instance (unsigned int) and value (double)
+# - lines of text: object type, instance and value separated by spaces, for example 'analogInput 10001 21.5'
+#
+# Binary values are 0 or 1 ('inactive' or 'active' in lines), multi-state values are the state numbers.
+# Values of unknown objects, or of object types not in INGEST_OBJECT_TYPE_DICT, and values that are not finite numbers
+# are counted and dropped. Values that are not significant changes are dropped by the ingest filter, and values of
+# objects out of service are left to the operator.
+#
+########################################################################################################################
+@bacpypes_debugging
+class IngestListener(asyncore.dispatcher):
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['polarity'] = row['polarity']
-                binary_input_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(binary_input_object_dict))
+    # Binary frame header and record layouts
+    frame_header = struct.Struct('<2sBH')
+    frame_record = struct.Struct('<BId')
 
-        # step 2.5
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, polarity, relinquish_default, current_command_priority  "
-                 " FROM tbl_binary_output_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+    def __init__(self, address):
+        """
+        Initialize the ingest socket.
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['polarity'] = row['polarity']
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                binary_output_object_dict[result['object_identifier']] = result
+        Args:
+            address (tuple): Host and port to receive the telemetry on
+        """
         if _debug:
-            _log.debug(str(binary_output_object_dict))
+            IngestListener._debug("__init__ %r", address)
+        asyncore.dispatcher.__init__(self)
 
-        # step 2.6
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service "
-                 " FROM tbl_binary_value_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+        # Number of applied, dropped and filtered values since the start
+        self.applied_count = 0
+        self.dropped_count = 0
+        self.filtered_count = 0
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                binary_value_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(binary_value_object_dict))
+        self.filter = IngestFilter(settings.INGEST_FILTER_DICT)
 
-        # step 2.7
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text "
-                 " FROM tbl_multi_state_input_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+        self.create_socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.bind(address)
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                multi_state_input_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(multi_state_input_object_dict))
+    def readable(self):
+        return True
 
-        # step 2.8
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text, relinquish_default, current_command_priority "
-                 " FROM tbl_multi_state_output_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+    def writable(self):
+        return False
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                multi_state_output_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(multi_state_output_object_dict))
+    def handle_read(self):
+        """Read the pending datagrams and apply their values."""
+        while True:
+            try:
+                data = self.socket.recv(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                _log.error("Error in IngestListener handle_read " + str(e))
+                break
+
+            if data[:2] == b'XB':
+                self.read_frame(data)
+            else:
+                self.read_lines(data)
 
-        # step 2.9
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text "
-                 " FROM tbl_multi_state_value_objects ")
-        self.cursor.execute(query)
-        rows_objects = self.cursor.fetchall()
+    def read_frame(self, data):
+        """
+        Apply the values of a binary frame.
 
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                multi_state_value_object_dict[result['object_identifier']] = result
-        if _debug:
-            _log.debug(str(multi_state_value_object_dict))
+        Args:
+            data (bytes): Datagram
+        """
+        try:
+            magic, version, count = self.frame_header.unpack_from(data)
+        except struct.error:
+            self.dropped_count += 1
+            return
+        body = memoryview(data)[self.frame_header.size:]
+        if version != 1 or len(body) != count * self.frame_record.size:
+            _log.error("Error in IngestListener invalid frame")
+            self.dropped_count += count
+            return
+
+        for object_type_number, instance, value in self.frame_record.iter_unpack(body):
+            self.apply(INGEST_OBJECT_TYPE_DICT.get(object_type_number, None), instance, value)
+
+    def read_lines(self, data):
+        """
+        Apply the values of lines of text.
 
-        ################################################################################################################
-        # STEP 3: Update properties of objects
-        ################################################################################################################
-        for i in range(len(object_list)):
+        Args:
+            data (bytes): Datagram
+        """
+        for line in data.decode('utf-8', 'replace').splitlines():
+            fields = line.split()
+            if len(fields) == 0:
+                continue
+            if len(fields) != 3 or not fields[1].isdigit():
+                self.dropped_count += 1
+                continue
+            self.apply(fields[0], int(fields[1]), fields[2])
+
+    def apply(self, object_type, instance, value):
+        """
+        Apply a present value to an object and queue the object for the persistence task.
 
-            if object_list[i].objectType == 'analogInput':
-                # step 3.1
-                result = analog_input_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                      int(result['status_flags'][1]),
-                                                      int(result['status_flags'][2]),
-                                                      int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].units = result['units']
-                    object_list[i].covIncrement = result['cov_increment']
-            elif object_list[i].objectType == 'analogOutput':
-                # step 3.2
-                result = analog_output_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    # NOTE: DO NOT REFRESH PRESENT VALUE OF ANALOG OUTPUT OBJECT
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].units = result['units']
-                    object_list[i].relinquishDefault = result['relinquish_default']
-                    # object_list[i].currentCommandPriority = result['current_command_priority']
-                    object_list[i].covIncrement = result['cov_increment']
-            elif object_list[i].objectType == 'analogValue':
-                # step 3.3
-                result = analog_value_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].units = result['units']
-                    object_list[i].covIncrement = result['cov_increment']
-            elif object_list[i].objectType == 'binaryInput':
-                # step 3.4
-                result = binary_input_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].polarity = result['polarity']
-            elif object_list[i].objectType == 'binaryOutput':
-                # step 3.5
-                result = binary_output_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    # NOTE: DO NOT REFRESH PRESENT VALUE OF BINARY OUTPUT OBJECT
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].polarity = result['polarity']
-                    object_list[i].relinquishDefault = result['relinquish_default']
-                    # object_list[i].currentCommandPriority = result['current_command_priority']
-            elif object_list[i].objectType == 'binaryValue':
-                # step 3.6
-                result = binary_value_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-            elif object_list[i].objectType == 'multiStateInput':
-                # step 3.7
-                result = multi_state_input_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].numberOfStates = result['number_of_states']
-                    object_list[i].stateText = result['state_text']
-            elif object_list[i].objectType == 'multiStateOutput':
-                # step 3.8
-                result = multi_state_output_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    # NOTE: DO NOT REFRESH PRESENT VALUE OF MULTI STATE OUTPUT OBJECT
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].numberOfStates = result['number_of_states']
-                    object_list[i].stateText = result['state_text']
-                    object_list[i].relinquishDefault = result['relinquish_default']
-                    # object_list[i].currentCommandPriority = result['current_command_priority']
-            elif object_list[i].objectType == 'multiStateValue':
-                # step 3.9
-                result = multi_state_value_object_dict.get(object_list[i].objectIdentifier[1], None)
-                if result is not None:
-                    object_list[i].objectName = result['object_name']
-                    object_list[i].presentValue = result['present_value']
-                    object_list[i].description = result['description']
-                    object_list[i].statusFlags = [int(result['status_flags'][0]),
-                                                  int(result['status_flags'][1]),
-                                                  int(result['status_flags'][2]),
-                                                  int(result['status_flags'][3])]
-                    object_list[i].eventState = result['event_state']
-                    object_list[i].outOfService = result['out_of_service']
-                    object_list[i].numberOfStates = result['number_of_states']
-                    object_list[i].stateText = result['state_text']
+        Args:
+            object_type (str): BACnet object type
+            instance (int): Instance number of the object
+            value: Value from the datagram
+
+        Returns:
+            bool: True if the value was applied
+        """
+        if object_type not in INGEST_TABLE_DICT:
+            self.dropped_count += 1
+            return False
+        pro_object = pro_application.get_object_id((object_type, instance))
+        if pro_object is None:
+            self.dropped_count += 1
+            return False
+        if pro_object.outOfService:
+            # The present value of an object out of service is set by the operator
+            self.filtered_count += 1
+            return False
+
+        try:
+            if value not in ('active', 'inactive') and not math.isfinite(float(value)):
+                raise ValueError("not a finite number")
+            if object_type in ('binaryInput', 'binaryValue'):
+                if value not in ('active', 'inactive'):
+                    value = 'active' if float(value) else 'inactive'
+            elif object_type in ('multiStateInput', 'multiStateValue'):
+                value = int(float(value))
             else:
-                pass
+                value = float(value)
+            if not self.filter.accept(pro_object, value):
+                self.filtered_count += 1
+                return False
+            pro_object.presentValue = value
+        except Exception as e:
+            if _debug:
+                IngestListener._debug("    - invalid value %r %r: %r", pro_object.objectIdentifier, value, e)
+            self.dropped_count += 1
+            return False
 
-        if _debug:
-            Refreshing._debug("after refresh object list: " + str(object_list))
+        persistence_object_dict[pro_object.objectIdentifier] = pro_object
+        self.applied_count += 1
+        return True
 
-        if self.cursor:
-            self.cursor.close()
-        if self.cnx:
-            self.cnx.close()
+    def handle_error(self):
+        # Keep the socket open, the default closes it
+        _log.exception("Error in IngestListener handle_error")
 
 
 ########################################################################################################################
@@ -760,6 +3134,302 @@ class Refreshing(RecurringTask):
 # STEP5: Run the application
 ########################################################################################################################
 
+def load_objects(cursor, object_list_dict):
+    """
+    Load the objects of all types from the database.
+
+    The objects are appended to the lists of their types as they are loaded, so that the objects loaded before a
+    database error are kept.
+
+    Args:
+        cursor: dictionary cursor of the database connection
+        object_list_dict (dict): lists of the object data keyed by BACnet object type
+    """
+    analog_input_object_list = object_list_dict['analogInput']
+    analog_output_object_list = object_list_dict['analogOutput']
+    analog_value_object_list = object_list_dict['analogValue']
+    binary_input_object_list = object_list_dict['binaryInput']
+    binary_output_object_list = object_list_dict['binaryOutput']
+    binary_value_object_list = object_list_dict['binaryValue']
+    multi_state_input_object_list = object_list_dict['multiStateInput']
+    multi_state_output_object_list = object_list_dict['multiStateOutput']
+    multi_state_value_object_list = object_list_dict['multiStateValue']
+
+    # Step 2.1: Query analog input objects from database
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, units, cov_increment "
+             " FROM tbl_analog_input_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    # Process analog input objects if any exist
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+
+            # Create dictionary with object properties
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = float(row['present_value'])
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['units'] = row['units']
+            result['cov_increment'] = float(row['cov_increment'])
+            analog_input_object_list.append(result)
+    if _debug:
+        _log.debug(str(analog_input_object_list))
+
+    # Step 2.2: Query analog output objects from database
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, units, relinquish_default, priority_array, cov_increment "
+             " FROM tbl_analog_output_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    # Process analog output objects if any exist
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+
+            # Create dictionary with object properties
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = float(row['present_value'])
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['units'] = row['units']
+            result['relinquish_default'] = float(row['relinquish_default'])
+            result['priority_array'] = bytes(row['priority_array']) if row['priority_array'] else None
+            result['cov_increment'] = float(row['cov_increment'])
+            analog_output_object_list.append(result)
+    if _debug:
+        _log.debug(str(analog_output_object_list))
+
+    # step 2.3
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, units, cov_increment "
+             " FROM tbl_analog_value_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = float(row['present_value'])
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['units'] = row['units']
+            result['cov_increment'] = float(row['cov_increment'])
+            analog_value_object_list.append(result)
+    if _debug:
+        _log.debug(str(analog_value_object_list))
+
+    # step 2.4
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, polarity "
+             " FROM tbl_binary_input_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['polarity'] = row['polarity']
+            binary_input_object_list.append(result)
+    if _debug:
+        _log.debug(str(binary_input_object_list))
+
+    # step 2.5
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, polarity, relinquish_default, priority_array "
+             " FROM tbl_binary_output_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['polarity'] = row['polarity']
+            result['relinquish_default'] = row['relinquish_default']
+            result['priority_array'] = bytes(row['priority_array']) if row['priority_array'] else None
+            binary_output_object_list.append(result)
+    if _debug:
+        _log.debug(str(binary_output_object_list))
+
+    # step 2.6
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service "
+             " FROM tbl_binary_value_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            binary_value_object_list.append(result)
+    if _debug:
+        _log.debug(str(binary_value_object_list))
+
+    # step 2.7
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, number_of_states, state_text "
+             " FROM tbl_multi_state_input_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['number_of_states'] = row['number_of_states']
+            if (row['state_text'] is not None and
+                    isinstance(row['state_text'], str) and
+                    len(row['state_text']) > 0):
+                result['state_text'] = str(row['state_text']).split(";")
+            else:
+                result['state_text'] = None
+            multi_state_input_object_list.append(result)
+    if _debug:
+        _log.debug(str(multi_state_input_object_list))
+
+    # step 2.8
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, number_of_states, state_text, relinquish_default, priority_array "
+             " FROM tbl_multi_state_output_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['number_of_states'] = row['number_of_states']
+            if (row['state_text'] is not None and
+                    isinstance(row['state_text'], str) and
+                    len(row['state_text']) > 0):
+                result['state_text'] = str(row['state_text']).split(";")
+            else:
+                result['state_text'] = None
+            result['relinquish_default'] = row['relinquish_default']
+            result['priority_array'] = bytes(row['priority_array']) if row['priority_array'] else None
+            multi_state_output_object_list.append(result)
+    if _debug:
+        _log.debug(str(multi_state_output_object_list))
+
+    # step 2.9
+    query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
+             "        out_of_service, number_of_states, state_text "
+             " FROM tbl_multi_state_value_objects ")
+    cursor.execute(query)
+    rows_objects = cursor.fetchall()
+
+    if rows_objects is not None and len(rows_objects) > 0:
+        for row in rows_objects:
+            if _debug:
+                _log.debug(str(row))
+            result = dict()
+            result['id'] = row['id']
+            result['object_identifier'] = int(row['object_identifier'])
+            result['object_name'] = row['object_name']
+            result['present_value'] = row['present_value']
+            result['description'] = row['description']
+            result['status_flags'] = row['status_flags']
+            result['event_state'] = row['event_state']
+            result['out_of_service'] = bool(row['out_of_service'])
+            result['number_of_states'] = row['number_of_states']
+            if (row['state_text'] is not None and
+                    isinstance(row['state_text'], str) and
+                    len(row['state_text']) > 0):
+                result['state_text'] = str(row['state_text']).split(";")
+            else:
+                result['state_text'] = None
+            multi_state_value_object_list.append(result)
+    if _debug:
+        _log.debug(str(multi_state_value_object_list))
+
+
+def get_database_id_dict(object_list_dict):
+    """
+    Get the database ids of the objects, which identify them in the live state.
+
+    Args:
+        object_list_dict (dict): lists of the object data keyed by BACnet object type
+
+    Returns:
+        dict: database ids keyed by BACnet object identifier
+    """
+    database_id_dict = dict()
+    for object_type, result_list in object_list_dict.items():
+        for result in result_list:
+            database_id_dict[(object_type, result['object_identifier'])] = result['id']
+    return database_id_dict
+
+
 def main():
     """
     Main function that initializes and runs the BACnet server.
@@ -774,7 +3444,7 @@ def main():
     ####################################################################################################################
     # STEP1: Create the device and application
     ####################################################################################################################
-    global pro_application, object_list
+    global pro_application, object_list, persistence
 
     # Create command line argument parser
     parser = ConfigArgumentParser(description=__doc__)
@@ -798,16 +3468,20 @@ def main():
     ####################################################################################################################
     # STEP2: Get all objects from database
     ####################################################################################################################
-    # Initialize lists to store object data from database
-    analog_input_object_list = list()      # Analog input objects
-    analog_output_object_list = list()     # Analog output objects
-    analog_value_object_list = list()      # Analog value objects
-    binary_input_object_list = list()      # Binary input objects
-    binary_output_object_list = list()     # Binary output objects
-    binary_value_object_list = list()      # Binary value objects
-    multi_state_input_object_list = list() # Multi-state input objects
-    multi_state_output_object_list = list() # Multi-state output objects
-    multi_state_value_object_list = list() # Multi-state value objects
+    # Initialize lists to store object data from database, keyed by BACnet object type
+    object_list_dict = {object_type: list() for object_type in ('analogInput', 'analogOutput', 'analogValue',
+                                                                 'binaryInput', 'binaryOutput', 'binaryValue',
+                                                                 'multiStateInput', 'multiStateOutput',
+                                                                 'multiStateValue')}
+    analog_input_object_list = object_list_dict['analogInput']
+    analog_output_object_list = object_list_dict['analogOutput']
+    analog_value_object_list = object_list_dict['analogValue']
+    binary_input_object_list = object_list_dict['binaryInput']
+    binary_output_object_list = object_list_dict['binaryOutput']
+    binary_value_object_list = object_list_dict['binaryValue']
+    multi_state_input_object_list = object_list_dict['multiStateInput']
+    multi_state_output_object_list = object_list_dict['multiStateOutput']
+    multi_state_value_object_list = object_list_dict['multiStateValue']
 
     # Initialize database connection variables
     cursor = None
@@ -816,261 +3490,7 @@ def main():
         # Connect to MySQL database
         cnx = mysql.connector.connect(**settings.xbacnet)
         cursor = cnx.cursor(dictionary=True)  # Use dictionary cursor for named columns
-        # Step 2.1: Query analog input objects from database
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, cov_increment "
-                 " FROM tbl_analog_input_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        # Process analog input objects if any exist
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-
-                # Create dictionary with object properties
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_input_object_list.append(result)
-        if _debug:
-            _log.debug(str(analog_input_object_list))
-
-        # Step 2.2: Query analog output objects from database
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, relinquish_default, current_command_priority, cov_increment "
-                 " FROM tbl_analog_output_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        # Process analog output objects if any exist
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-
-                # Create dictionary with object properties
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_output_object_list.append(result)
-        if _debug:
-            _log.debug(str(analog_output_object_list))
-
-        # step 2.3
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, units, cov_increment "
-                 " FROM tbl_analog_value_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = float(row['present_value'])
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['units'] = row['units']
-                result['cov_increment'] = float(row['cov_increment'])
-                analog_value_object_list.append(result)
-        if _debug:
-            _log.debug(str(analog_value_object_list))
-
-        # step 2.4
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, polarity "
-                 " FROM tbl_binary_input_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['polarity'] = row['polarity']
-                binary_input_object_list.append(result)
-        if _debug:
-            _log.debug(str(binary_input_object_list))
-
-        # step 2.5
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, polarity, relinquish_default, current_command_priority  "
-                 " FROM tbl_binary_output_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['polarity'] = row['polarity']
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                binary_output_object_list.append(result)
-        if _debug:
-            _log.debug(str(binary_output_object_list))
-
-        # step 2.6
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service "
-                 " FROM tbl_binary_value_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                binary_value_object_list.append(result)
-        if _debug:
-            _log.debug(str(binary_value_object_list))
-
-        # step 2.7
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text "
-                 " FROM tbl_multi_state_input_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                multi_state_input_object_list.append(result)
-        if _debug:
-            _log.debug(str(multi_state_input_object_list))
-
-        # step 2.8
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text, relinquish_default, current_command_priority "
-                 " FROM tbl_multi_state_output_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                result['relinquish_default'] = row['relinquish_default']
-                result['current_command_priority'] = row['current_command_priority']
-                multi_state_output_object_list.append(result)
-        if _debug:
-            _log.debug(str(multi_state_output_object_list))
-
-        # step 2.9
-        query = (" SELECT id, object_identifier, object_name, present_value, description, status_flags, event_state, "
-                 "        out_of_service, number_of_states, state_text "
-                 " FROM tbl_multi_state_value_objects ")
-        cursor.execute(query)
-        rows_objects = cursor.fetchall()
-
-        if rows_objects is not None and len(rows_objects) > 0:
-            for row in rows_objects:
-                if _debug:
-                    _log.debug(str(row))
-                result = dict()
-                result['id'] = row['id']
-                result['object_identifier'] = int(row['object_identifier'])
-                result['object_name'] = row['object_name']
-                result['present_value'] = row['present_value']
-                result['description'] = row['description']
-                result['status_flags'] = row['status_flags']
-                result['event_state'] = row['event_state']
-                result['out_of_service'] = bool(row['out_of_service'])
-                result['number_of_states'] = row['number_of_states']
-                if (row['state_text'] is not None and
-                        isinstance(row['state_text'], str) and
-                        len(row['state_text']) > 0):
-                    result['state_text'] = str(row['state_text']).split(";")
-                else:
-                    result['state_text'] = None
-                multi_state_value_object_list.append(result)
-        if _debug:
-            _log.debug(str(multi_state_value_object_list))
+        load_objects(cursor, object_list_dict)
     except Exception as e:
         # Handle database connection errors
         _log.error("Error in  main procedure " + str(e))
@@ -1116,13 +3536,8 @@ def main():
         if _debug:
             _log.debug("    - creating: %r", result['object_name'])
 
-        # Note: Priority array functionality is commented out but available for future use
-        # priority_array = PriorityArray()
-        # for i in range(16):
-        #     priority_array.append(PriorityValue(Integer(i)))
-
-        # Create analog output BACnet object with properties from database
-        pro_object = AnalogOutputObject(
+        # Create commandable analog output BACnet object with properties from database
+        pro_object = ProAnalogOutputObject(
             objectIdentifier=("analogOutput", result['object_identifier']),
             objectName=result['object_name'],
             presentValue=result['present_value'],
@@ -1134,11 +3549,11 @@ def main():
             eventState=result['event_state'],
             outOfService=result['out_of_service'],
             units=result['units'],
-            # priorityArray=priority_array,  # Priority array for command priority
             relinquishDefault=result['relinquish_default'],
-            # currentCommandPriority=PriorityValue(Integer(8)),  # Current command priority
             covIncrement=result['cov_increment'],
         )
+        # Restore the commands saved by the persistence task
+        pro_object.restore_priority_array(result['priority_array'])
         # Add object to BACnet application and global object list
         pro_application.add_object(pro_object)
         object_list.append(pro_object)
@@ -1201,8 +3616,8 @@ def main():
         if _debug:
             _log.debug("    - creating: %r", result['object_name'])
 
-        # Create binary output BACnet object with properties from database
-        pro_object = BinaryOutputObject(
+        # Create commandable binary output BACnet object with properties from database
+        pro_object = ProBinaryOutputObject(
             objectIdentifier=("binaryOutput", result['object_identifier']),
             objectName=result['object_name'],
             presentValue=result['present_value'],
@@ -1215,8 +3630,9 @@ def main():
             outOfService=result['out_of_service'],
             polarity=result['polarity'],  # Normal or Reverse polarity
             relinquishDefault=result['relinquish_default'],
-            # currentCommandPriority=result['current_command_priority'],  # Command priority
         )
+        # Restore the commands saved by the persistence task
+        pro_object.restore_priority_array(result['priority_array'])
         # Add object to BACnet application and global object list
         pro_application.add_object(pro_object)
         object_list.append(pro_object)
@@ -1278,8 +3694,8 @@ def main():
         if _debug:
             _log.debug("    - creating: %r", result['object_name'])
 
-        # Create multi-state output BACnet object with properties from database
-        pro_object = MultiStateOutputObject(
+        # Create commandable multi-state output BACnet object with properties from database
+        pro_object = ProMultiStateOutputObject(
             objectIdentifier=("multiStateOutput", result['object_identifier']),
             objectName=result['object_name'],
             presentValue=result['present_value'],
@@ -1293,8 +3709,9 @@ def main():
             numberOfStates=result['number_of_states'],
             stateText=result['state_text'],  # Array of state text descriptions
             relinquishDefault=result['relinquish_default'],
-            # currentCommandPriority=result['current_command_priority'],  # Command priority
         )
+        # Restore the commands saved by the persistence task
+        pro_object.restore_priority_array(result['priority_array'])
         # Add object to BACnet application and global object list
         pro_application.add_object(pro_object)
         object_list.append(pro_object)
@@ -1334,10 +3751,58 @@ def main():
     # STEP4: Install tasks
     ####################################################################################################################
     # Install persistence task to save writable properties to database
-    Persistence(settings.PERSISTENCE_INTERVAL).install_task()
+    persistence = Persistence(settings.PERSISTENCE_INTERVAL)
+    persistence.install_task()
 
     # Install refreshing task to update readable properties from database
-    Refreshing(settings.REFRESHING_INTERVAL).install_task()
+    refreshing = Refreshing(settings.REFRESHING_INTERVAL)
+    refreshing.install_task()
+
+    # Receive the change notifications of xbacnet-api
+    if settings.NOTIFICATION_ADDRESS is not None:
+        ChangeNotifications(refreshing, settings.NOTIFICATION_ADDRESS)
+
+    # Compute the virtual points on the changes of the objects they depend on
+    if settings.VIRTUAL_POINT_DICT:
+        VirtualPoints(pro_application, settings.VIRTUAL_POINT_DICT)
+
+    # Install snapshot export task to write the present values of all objects to a columnar file
+    if settings.SNAPSHOT_PATH is not None:
+        snapshot_export = SnapshotExport(settings.SNAPSHOT_INTERVAL, settings.SNAPSHOT_PATH, object_list)
+        snapshot_export.install_task()
+
+    # Publish the state of the objects to shared memory for the workers of xbacnet-api
+    live_state = None
+    if settings.LIVE_STATE_PATH is not None:
+        live_state = LiveState(settings.LIVE_STATE_PATH, object_list, get_database_id_dict(object_list_dict))
+
+    # Install alarm engine to evaluate the limits and alarm values of the objects
+    if settings.ALARM_RULE_DICT:
+        alarm_engine = AlarmEngine(settings.ALARM_INTERVAL, object_list, settings.ALARM_RULE_DICT)
+        alarm_engine.install_task()
+
+    # Receive the telemetry pushed by field gateways
+    if settings.INGEST_ADDRESS is not None:
+        IngestListener(settings.INGEST_ADDRESS)
+
+    # Create trend log objects recording the present values, after the sockets above, which asyncore polls with
+    # select() and so must have file descriptors below FD_SETSIZE
+    if settings.TREND_LOG_DIRECTORY is not None:
+        try:
+            os.makedirs(settings.TREND_LOG_DIRECTORY, exist_ok=True)
+        except OSError as e:
+            _log.error("Error in creating the trend log directory " + str(e))
+        else:
+            for logged_object in object_list:
+                pro_object = create_trend_log(logged_object, this_device.objectIdentifier)
+                if pro_object is not None:
+                    pro_application.add_object(pro_object)
+                    trend_log_list.append(pro_object)
+
+    # Install trend log compaction task to close the ended buckets of the rollup tiers
+    if trend_log_list:
+        trend_log_compaction = TrendLogCompaction(settings.TREND_LOG_ROLLUP_INTERVAL)
+        trend_log_compaction.install_task()
 
     ####################################################################################################################
     # STEP5: Run the application
@@ -1349,6 +3814,13 @@ def main():
     # Start the BACnet server - this blocks until the server is stopped
     run()
 
+    # Write the trend log records to the files, the open buckets are rebuilt from the records at the next start
+    for trend_log_segment in trend_log_segment_dict.values():
+        trend_log_segment.close()
+
+    if live_state is not None:
+        live_state.close()
+
     if _debug:
         _log.debug("finish")
 
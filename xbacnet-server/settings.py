@@ -8,3 +8,109 @@ xbacnet = {
 # interval for object persistence task
 PERSISTENCE_INTERVAL = 5.0
 REFRESHING_INTERVAL = 5.0
+
+# window in seconds within which WriteProperty requests to the present value of the same output object
+# are collapsed into one persisted value and one COV notification
+WRITE_COALESCING_WINDOW = 0.5
+
+# maximum number of objects saved with one UPDATE statement by the persistence task
+PERSISTENCE_BATCH_SIZE = 500
+
+# when WritePropertyMultiple requests are acknowledged:
+# 'immediate' - after the values are applied, the persistence task saves them on its next run
+# 'persisted' - after the written output objects are saved in one database transaction. The transaction runs on the
+#               BACnet core loop, so all BACnet requests, COV notifications and tasks wait for the database meanwhile,
+#               up to PERSISTENCE_LOCK_WAIT_TIMEOUT when rows are locked by other clients
+WRITE_PROPERTY_MULTIPLE_ACK = 'immediate'
+
+# seconds the persistence task waits for rows locked by other database clients before its transaction fails and the
+# objects are saved again on its next run
+PERSISTENCE_LOCK_WAIT_TIMEOUT = 2
+
+# how the refreshing task finds the objects changed in the database:
+# 'changes' - consume tbl_object_changes, written by the triggers of the object tables, and read the changed objects
+# 'probe'   - probe all object tables with one checksum query and read the changed tables. The present values saved by
+#             this server are left out of the checksums: those of the input and value objects when INGEST_ADDRESS is
+#             set and those of the virtual points, so present values written to them by other database clients are
+#             only refreshed with the other columns of their tables or through NOTIFICATION_ADDRESS
+# the probe is also used when tbl_object_changes cannot be read
+REFRESHING_FEED = 'changes'
+
+# maximum number of tbl_object_changes entries consumed by one run of the refreshing task
+CHANGE_LOG_BATCH_SIZE = 1000
+
+# seconds to wait for a tbl_object_changes entry missing from the sequence, whose transaction may not be committed yet
+CHANGE_LOG_GAP_TIMEOUT = 5.0
+
+# UDP address on the loopback interface on which xbacnet-api notifies xbacnet-server of the object changes it committed,
+# the notified objects are refreshed at once instead of on the next run of the refreshing task, None to disable
+NOTIFICATION_ADDRESS = ('127.0.0.1', 47880)
+
+# UDP address on which field gateways push the present values of input and value objects to xbacnet-server,
+# for example ('0.0.0.0', 47881), None to disable. The listener does not authenticate the senders, so only bind it
+# to a network that is reserved for the gateways
+INGEST_ADDRESS = None
+
+# filter of the ingested values by object identifier, e.g. ('analogInput', 1), or by object type, e.g. 'analogInput',
+# with the parameters:
+# 'deadband'         - absolute change of an analog value to apply it, the cov_increment of the object by default
+# 'deadband_percent' - change of an analog value in percent of the present value to apply it, the larger one applies
+# 'minimum_interval' - seconds after an applied value within which the next values are dropped
+# 'maximum_silence'  - seconds after which an unchanged value is applied and saved again
+INGEST_FILTER_DICT = {
+    'analogInput': {'minimum_interval': 0.0, 'maximum_silence': 300.0},
+}
+
+# directory of the trend log segment files recording the present values of all objects, None to disable,
+# xbacnet-api reads the history from the same directory. The ring buffers of 256 objects of a type share a segment
+# file, so the server holds one file descriptor and one memory mapping per 256 objects. An object takes
+# 32 + 16 * TREND_LOG_BUFFER_SIZE bytes plus 32 + 48 * number of buckets per rollup tier, about 2.8 MB with the
+# defaults below, so 10000 objects take about 28 GB once their buffers are full. The files are sparse and the disk
+# blocks are allocated as the records are written: keep room for the full size, a write to a mapped file on a full
+# disk stops the server with SIGBUS
+TREND_LOG_DIRECTORY = '/xbacnet-server/trendlog'
+
+# number of records in the ring buffer of each object, 16 bytes each
+TREND_LOG_BUFFER_SIZE = 65536
+
+# maximum number of trend log records in one ReadRange response, so that it fits in an unsegmented APDU
+TREND_LOG_READ_RANGE_COUNT = 50
+
+# rollup tiers of the trend logs: bucket size in seconds and number of buckets kept, which sets the retention of the
+# tier, here 7 days of 1 minute, 90 days of 15 minute and 2 years of 1 hour buckets, 48 bytes per bucket
+TREND_LOG_ROLLUP_TIERS = ((60, 10080), (900, 8640), (3600, 17520))
+
+# interval in seconds of the task closing the ended buckets of the rollup tiers
+TREND_LOG_ROLLUP_INTERVAL = 60.0
+
+# alarm rules of the alarm engine by object identifier, e.g. ('analogInput', 1), or by object type, e.g. 'binaryInput':
+# analog objects - 'high_limit', 'low_limit', 'deadband' of the return to normal, 'time_delay' in seconds
+# binary objects - 'alarm_value' ('active' or 'inactive'), 'time_delay' in seconds
+# e.g. {('analogInput', 10001): {'high_limit': 30.0, 'low_limit': 10.0, 'deadband': 1.0, 'time_delay': 60.0}}
+ALARM_RULE_DICT = {}
+
+# interval in seconds of the alarm engine evaluating the analog objects
+ALARM_INTERVAL = 1.0
+
+# BACnet addresses receiving the event notifications of the alarm engine, e.g. ['192.168.1.100'] or ['*'] to broadcast
+ALARM_RECIPIENTS = []
+
+# process identifier, notification class and priorities of the to-offnormal and to-normal event notifications
+ALARM_PROCESS_IDENTIFIER = 0
+ALARM_NOTIFICATION_CLASS = 0
+ALARM_PRIORITY_DICT = {'offnormal': 100, 'normal': 200}
+
+# virtual points: analog, binary and multi-state value objects whose present value is computed by an expression over
+# the present values of other objects referenced as objectType[instance], e.g.
+# {('analogValue', 3001): 'analogInput[10001] + analogInput[10002]',
+#  ('binaryValue', 3002): 'avg(analogInput[11], analogInput[12]) > 26'}
+VIRTUAL_POINT_DICT = {}
+
+# path of the columnar snapshot file of the present values of all objects, None to disable
+SNAPSHOT_PATH = '/xbacnet-server/snapshot.blob'
+
+# interval in seconds between snapshots
+SNAPSHOT_INTERVAL = 60.0
+
+# path of the shared memory file of the live state of all objects read by xbacnet-api, None to disable
+LIVE_STATE_PATH = '/dev/shm/xbacnet-live-state'
@@ -0,0 +1 @@
+# XBACnet Server Tests Package
@@ -0,0 +1,483 @@
+"""
+XBACnet Server Tests
+
+This module contains unit tests for the XBACnet server.
+
+Author: XBACnet Team
+Date: 2024
+"""
+
+import os
+import re
+import pytest
+from bacpypes.apdu import ReadRangeRequest, Range, RangeByPosition, RangeBySequenceNumber, RangeByTime
+from bacpypes.basetypes import PriorityArray, PriorityValue, LogRecord
+from bacpypes.constructeddata import ListOf
+from bacpypes.object import AnalogInputObject, AnalogValueObject, BinaryInputObject
+import server
+
+
+class FakeApplication:
+    """Application holding objects and recording the responses."""
+
+    def __init__(self, objects):
+        self.object_dict = {pro_object.objectIdentifier: pro_object for pro_object in objects}
+        self.responses = list()
+
+    def get_object_id(self, object_identifier):
+        return self.object_dict.get(object_identifier, None)
+
+    def response(self, apdu):
+        self.responses.append(apdu)
+
+
+def analog_input(instance, present_value, **kwargs):
+    """Create an analog input object."""
+    return AnalogInputObject(objectIdentifier=('analogInput', instance), objectName='AI ' + str(instance),
+                             presentValue=present_value, statusFlags=[0, 0, 0, 0], eventState='normal', **kwargs)
+
+
+def test_priority_array_round_trip():
+    """Test that the commanded priorities survive packing into the priority_array column."""
+    for object_type, value_dict in (('analogOutput', {1: 10.5, 8: 20.25}),
+                                    ('binaryOutput', {5: 1}),
+                                    ('multiStateOutput', {2: 3, 16: 1})):
+        choice, slot_format = server.PRIORITY_ARRAY_SLOT_DICT[object_type]
+        priority_array = PriorityArray()
+        for priority, value in value_dict.items():
+            priority_array[priority] = PriorityValue(**{choice: value})
+
+        data = server.pack_priority_array(object_type, priority_array)
+        assert len(data) == 2 + len(value_dict) * len(server.struct.pack('<' + slot_format, 0))
+
+        unpacked = server.unpack_priority_array(object_type, data)
+        for priority in range(1, 17):
+            if priority in value_dict:
+                assert getattr(unpacked[priority], choice) == value_dict[priority]
+            else:
+                assert unpacked[priority].null == ()
+
+    # Nothing commanded is stored as NULL
+    assert server.pack_priority_array('analogOutput', PriorityArray()) is None
+    assert all(server.unpack_priority_array('analogOutput', None)[i].null == () for i in range(1, 17))
+
+
+class FakeConnection:
+    """Connection recording the queries of its cursor."""
+
+    def __init__(self):
+        self.queries = list()
+
+    def cursor(self, **kwargs):
+        return self
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchall(self):
+        return list()
+
+
+def test_probe_leaves_out_persisted_present_values(monkeypatch):
+    """Test that the present values saved by the server are left out of the probe fingerprints."""
+    connection = FakeConnection()
+    monkeypatch.setattr(server.mysql.connector, 'connect', lambda **kwargs: connection)
+    monkeypatch.setattr(server.settings, 'VIRTUAL_POINT_DICT', {('analogValue', 3001): 'analogInput[1] * 2',
+                                                                ('analogValue', 3002): 'analogInput[2] * 2'})
+
+    monkeypatch.setattr(server.settings, 'INGEST_ADDRESS', None)
+    refreshing = server.Refreshing(5)
+    assert refreshing.probe() == {}
+    assert 'IF(object_identifier IN (3001, 3002), NULL, present_value)' in connection.queries[-1]
+    assert 'present_value' in refreshing.probe_column_dict['tbl_analog_input_objects']
+
+    monkeypatch.setattr(server.settings, 'INGEST_ADDRESS', ('127.0.0.1', 47881))
+    refreshing = server.Refreshing(5)
+    for table_name in server.INGEST_TABLE_DICT.values():
+        assert refreshing.probe_column_dict[table_name] == tuple(
+            column_name for column_name in server.REFRESHING_COLUMN_DICT[table_name] if column_name != 'present_value')
+    assert refreshing.probe_column_dict['tbl_analog_output_objects'] == \
+        server.REFRESHING_COLUMN_DICT['tbl_analog_output_objects']
+
+
+def test_ingest_filter():
+    """Test the deadband, minimum interval and maximum silence of the ingest filter."""
+    ingest_filter = server.IngestFilter({
+        ('analogInput', 1): {'deadband': 0.5, 'minimum_interval': 10.0, 'maximum_silence': 60.0},
+        'analogValue': {'deadband_percent': 10.0},
+    })
+
+    pro_object = analog_input(1, 20.0)
+    assert ingest_filter.accept(pro_object, 20.1, now=0.0)
+    pro_object.presentValue = 20.1
+    # Dropped within the minimum interval, even if significant
+    assert not ingest_filter.accept(pro_object, 25.0, now=5.0)
+    # Dropped within the deadband
+    assert not ingest_filter.accept(pro_object, 20.4, now=15.0)
+    assert ingest_filter.accept(pro_object, 20.6, now=15.0)
+    pro_object.presentValue = 20.6
+    assert not ingest_filter.accept(pro_object, 20.6, now=70.0)
+    # Applied after the maximum silence, even if unchanged
+    assert ingest_filter.accept(pro_object, 20.6, now=76.0)
+
+    # The larger of the covIncrement and the percent deadband applies
+    pro_object = AnalogValueObject(objectIdentifier=('analogValue', 1), objectName='AV 1', presentValue=50.0,
+                                   covIncrement=1.0)
+    assert ingest_filter.accept(pro_object, 50.0, now=0.0)
+    assert not ingest_filter.accept(pro_object, 54.0, now=1.0)
+    assert ingest_filter.accept(pro_object, 55.0, now=2.0)
+
+    # The covIncrement is the deadband of the objects without parameters
+    pro_object = analog_input(2, 1.0, covIncrement=0.5)
+    assert ingest_filter.accept(pro_object, 1.0, now=0.0)
+    assert not ingest_filter.accept(pro_object, 1.4, now=1.0)
+    assert ingest_filter.accept(pro_object, 1.5, now=2.0)
+
+    # Binary values are significant whenever they change
+    pro_object = BinaryInputObject(objectIdentifier=('binaryInput', 1), objectName='BI 1', presentValue='inactive')
+    assert ingest_filter.accept(pro_object, 'inactive', now=0.0)
+    assert not ingest_filter.accept(pro_object, 'inactive', now=1.0)
+    assert ingest_filter.accept(pro_object, 'active', now=2.0)
+
+
+def test_ingest_listener_drops_invalid_values(monkeypatch):
+    """Test that values which are not finite numbers and values of objects out of service are not applied."""
+    pro_object = analog_input(1, 20.0)
+    binary_object = BinaryInputObject(objectIdentifier=('binaryInput', 1), objectName='BI 1', presentValue='inactive',
+                                      outOfService=True)
+    monkeypatch.setattr(server, 'pro_application', FakeApplication([pro_object, binary_object]))
+    monkeypatch.setattr(server, 'persistence_object_dict', dict())
+    monkeypatch.setattr(server.settings, 'INGEST_FILTER_DICT', {})
+    ingest_listener = server.IngestListener(('127.0.0.1', 0))
+    try:
+        for value in ('nan', 'inf', '-inf', float('nan'), float('inf')):
+            assert not ingest_listener.apply('analogInput', 1, value)
+        assert pro_object.presentValue == 20.0
+        assert ingest_listener.dropped_count == 5
+
+        # An operator sets the present value of an object out of service
+        assert not ingest_listener.apply('binaryInput', 1, 'active')
+        assert binary_object.presentValue == 'inactive'
+        assert ingest_listener.filtered_count == 1
+
+        assert ingest_listener.apply('analogInput', 1, '21.5')
+        assert pro_object.presentValue == 21.5
+        assert server.persistence_object_dict[('analogInput', 1)] is pro_object
+    finally:
+        ingest_listener.close()
+
+
+def test_trend_log_buffer_wraparound(tmp_path):
+    """Test that the oldest records are overwritten and kept across reopening the segment."""
+    path = str(tmp_path / 'analogInput-segment-0.dat')
+    trend_log_segment = server.TrendLogSegment(path, ((4, 0), (2, 60)))
+    trend_log_buffer, rollup_buffer = trend_log_segment.buffers(1)
+    for i in range(1, 7):
+        trend_log_buffer.append(1000.0 + i, float(i))
+    assert isinstance(rollup_buffer, server.TrendLogRollupBuffer)
+
+    assert trend_log_buffer.total == 6
+    assert trend_log_buffer.record_count() == 4
+    assert trend_log_buffer.first_sequence_number() == 3
+    assert list(trend_log_buffer.read(3, 6)) == [(1003.0, 3.0), (1004.0, 4.0), (1005.0, 5.0), (1006.0, 6.0)]
+    assert trend_log_buffer.bisect(1004.0, False) == 4
+    assert trend_log_buffer.bisect(1004.0, True) == 5
+    assert trend_log_buffer.bisect(0.0, False) == 3
+    assert trend_log_buffer.bisect(2000.0, False) == 7
+    # The ring buffers of the other objects of the segment are left alone
+    assert [buffer.total for buffer in trend_log_segment.buffers(0) + trend_log_segment.buffers(2)] == [0, 0, 0, 0]
+    assert rollup_buffer.total == 0
+    trend_log_segment.close()
+
+    trend_log_segment = server.TrendLogSegment(path, ((4, 0), (2, 60)))
+    trend_log_buffer = trend_log_segment.buffers(1)[0]
+    assert trend_log_buffer.total == 6
+    assert list(trend_log_buffer.read(5, 6)) == [(1005.0, 5.0), (1006.0, 6.0)]
+    trend_log_buffer.clear()
+    assert trend_log_buffer.record_count() == 0
+    assert trend_log_buffer.first_sequence_number() == 7
+    trend_log_segment.close()
+
+    # The records are dropped when the layout changes
+    trend_log_segment = server.TrendLogSegment(path, ((8, 0), (2, 60)))
+    assert trend_log_segment.buffers(1)[0].total == 0
+    trend_log_segment.close()
+
+
+def test_create_trend_log_segments(tmp_path, monkeypatch):
+    """Test that the trend logs of many objects share a segment file and that a failed open is reported."""
+    monkeypatch.setattr(server, 'trend_log_segment_dict', dict())
+    monkeypatch.setattr(server.settings, 'TREND_LOG_DIRECTORY', str(tmp_path))
+    monkeypatch.setattr(server.settings, 'TREND_LOG_BUFFER_SIZE', 16)
+    monkeypatch.setattr(server.settings, 'TREND_LOG_ROLLUP_TIERS', ((60, 4), (900, 2)))
+    try:
+        trend_logs = [server.create_trend_log(analog_input(instance, float(instance)), ('device', 1))
+                      for instance in range(server.TREND_LOG_SEGMENT_SIZE + 1)]
+        assert sorted(os.listdir(str(tmp_path))) == ['analogInput-segment-0.dat', 'analogInput-segment-1.dat']
+        assert len(server.trend_log_segment_dict) == 2
+        assert trend_logs[7]._trend_log_buffer.read_record(1)[1] == 7.0
+        assert [rollup.bucket_size for rollup in trend_logs[7]._trend_log_rollups] == [60, 900]
+        assert [rollup.trend_log_buffer.capacity for rollup in trend_logs[7]._trend_log_rollups] == [4, 2]
+    finally:
+        for trend_log_segment in server.trend_log_segment_dict.values():
+            trend_log_segment.close()
+
+    # A segment file which cannot be created leaves the object without a trend log
+    monkeypatch.setattr(server, 'trend_log_segment_dict', dict())
+    monkeypatch.setattr(server.settings, 'TREND_LOG_DIRECTORY', str(tmp_path / 'missing'))
+    assert server.create_trend_log(analog_input(1, 1.0), ('device', 1)) is None
+
+
+def read_range(trend_log, **kwargs):
+    """Read the log buffer of a trend log object with a ReadRange request."""
+    application = FakeApplication([trend_log])
+    apdu = ReadRangeRequest(objectIdentifier=trend_log.objectIdentifier, propertyIdentifier='logBuffer',
+                            range=Range(**kwargs) if kwargs else None)
+    server.ProApplication.do_ReadRangeRequest(application, apdu)
+    resp = application.responses[0]
+    log_records = resp.itemData.cast_out(ListOf(LogRecord))
+    return resp, [record.logDatum.realValue for record in log_records]
+
+
+def test_read_range(tmp_path, monkeypatch):
+    """Test reading the log buffer by position, sequence number and time."""
+    start = 1700000000.0
+    trend_log_segment = server.TrendLogSegment(str(tmp_path / 'analogInput-segment-0.dat'), ((8, 0),))
+    trend_log_buffer = trend_log_segment.buffers(1)[0]
+    for i in range(10):
+        trend_log_buffer.append(start + 60 * i, float(i))
+    # Sequence numbers 3 to 10 with the values 2 to 9 are left
+    trend_log = server.ProTrendLogObject(analog_input(1, 9.0), trend_log_buffer, [],
+                                         objectIdentifier=('trendLog', 1), objectName='AI 1 Trend Log')
+    assert trend_log_buffer.total == 10
+
+    resp, values = read_range(trend_log)
+    assert values == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+    assert list(resp.resultFlags.value) == [1, 1, 0]
+
+    resp, values = read_range(trend_log, byPosition=RangeByPosition(referenceIndex=2, count=3))
+    assert values == [3.0, 4.0, 5.0]
+    assert resp.firstSequenceNumber is None
+    resp, values = read_range(trend_log, byPosition=RangeByPosition(referenceIndex=8, count=-2))
+    assert values == [8.0, 9.0]
+    assert list(resp.resultFlags.value) == [0, 1, 0]
+
+    resp, values = read_range(trend_log, bySequenceNumber=RangeBySequenceNumber(referenceSequenceNumber=5, count=2))
+    assert values == [4.0, 5.0]
+    assert resp.firstSequenceNumber == 5
+    # Overwritten records are not returned
+    resp, values = read_range(trend_log, bySequenceNumber=RangeBySequenceNumber(referenceSequenceNumber=2, count=5))
+    assert values == []
+
+    reference_time = server.trend_log_date_time(start + 300)
+    resp, values = read_range(trend_log, byTime=RangeByTime(referenceTime=reference_time, count=2))
+    assert values == [6.0, 7.0]
+    assert resp.firstSequenceNumber == 7
+    resp, values = read_range(trend_log, byTime=RangeByTime(referenceTime=reference_time, count=-2))
+    assert values == [3.0, 4.0]
+    assert resp.firstSequenceNumber == 4
+
+    # The records next to the reference when they do not fit in one response
+    monkeypatch.setattr(server.settings, 'TREND_LOG_READ_RANGE_COUNT', 3)
+    resp, values = read_range(trend_log, byPosition=RangeByPosition(referenceIndex=8, count=-8))
+    assert values == [7.0, 8.0, 9.0]
+    assert list(resp.resultFlags.value) == [0, 1, 1]
+    trend_log_segment.close()
+
+
+def test_trend_log_rollup(tmp_path):
+    """Test that buckets are closed by later values and by time, and reopened from the records after a restart."""
+    trend_log_segment = server.TrendLogSegment(str(tmp_path / 'analogInput-segment-0.dat'), ((100, 0), (10, 60)))
+    trend_log_buffer, rollup_buffer = trend_log_segment.buffers(1)
+    trend_log_rollup = server.TrendLogRollup(60, rollup_buffer)
+    for timestamp, value in ((6000.0, 1.0), (6030.0, 3.0), (6059.0, 2.0), (6061.0, 5.0)):
+        trend_log_buffer.append(timestamp, value)
+        trend_log_rollup.add(timestamp, value)
+
+    # Bucket start, minimum, maximum, sum and number of the values, last value
+    assert rollup_buffer.total == 1
+    assert rollup_buffer.read_record(1) == (6000.0, 1.0, 3.0, 6.0, 3.0, 2.0)
+    trend_log_rollup.close_ended(6119.0)
+    assert rollup_buffer.total == 1
+
+    # The open bucket is rebuilt from the recorded values after a restart
+    trend_log_rollup = server.TrendLogRollup(60, rollup_buffer)
+    trend_log_rollup.resume(trend_log_buffer)
+    assert trend_log_rollup.bucket == [6060.0, 5.0, 5.0, 5.0, 1, 5.0]
+    trend_log_rollup.add(6070.0, 7.0)
+    trend_log_rollup.close_ended(6120.0)
+    assert trend_log_rollup.bucket is None
+    assert rollup_buffer.total == 2
+    assert rollup_buffer.read_record(2) == (6060.0, 5.0, 7.0, 12.0, 2.0, 7.0)
+    trend_log_segment.close()
+
+
+def test_alarm_engine(monkeypatch):
+    """Test the time delay and deadband of the analog limits and the change of state of binary objects."""
+    monkeypatch.setattr(server, 'alarm_object_dict', dict())
+    monkeypatch.setattr(server.settings, 'ALARM_RECIPIENTS', [])
+    pro_object = analog_input(1, 20.0)
+    binary_object = BinaryInputObject(objectIdentifier=('binaryInput', 1), objectName='BI 1', presentValue='inactive',
+                                      statusFlags=[0, 0, 0, 0], eventState='normal')
+    alarm_engine = server.AlarmEngine(10.0, [pro_object, binary_object], {
+        'analogInput': {'high_limit': 30.0, 'low_limit': 10.0, 'deadband': 2.0, 'time_delay': 60.0},
+        ('binaryInput', 1): {'alarm_value': 'active'},
+    })
+
+    # The transition waits for the time delay
+    pro_object.presentValue = 31.0
+    alarm_engine.evaluate_analog(1000.0)
+    alarm_engine.evaluate_analog(1059.0)
+    assert pro_object.eventState == 'normal'
+    alarm_engine.evaluate_analog(1060.0)
+    assert pro_object.eventState == 'highLimit'
+    assert alarm_engine.status_flags(pro_object)[0] == 1
+    assert server.alarm_object_dict[('analogInput', 1)] is pro_object
+
+    # Back to normal only below the high limit minus the deadband
+    pro_object.presentValue = 29.0
+    alarm_engine.evaluate_analog(1200.0)
+    alarm_engine.evaluate_analog(1300.0)
+    assert pro_object.eventState == 'highLimit'
+    pro_object.presentValue = 27.0
+    alarm_engine.evaluate_analog(1300.0)
+    assert pro_object.eventState == 'highLimit'
+    alarm_engine.evaluate_analog(1360.0)
+    assert pro_object.eventState == 'normal'
+    assert alarm_engine.status_flags(pro_object)[0] == 0
+
+    # A value back in range before the time delay cancels the transition
+    pro_object.presentValue = 5.0
+    alarm_engine.evaluate_analog(1400.0)
+    pro_object.presentValue = 15.0
+    alarm_engine.evaluate_analog(1430.0)
+    pro_object.presentValue = 5.0
+    alarm_engine.evaluate_analog(1450.0)
+    assert pro_object.eventState == 'normal'
+    alarm_engine.evaluate_analog(1510.0)
+    assert pro_object.eventState == 'lowLimit'
+
+    # Binary objects are evaluated when the present value changes
+    binary_object.presentValue = 'active'
+    assert binary_object.eventState == 'offnormal'
+    binary_object.presentValue = 'inactive'
+    assert binary_object.eventState == 'normal'
+
+
+def test_alarm_engine_masks(monkeypatch):
+    """Test that one cycle evaluates each analog object against its own limits, deadband and state."""
+    monkeypatch.setattr(server, 'alarm_object_dict', dict())
+    monkeypatch.setattr(server.settings, 'ALARM_RECIPIENTS', [])
+    # Present value, event state and rule of each object, and the event state after one cycle
+    cases = [
+        (31.0, 'normal', {'high_limit': 30.0}, 'highLimit'),
+        (29.0, 'normal', {'high_limit': 30.0}, 'normal'),
+        (5.0, 'normal', {'low_limit': 10.0}, 'lowLimit'),
+        (29.0, 'highLimit', {'high_limit': 30.0, 'deadband': 2.0}, 'highLimit'),
+        (27.0, 'highLimit', {'high_limit': 30.0, 'deadband': 2.0}, 'normal'),
+        (11.0, 'lowLimit', {'low_limit': 10.0, 'deadband': 2.0}, 'lowLimit'),
+        (5.0, 'highLimit', {'high_limit': 30.0, 'low_limit': 10.0}, 'lowLimit'),
+        (31.0, 'normal', {'high_limit': 30.0, 'time_delay': 60.0}, 'normal'),
+        (float('nan'), 'normal', {'high_limit': 30.0, 'low_limit': 10.0}, 'normal'),
+        (20.0, 'offnormal', {'high_limit': 30.0}, 'normal'),
+    ]
+    objects = [analog_input(index + 1, value) for index, (value, _, _, _) in enumerate(cases)]
+    for pro_object, (_, event_state, _, _) in zip(objects, cases):
+        pro_object.eventState = event_state
+        pro_object.statusFlags = [int(event_state != 'normal'), 0, 0, 0]
+    alarm_engine = server.AlarmEngine(10.0, objects, {pro_object.objectIdentifier: rule
+                                                      for pro_object, (_, _, rule, _) in zip(objects, cases)})
+
+    alarm_engine.evaluate_analog(1000.0)
+    assert [pro_object.eventState for pro_object in objects] == [expected for _, _, _, expected in cases]
+    assert [alarm_engine.status_flags(pro_object)[0] for pro_object in objects] == \
+        [int(expected != 'normal') for _, _, _, expected in cases]
+    # The transitions and the overwritten event state are queued for the persistence task, the time delay waits
+    assert sorted(instance for _, instance in server.alarm_object_dict) == [1, 3, 5, 7, 10]
+    assert list(alarm_engine.pending_states) == [-1, -1, -1, -1, -1, -1, -1, 1, -1, -1]
+    alarm_engine.evaluate_analog(1060.0)
+    assert objects[7].eventState == 'highLimit'
+
+
+def test_compile_expression():
+    """Test that expressions are compiled with their dependencies and that other syntax is rejected."""
+    code, dependencies = server.compile_expression('avg(analogInput[1], analogInput[2]) * 2 if binaryInput[3] else 0')
+    assert dependencies == {('analogInput', 1), ('analogInput', 2), ('binaryInput', 3)}
+    value_dict = {('analogInput', 1): 10.0, ('analogInput', 2): 20.0, ('binaryInput', 3): 1}
+    namespace = dict(server.EXPRESSION_FUNCTION_DICT, value=lambda *key: value_dict[key], __builtins__={})
+    assert eval(code, namespace) == 30.0
+
+    for expression in ('__import__("os").system("true")', 'analogInput[1].__class__', 'open("/etc/passwd")',
+                       'analogInput', 'analogInput["1"]', 'temperature[1]', 'abs(x=1)', '"text"', 'lambda: 1',
+                       '[analogInput[1]]', 'analogInput[1:2]'):
+        with pytest.raises(ValueError):
+            server.compile_expression(expression)
+
+
+def test_virtual_points_dependency_cycle(monkeypatch):
+    """Test that virtual points are computed in dependency order and the ones in a cycle are left out."""
+    monkeypatch.setattr(server, 'persistence_object_dict', dict())
+    pro_object = analog_input(1, 10.0)
+    value_objects = [AnalogValueObject(objectIdentifier=('analogValue', instance), objectName='AV ' + str(instance),
+                                       presentValue=0.0) for instance in range(1, 5)]
+    virtual_points = server.VirtualPoints(FakeApplication([pro_object] + value_objects), {
+        ('analogValue', 2): 'analogValue[1] + 1',
+        ('analogValue', 1): 'analogInput[1] * 2',
+        ('analogValue', 3): 'analogValue[4] + 1',
+        ('analogValue', 4): 'analogValue[3] + 1',
+    })
+
+    assert [value_object.presentValue for value_object in value_objects] == [20.0, 21.0, 0.0, 0.0]
+    assert ('analogValue', 3) not in virtual_points.order_dict
+    assert ('analogValue', 4) not in virtual_points.order_dict
+
+    # A change is propagated through the dependent virtual points
+    pro_object.presentValue = 5.0
+    assert [value_object.presentValue for value_object in value_objects] == [10.0, 11.0, 0.0, 0.0]
+    assert server.persistence_object_dict[('analogValue', 2)] is value_objects[1]
+
+
+class FakeCursor:
+    """Dictionary cursor returning one object of each table."""
+
+    def __init__(self):
+        self.table_name = None
+
+    def execute(self, query):
+        self.table_name = re.search(r'FROM (\w+)', query).group(1)
+
+    def fetchall(self):
+        row = {
+            'id': len(self.table_name),
+            'object_identifier': 70001 if self.table_name == 'tbl_multi_state_input_objects' else 1,
+            'object_name': self.table_name,
+            'present_value': 1,
+            'description': None,
+            'status_flags': '0000',
+            'event_state': 'normal',
+            'out_of_service': 0,
+            'units': 'percent',
+            'cov_increment': 0.1,
+            'polarity': 'normal',
+            'relinquish_default': 1,
+            'priority_array': None,
+            'number_of_states': 3,
+            'state_text': 'Off;Low;High',
+        }
+        return [row]
+
+
+def test_load_objects_with_database_ids():
+    """Test that the objects of all types are loaded with the database ids of the live state."""
+    object_list_dict = {object_type: list() for object_type in (
+        'analogInput', 'analogOutput', 'analogValue', 'binaryInput', 'binaryOutput', 'binaryValue',
+        'multiStateInput', 'multiStateOutput', 'multiStateValue')}
+    server.load_objects(FakeCursor(), object_list_dict)
+
+    assert all(len(result_list) == 1 for result_list in object_list_dict.values())
+    multi_state_input = object_list_dict['multiStateInput'][0]
+    assert multi_state_input['state_text'] == ['Off', 'Low', 'High']
+
+    database_id_dict = server.get_database_id_dict(object_list_dict)
+    assert database_id_dict[('multiStateInput', 70001)] == len('tbl_multi_state_input_objects')
+    assert len(database_id_dict) == 9
@@ -29,6 +29,11 @@ export default defineConfig({
     host: '0.0.0.0',
     port: 3000,
         proxy: {
+          '/api/stream': {
+            target: 'http://localhost:8001',
+            changeOrigin: true,
+            secure: false
+          },
           '/api': {
             target: 'http://localhost:8000',
             changeOrigin: true,